@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+
+import functools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Tuple
+
+from jmapc import Client
+
+SIZES = [100, 1000, 5000, 20000, 50000]
+BODY_BYTES = 1024
+WORKERS = os.cpu_count() or 1
+
+
+def email(i: int) -> Dict[str, Any]:
+    return {
+        "id": f"M{i}",
+        "blobId": f"B{i}",
+        "threadId": f"T{i // 4}",
+        "mailboxIds": {"MBX1": True},
+        "keywords": {"$seen": True},
+        "size": 2048 + i,
+        "receivedAt": "1994-08-24T12:01:02Z",
+        "from": [{"name": "Paula", "email": "paula@twoson.example.net"}],
+        "to": [{"name": "Ness", "email": "ness@onett.example.net"}],
+        "subject": f"I'm taking a day trip to Happy Happy Village #{i}",
+        "headers": [
+            {"name": "Message-ID", "value": f"<{i}@twoson.example.net>"},
+            {"name": "Subject", "value": f"Happy Happy Village #{i}"},
+        ],
+        "textBody": [{"partId": "1", "type": "text/plain", "size": 1024}],
+        "bodyValues": {"1": {"value": "x" * BODY_BYTES}},
+        "preview": "Pokey is at it again",
+    }
+
+
+def response_body(count: int) -> bytes:
+    response = {
+        "accountId": "u1138",
+        "list": [email(i) for i in range(count)],
+        "notFound": [],
+        "state": "2187",
+    }
+    return json.dumps(
+        {"methodResponses": [["Email/get", response, "0.Email/get"]]}
+    ).encode()
+
+
+def parse_in_process(client: Client, body: bytes) -> Any:
+    return client._parse_method_responses(json.loads(body))
+
+
+def measure(func: Callable[[], Any]) -> Tuple[float, float]:
+    # Return wall time and CPU time used by this process, which is the time
+    # the GIL is held while decoding in-process
+    wall, cpu = time.perf_counter(), time.process_time()
+    func()
+    return time.perf_counter() - wall, time.process_time() - cpu
+
+
+def main() -> None:
+    with ProcessPoolExecutor(WORKERS) as executor:
+        in_process = Client("jmap-example.localhost")
+        offload = Client(
+            "jmap-example.localhost",
+            decode_executor=executor,
+            offload_min_bytes=0,
+        )
+        # Start worker processes before measuring
+        offload._parse_method_responses_offloaded(response_body(100), {})
+        print(f"Offloading to {WORKERS} worker processes")
+        print(
+            f"{'Emails':>8} {'Size (MB)':>10} "
+            f"{'In-process':>11} {'Offloaded':>10} {'Main CPU':>9}"
+        )
+        for count in SIZES:
+            body = response_body(count)
+            wall, _ = measure(
+                functools.partial(parse_in_process, in_process, body)
+            )
+            offload_wall, offload_cpu = measure(
+                functools.partial(
+                    offload._parse_method_responses_offloaded, body, {}
+                )
+            )
+            print(
+                f"{count:>8} {len(body) / 1e6:>10.1f} "
+                f"{wall:>10.3f}s {offload_wall:>9.3f}s {offload_cpu:>8.3f}s"
+            )
+
+
+if __name__ == "__main__":
+    main()
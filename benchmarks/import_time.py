@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+
+import argparse
+import statistics
+import subprocess  # nosec B404
+import sys
+from typing import List
+
+STATEMENTS = [
+    "import jmapc",
+    "from jmapc import Email",
+    "from jmapc import Client",
+    "import jmapc; jmapc.Client; jmapc.Email; jmapc.methods; jmapc.errors",
+]
+
+TIMER = """
+import time
+start = time.perf_counter()
+{statement}
+print(time.perf_counter() - start)
+"""
+
+
+def import_time(statement: str) -> float:
+    # Each import is timed in a new interpreter so no modules are cached
+    result = subprocess.run(  # nosec B603
+        [sys.executable, "-c", TIMER.format(statement=statement)],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    return float(result.stdout)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Measure import time of jmapc in fresh interpreters"
+    )
+    parser.add_argument("-r", "--repeat", type=int, default=10)
+    args = parser.parse_args()
+    print(f"{'Statement':<70}{'Best':>10}{'Median':>10}")
+    for statement in STATEMENTS:
+        times: List[float] = [
+            import_time(statement) for _ in range(args.repeat)
+        ]
+        print(
+            f"{statement:<70}{min(times) * 1000:>8.1f}ms"
+            f"{statistics.median(times) * 1000:>8.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
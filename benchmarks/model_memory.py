@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+
+import copy
+import dataclasses
+import functools
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+from jmapc import (
+    Email,
+    EmailAddress,
+    EmailBodyPart,
+    EmailHeader,
+    Mailbox,
+    Thread,
+    TypeState,
+)
+from jmapc.serializer import Model
+
+COUNT = 10000
+
+SAMPLES: List[Tuple[type, Dict[str, Any]]] = [
+    (Email, dict(id="M1001", thread_id="T1", size=1138, subject="Onett")),
+    (EmailBodyPart, dict(part_id="1", type="text/plain", charset="utf-8")),
+    (EmailHeader, dict(name="Subject", value="Onett")),
+    (EmailAddress, dict(name="Ness", email="ness@onett.example.net")),
+    (Mailbox, dict(id="MBX1", name="Inbox", role="inbox")),
+    (Thread, dict(id="T1", email_ids=["M1001"])),
+    (TypeState, dict(email="1", mailbox="2", thread="3")),
+]
+
+
+def unslotted_twin(cls: type) -> type:
+    # Recreate the model as a regular dataclass with a per-instance __dict__
+    return dataclasses.make_dataclass(
+        cls.__name__,
+        [(f.name, f.type, copy.copy(f)) for f in dataclasses.fields(cls)],
+        bases=(Model,),
+    )
+
+
+def bytes_per_object(factory: Callable[[], Any]) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [factory() for _ in range(COUNT)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # Exclude the list holding the objects
+    return (after - before - objects.__sizeof__()) / COUNT
+
+
+def main() -> None:
+    print(f"{'Model':<16}{'__dict__':>10}{'slots':>10}{'saved':>10}")
+    for cls, kwargs in SAMPLES:
+        twin = unslotted_twin(cls)
+        unslotted = bytes_per_object(functools.partial(twin, **kwargs))
+        slotted = bytes_per_object(functools.partial(cls, **kwargs))
+        print(
+            f"{cls.__name__:<16}{unslotted:>10.0f}{slotted:>10.0f}"
+            f"{1 - slotted / unslotted:>10.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+
+import argparse
+import fnmatch
+import json
+import platform
+import statistics
+import subprocess  # nosec B404
+import sys
+import timeit
+from typing import Any, Callable, Dict, List, Optional
+
+import sseclient
+
+from jmapc import Client, Email, Event, Ref, snapshot
+from jmapc.methods import (
+    EmailGet,
+    EmailQuery,
+    Invocation,
+    MailboxGet,
+    MailboxQuery,
+    Method,
+    ThreadGet,
+)
+from jmapc.serializer import ModelToDictPostprocessor
+from jmapc.session import Session, SessionPrimaryAccount
+
+Setup = Callable[[], Callable[[], Any]]
+
+BENCHMARKS: Dict[str, Setup] = {}
+EMAILS = 1000
+HEADERS = 40
+BODY_DEPTH = 4
+CHAINED_CALLS = 60
+REFS = 200
+
+
+def benchmark(name: str) -> Callable[[Setup], Setup]:
+    # Register a setup function returning the function to be timed
+    def register(setup: Setup) -> Setup:
+        BENCHMARKS[name] = setup
+        return setup
+
+    return register
+
+
+def body_part(depth: int, part_id: str = "1") -> Dict[str, Any]:
+    if not depth:
+        return {
+            "partId": part_id,
+            "blobId": f"B{part_id}",
+            "size": 1024,
+            "headers": [{"name": "Content-Type", "value": "text/plain"}],
+            "type": "text/plain",
+            "charset": "utf-8",
+            "disposition": "inline",
+            "language": ["en"],
+        }
+    return {
+        "headers": [{"name": "Content-Type", "value": "multipart/mixed"}],
+        "type": "multipart/mixed",
+        "subParts": [
+            body_part(depth - 1, f"{part_id}.{i}") for i in range(1, 3)
+        ],
+    }
+
+
+def email(i: int) -> Dict[str, Any]:
+    return {
+        "id": f"M{i}",
+        "blobId": f"B{i}",
+        "threadId": f"T{i // 4}",
+        "mailboxIds": {"MBX1": True, f"MBX{i % 10}": True},
+        "keywords": {"$seen": True, f"$label{i % 3}": True},
+        "size": 2048 + i,
+        "receivedAt": "1994-08-24T12:01:02Z",
+        "sentAt": "1994-08-24T12:01:02-07:00",
+        "messageId": [f"{i}@twoson.example.net"],
+        "inReplyTo": [f"{i - 1}@twoson.example.net"],
+        "headers": [
+            {"name": f"X-Header-{h}", "value": f"Value {h} of email {i}"}
+            for h in range(HEADERS)
+        ],
+        "from": [{"name": "Paula", "email": "paula@twoson.example.net"}],
+        "to": [
+            {"name": "Ness", "email": "ness@onett.example.net"},
+            {"name": "Jeff", "email": "jeff@winters.example.net"},
+        ],
+        "subject": f"I'm taking a day trip to Happy Happy Village #{i}",
+        "bodyStructure": body_part(BODY_DEPTH),
+        "bodyValues": {"1.1.1.1.1": {"value": "Pokey is at it again"}},
+        "textBody": [body_part(0, "1.1.1.1.1")],
+        "hasAttachment": False,
+        "preview": "Pokey is at it again",
+    }
+
+
+def method_responses() -> Dict[str, Any]:
+    def response(name: str, data: List[Any], call_id: str) -> List[Any]:
+        return [
+            name,
+            {
+                "accountId": "u1138",
+                "list": data,
+                "notFound": [],
+                "state": "2187",
+            },
+            call_id,
+        ]
+
+    return {
+        "methodResponses": [
+            response(
+                "Email/get", [email(i) for i in range(EMAILS)], "0.Email/get"
+            ),
+            response(
+                "Mailbox/get",
+                [{"id": f"MBX{i}", "name": f"Box {i}"} for i in range(100)],
+                "1.Mailbox/get",
+            ),
+            response(
+                "Thread/get",
+                [
+                    {
+                        "id": f"T{i}",
+                        "emailIds": [f"M{i * 4 + j}" for j in range(4)],
+                    }
+                    for i in range(EMAILS // 4)
+                ],
+                "2.Thread/get",
+            ),
+        ]
+    }
+
+
+def offline_client() -> Client:
+    client = Client("jmap-example.localhost")
+    client._jmap_session = Session(
+        username="ness@onett.example.net",
+        api_url="https://jmap-api.localhost/api",
+        event_source_url="https://jmap-api.localhost/events/",
+        primary_accounts=SessionPrimaryAccount(
+            core="u1138", mail="u1138", submission="u1138"
+        ),
+    )
+    return client
+
+
+@benchmark("email.from_dict")
+def email_from_dict() -> Callable[[], Any]:
+    data = email(1)
+    return lambda: Email.from_dict(data)
+
+
+@benchmark("email.to_dict")
+def email_to_dict() -> Callable[[], Any]:
+    model = Email.from_dict(email(1))
+    return lambda: model.to_dict()
+
+
+@benchmark("email.to_dict.encode_json")
+def email_to_dict_json() -> Callable[[], Any]:
+    model = Email.from_dict(email(1))
+    return lambda: model.to_dict(encode_json=True)
+
+
+@benchmark("postprocess.refs")
+def postprocess_refs() -> Callable[[], Any]:
+    calls = [
+        Invocation(id=f"{i}.Email/query", method=EmailQuery())
+        for i in range(REFS)
+    ]
+    data = {
+        f"ids{i}": Ref(f"/ids/{i}", method=i).to_dict() for i in range(REFS)
+    }
+    postprocessor = ModelToDictPostprocessor(calls)
+    return lambda: postprocessor.postprocess(dict(data))
+
+
+@benchmark("client.prepare_request")
+def prepare_request() -> Callable[[], Any]:
+    client = offline_client()
+    calls: List[Method] = []
+    while len(calls) < CHAINED_CALLS:
+        calls += [
+            MailboxQuery(filter=None),
+            MailboxGet(ids=Ref("/ids")),
+            EmailQuery(collapse_threads=True),
+            EmailGet(ids=Ref("/ids"), properties=["threadId"]),
+            ThreadGet(ids=Ref("/list/*/threadId")),
+        ]
+    return lambda: client._prepare_request(calls, client.account_id)
+
+
+@benchmark("event.load_from_sseclient_event")
+def load_event() -> Callable[[], Any]:
+    changed = {
+        f"u{i}": {"Email": f"{i}01", "Mailbox": f"{i}02", "Thread": f"{i}03"}
+        for i in range(10)
+    }
+    event = sseclient.Event(
+        id="1138",
+        event="state",
+        data=json.dumps({"@type": "StateChange", "changed": changed}),
+    )
+    return lambda: Event.load_from_sseclient_event(event)
+
+
+@benchmark("client.parse_method_responses")
+def parse_method_responses() -> Callable[[], Any]:
+    client = offline_client()
+    data = method_responses()
+    return lambda: client._parse_method_responses(data)
+
+
+@benchmark("client.parse_method_responses.lazy")
+def parse_method_responses_lazy() -> Callable[[], Any]:
+    client = offline_client()
+    client._lazy_decode = True
+    data = method_responses()
+    return lambda: client._parse_method_responses(data)
+
+
+@benchmark("snapshot.dumps")
+def snapshot_dumps() -> Callable[[], Any]:
+    emails = [Email.from_dict(email(i)) for i in range(EMAILS)]
+    return lambda: snapshot.dumps(emails)
+
+
+@benchmark("snapshot.loads")
+def snapshot_loads() -> Callable[[], Any]:
+    data = snapshot.dumps([Email.from_dict(email(i)) for i in range(EMAILS)])
+    return lambda: snapshot.loads(data)
+
+
+def format_time(seconds: float) -> str:
+    for unit, scale in (("s", 1.0), ("ms", 1e-3)):
+        if seconds >= scale:
+            return f"{seconds / scale:.1f}{unit}"
+    return f"{seconds / 1e-6:.1f}us"
+
+
+def git_commit() -> Optional[str]:
+    try:
+        # Record the commit of the checkout using git from PATH
+        result = subprocess.run(  # nosec B603 B607
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def run(setup: Setup, repeat: int) -> Dict[str, Any]:
+    timer = timeit.Timer(setup())
+    number, _ = timer.autorange()
+    times = [t / number for t in timer.repeat(repeat, number)]
+    return {
+        "number": number,
+        "times": times,
+        "best": min(times),
+        "median": statistics.median(times),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark serialization and request building"
+    )
+    parser.add_argument(
+        "-k",
+        dest="patterns",
+        action="append",
+        help="Only run benchmarks matching this glob pattern",
+    )
+    parser.add_argument("-r", "--repeat", type=int, default=5)
+    parser.add_argument(
+        "-o", "--output", help="Write results as JSON to this file"
+    )
+    parser.add_argument(
+        "-c", "--compare", help="Compare to results from a previous run"
+    )
+    args = parser.parse_args()
+    baseline: Dict[str, Any] = {}
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+    results: Dict[str, Any] = {}
+    print(f"{'Benchmark':<36}{'Best':>12}{'Median':>12}{'Change':>9}")
+    for name, setup in BENCHMARKS.items():
+        if args.patterns and not any(
+            fnmatch.fnmatch(name, p) for p in args.patterns
+        ):
+            continue
+        result = results[name] = run(setup, args.repeat)
+        change = ""
+        if name in baseline:
+            change = f"{result['best'] / baseline[name]['best'] - 1:+.0%}"
+        print(
+            f"{name:<36}{format_time(result['best']):>12}"
+            f"{format_time(result['median']):>12}{change:>9}"
+        )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(
+                {
+                    "commit": git_commit(),
+                    "python": sys.version,
+                    "platform": platform.platform(),
+                    "results": results,
+                },
+                f,
+                indent=2,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+
+import asyncio
+import os
+
+from jmapc import AsyncClient
+from jmapc.methods import CoreEcho
+
+
+async def main() -> None:
+    # Create and configure client
+    async with AsyncClient.create_with_api_token(
+        host=os.environ["JMAP_HOST"], api_token=os.environ["JMAP_API_TOKEN"]
+    ) as client:
+        # Call the JMAP Core/echo method several times concurrently
+        results = await asyncio.gather(
+            *(client.request(CoreEcho(data=dict(hello=i))) for i in range(3))
+        )
+
+    # Print results
+    for result in results:
+        print(result)
+
+
+asyncio.run(main())
+
+# Example output:
+#
+# CoreEchoResponse(data={'hello': 0})
+# CoreEchoResponse(data={'hello': 1})
+# CoreEchoResponse(data={'hello': 2})
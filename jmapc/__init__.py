@@ -1,48 +1,106 @@
-from . import auth, errors, methods, models
+import importlib
+from typing import TYPE_CHECKING, Any, Dict, List
+
 from .__version__ import __version__ as version
-from .client import Client, EventSourceConfig
-from .errors import Error
-from .methods import Request, ResponseOrError
-from .models import (
-    AddedItem,
-    Address,
-    Comparator,
-    Delivered,
-    DeliveryStatus,
-    Displayed,
-    Email,
-    EmailAddress,
-    EmailBodyPart,
-    EmailBodyValue,
-    EmailHeader,
-    EmailQueryFilter,
-    EmailQueryFilterCondition,
-    EmailQueryFilterOperator,
-    EmailSubmission,
-    EmailSubmissionQueryFilter,
-    EmailSubmissionQueryFilterCondition,
-    EmailSubmissionQueryFilterOperator,
-    Envelope,
-    Event,
-    Identity,
-    ListOrRef,
-    Mailbox,
-    MailboxQueryFilter,
-    MailboxQueryFilterCondition,
-    MailboxQueryFilterOperator,
-    Operator,
-    SetError,
-    StateChange,
-    StrOrRef,
-    Thread,
-    TypeState,
-    UndoStatus,
-)
-from .ref import Ref, ResultReference
+
+if TYPE_CHECKING:  # pragma: no cover
+    from . import auth, errors, methods, models
+    from .async_client import AsyncClient
+    from .client import Client, EventSourceConfig
+    from .errors import Error
+    from .json import JSONBackend
+    from .logging import log
+    from .methods import Request, ResponseOrError
+    from .models import (
+        AddedItem,
+        Address,
+        Comparator,
+        Delivered,
+        DeliveryStatus,
+        Displayed,
+        Email,
+        EmailAddress,
+        EmailBodyPart,
+        EmailBodyValue,
+        EmailHeader,
+        EmailQueryFilter,
+        EmailQueryFilterCondition,
+        EmailQueryFilterOperator,
+        EmailSubmission,
+        EmailSubmissionQueryFilter,
+        EmailSubmissionQueryFilterCondition,
+        EmailSubmissionQueryFilterOperator,
+        Envelope,
+        Event,
+        Identity,
+        ListOrRef,
+        Mailbox,
+        MailboxQueryFilter,
+        MailboxQueryFilterCondition,
+        MailboxQueryFilterOperator,
+        Operator,
+        SetError,
+        StateChange,
+        StrOrRef,
+        Thread,
+        TypeState,
+        UndoStatus,
+    )
+    from .ref import Ref, ResultReference
+
+# Public names are imported from their modules on first use, so importing
+# jmapc does not import requests, sseclient or every method and model
+_SUBMODULES = {"auth", "errors", "methods", "models"}
+_LAZY_NAMES: Dict[str, str] = {
+    "AsyncClient": "async_client",
+    "Client": "client",
+    "Error": "errors",
+    "EventSourceConfig": "client",
+    "JSONBackend": "json",
+    "Ref": "ref",
+    "Request": "methods",
+    "ResponseOrError": "methods",
+    "ResultReference": "ref",
+    "log": "logging",
+    "AddedItem": "models",
+    "Address": "models",
+    "Comparator": "models",
+    "Delivered": "models",
+    "DeliveryStatus": "models",
+    "Displayed": "models",
+    "Email": "models",
+    "EmailAddress": "models",
+    "EmailBodyPart": "models",
+    "EmailBodyValue": "models",
+    "EmailHeader": "models",
+    "EmailQueryFilter": "models",
+    "EmailQueryFilterCondition": "models",
+    "EmailQueryFilterOperator": "models",
+    "EmailSubmission": "models",
+    "EmailSubmissionQueryFilter": "models",
+    "EmailSubmissionQueryFilterCondition": "models",
+    "EmailSubmissionQueryFilterOperator": "models",
+    "Envelope": "models",
+    "Event": "models",
+    "Identity": "models",
+    "ListOrRef": "models",
+    "Mailbox": "models",
+    "MailboxQueryFilter": "models",
+    "MailboxQueryFilterCondition": "models",
+    "MailboxQueryFilterOperator": "models",
+    "Operator": "models",
+    "SetError": "models",
+    "StateChange": "models",
+    "StrOrRef": "models",
+    "Thread": "models",
+    "TypeState": "models",
+    "UndoStatus": "models",
+}
 
 __all__ = [
     "AddedItem",
     "Address",
+    "AsyncClient",
     "Client",
     "Comparator",
     "Delivered",
@@ -65,6 +123,7 @@ __all__ = [
     "Event",
     "EventSourceConfig",
     "Identity",
+    "JSONBackend",
     "ListOrRef",
     "Mailbox",
     "MailboxQueryFilter",
@@ -88,3 +147,18 @@ __all__ = [
     "models",
     "version",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    if name in _SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    module = _LAZY_NAMES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,419 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from typing import (
+    Any,
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Union,
+    overload,
+)
+
+import httpx
+
+from .async_http import AsyncHTTPTransport
+from .client import GET_CHUNK_ATTEMPTS, BaseClient, StageResponses
+from .json import aiter_array_items
+from .logging import log
+from .methods import (
+    InvocationResponse,
+    InvocationResponseOrError,
+    Method,
+    RawResponse,
+    Request,
+    Response,
+    ResponseOrError,
+)
+from .models import Event
+from .session import Session
+
+__all__ = ["AsyncClient"]
+
+# Default reconnection delay of the event source, as used by sseclient
+DEFAULT_EVENT_RETRY_SECONDS = 3.0
+
+
+class AsyncClient(BaseClient):
+    """JMAP client for asyncio
+
+    Takes the same options as Client, and has the same request API with
+    coroutines in place of blocking calls. Requests are sent with an
+    AsyncHTTPTransport, which requires the httpx extra and may be shared by
+    many clients to reuse connections. HTTP errors are raised as httpx
+    exceptions. A transport created by the client is closed by aclose() or
+    on leaving the client's async with block.
+
+    Responses are decoded on the event loop unless a decode_executor is set,
+    in which case responses of at least offload_min_bytes are decoded in the
+    executor without blocking the loop.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        *args: Any,
+        transport: Optional[AsyncHTTPTransport] = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(host, *args, **kwargs)
+        self._owns_transport = transport is None
+        self.transport: AsyncHTTPTransport = transport or AsyncHTTPTransport(
+            self._max_connections
+        )
+        self._session_lock: Optional[asyncio.Lock] = None
+
+    async def __aenter__(self) -> AsyncClient:
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        if self._owns_transport:
+            await self.transport.aclose()
+
+    @property
+    def events(self) -> AsyncGenerator[Event, None]:
+        return self._iter_events()
+
+    async def get_jmap_session(self) -> Session:
+        if not self._jmap_session:
+            # Concurrent callers wait for a single session request
+            if self._session_lock is None:
+                self._session_lock = asyncio.Lock()
+            async with self._session_lock:
+                if not self._jmap_session:
+                    r = await self.transport.request(
+                        "GET", self._session_url, auth=self._auth
+                    )
+                    r.raise_for_status()
+                    self._jmap_session = self._load_session(r.content)
+        return self._jmap_session
+
+    async def get_account_id(self) -> str:
+        return self._primary_account_id(await self.get_jmap_session())
+
+    @overload
+    async def request(
+        self,
+        calls: Method,
+        raise_errors: Literal[False] = False,
+        single_response: Literal[True] = True,
+    ) -> ResponseOrError:
+        ...  # pragma: no cover
+
+    @overload
+    async def request(
+        self,
+        calls: Method,
+        raise_errors: Literal[False] = False,
+        single_response: Literal[False] = False,
+    ) -> Union[Sequence[ResponseOrError], ResponseOrError]:
+        ...  # pragma: no cover
+
+    @overload
+    async def request(
+        self,
+        calls: Method,
+        raise_errors: Literal[True],
+        single_response: Literal[True],
+    ) -> Response:
+        ...  # pragma: no cover
+
+    @overload
+    async def request(
+        self,
+        calls: Method,
+        raise_errors: Literal[True],
+        single_response: Literal[False] = False,
+    ) -> Union[Sequence[Response], Response]:
+        ...  # pragma: no cover
+
+    @overload
+    async def request(
+        self,
+        calls: Sequence[Request],
+        raise_errors: Literal[False] = False,
+    ) -> Sequence[InvocationResponse]:
+        ...  # pragma: no cover
+
+    @overload
+    async def request(
+        self,
+        calls: Sequence[Request],
+        raise_errors: Literal[True],
+    ) -> Sequence[InvocationResponse]:
+        ...  # pragma: no cover
+
+    @overload
+    async def request(
+        self,
+        calls: Method,
+        raise_errors: bool = False,
+        *,
+        single_response: Literal[True],
+        raw: Literal[True],
+    ) -> RawResponse:
+        ...  # pragma: no cover
+
+    @overload
+    async def request(
+        self,
+        calls: Method,
+        raise_errors: bool = False,
+        single_response: bool = False,
+        *,
+        raw: Literal[True],
+    ) -> Union[Sequence[RawResponse], RawResponse]:
+        ...  # pragma: no cover
+
+    @overload
+    async def request(
+        self,
+        calls: Sequence[Request],
+        raise_errors: bool = False,
+        *,
+        raw: Literal[True],
+    ) -> Sequence[RawResponse]:
+        ...  # pragma: no cover
+
+    async def request(
+        self,
+        calls: Union[Sequence[Request], Sequence[Method], Method],
+        raise_errors: bool = False,
+        single_response: bool = False,
+        raw: bool = False,
+    ) -> Union[
+        Sequence[InvocationResponseOrError],
+        Sequence[InvocationResponse],
+        Union[Sequence[ResponseOrError], ResponseOrError],
+        Union[Sequence[Response], Response],
+        Union[Sequence[RawResponse], RawResponse],
+    ]:
+        self._check_calls(calls, single_response)
+        method_calls, request, properties = self._prepare_request(
+            calls, await self.get_account_id()
+        )
+        # Execute request, split into several if it has too many calls or
+        # Get calls with too many ids. The stages are sent in order, as later
+        # calls may depend on the effects of earlier calls.
+        stages = self._plan_request(
+            request, method_calls, await self.get_jmap_session()
+        )
+        if raw:
+            raw_result: List[RawResponse] = []
+            for stage in stages:
+                raw_result += self._merge_raw_get_responses(
+                    await self._send_stage(self._raw_api_request, stage)
+                )
+            return self._raw_request_result(
+                calls, raw_result, raise_errors, single_response
+            )
+        result: List[InvocationResponseOrError] = []
+        for stage in stages:
+            result += self._merge_get_responses(
+                await self._send_stage(
+                    lambda rq: self._api_request(rq, properties), stage
+                )
+            )
+        return self._request_result(
+            calls, method_calls, result, raise_errors, single_response
+        )
+
+    async def request_stream(
+        self,
+        calls: Union[Sequence[Request], Sequence[Method], Method],
+        raise_errors: bool = False,
+    ) -> AsyncGenerator[InvocationResponseOrError, None]:
+        """Send a request and yield method responses as they are received
+
+        The response body is streamed and each method response is decoded as
+        soon as it has been received, so processing can start before the
+        whole response has arrived. The request is sent when the first
+        response is requested. Get calls are not split into chunks of ids.
+        """
+        _, request, properties = self._prepare_request(
+            calls, await self.get_account_id()
+        )
+        session = await self.get_jmap_session()
+        for rq in self._split_request(request, session):
+            spooler = self._body_value_spooler()
+            async with self.transport.stream(
+                "POST",
+                session.api_url,
+                auth=self._auth,
+                headers={"Content-Type": "application/json"},
+                data=self._request_body(rq),
+            ) as r:
+                r.raise_for_status()
+                async for item in aiter_array_items(
+                    r.aiter_bytes(), "methodResponses"
+                ):
+                    yield self._parse_streamed_response(
+                        item, properties, spooler, raise_errors
+                    )
+
+    async def _send_stage(
+        self,
+        send: Callable[[Dict[str, Any]], Awaitable[StageResponses]],
+        stage: List[Dict[str, Any]],
+    ) -> List[StageResponses]:
+        if len(stage) == 1:
+            return [await send(stage[0])]
+        semaphore = asyncio.Semaphore(
+            self._max_concurrent_requests(await self.get_jmap_session())
+        )
+
+        async def _send(request: Dict[str, Any]) -> StageResponses:
+            async with semaphore:
+                return await send(request)
+
+        for attempt in range(GET_CHUNK_ATTEMPTS):  # pragma: no branch
+            results = list(await asyncio.gather(*(_send(rq) for rq in stage)))
+            if self._check_chunk_states(stage, results, attempt):
+                break
+        return results
+
+    async def _api_request(
+        self,
+        request: Dict[str, Any],
+        properties: Optional[Dict[str, List[str]]] = None,
+    ) -> Sequence[InvocationResponseOrError]:
+        body = await self._send_request(request)
+        if self._offload_decode(body):
+            split = await asyncio.wrap_future(
+                self._submit_response_split(body)
+            )
+            method_responses, parts = self._submit_response_parts(
+                body, split, properties or {}
+            )
+            models = await asyncio.gather(
+                *(asyncio.wrap_future(future) for _, _, future in parts)
+            )
+            return self._join_response_parts(
+                method_responses,
+                [
+                    (index, name, chunk)
+                    for (index, name, _), chunk in zip(parts, models)
+                ],
+            )
+        return self._parse_method_responses(
+            self._decode_response_body(body), properties
+        )
+
+    async def _raw_api_request(
+        self, request: Dict[str, Any]
+    ) -> List[RawResponse]:
+        return self._raw_responses(await self._send_request(request))
+
+    async def _send_request(self, request: Dict[str, Any]) -> bytes:
+        session = await self.get_jmap_session()
+        r = await self.transport.request(
+            "POST",
+            session.api_url,
+            auth=self._auth,
+            headers={"Content-Type": "application/json"},
+            data=self._request_body(request),
+        )
+        r.raise_for_status()
+        self._log_response(r.content)
+        return r.content
+
+    async def _iter_events(self) -> AsyncGenerator[Event, None]:
+        url = self._event_source_url(await self.get_jmap_session())
+        parser = _ServerSentEventParser(
+            self._last_event_id, DEFAULT_EVENT_RETRY_SECONDS
+        )
+        while True:
+            headers = {"Accept": "text/event-stream"}
+            if parser.last_event_id:
+                headers["Last-Event-ID"] = parser.last_event_id
+            parser.reset()
+            try:
+                async with self.transport.stream(
+                    "GET", url, auth=self._auth, headers=headers
+                ) as response:
+                    response.raise_for_status()
+                    async for chunk in response.aiter_bytes():
+                        for event in parser.feed(chunk):
+                            self._last_event_id = parser.last_event_id
+                            if event.event != "state":
+                                continue
+                            yield Event.from_dict(
+                                {
+                                    "id": event.id,
+                                    "data": self._json.loads(event.data),
+                                }
+                            )
+                        self._last_event_id = parser.last_event_id
+            except httpx.TransportError as e:
+                log.debug(f"Event source disconnected: {e}")
+            # Reconnect after the event stream ends, as sseclient does
+            await asyncio.sleep(parser.retry)
+
+
+@dataclass
+class _ServerSentEvent:
+    data: str
+    event: str = "message"
+    id: Optional[str] = None
+
+
+class _ServerSentEventParser:
+    """Incremental parser of an event stream
+
+    As in the EventSource API, the last event id and reconnection time (in
+    seconds) are set as soon as their fields are read, whether or not an
+    event is dispatched, and are kept for later events and reconnections.
+    """
+
+    def __init__(self, last_event_id: Optional[str], retry: float) -> None:
+        self.last_event_id = last_event_id
+        self.retry = retry
+        self.reset()
+
+    def reset(self) -> None:
+        """Discard a partially received event"""
+        self._buffer = b""
+        self._data: List[str] = []
+        self._event = ""
+
+    def feed(self, chunk: bytes) -> Iterator[_ServerSentEvent]:
+        buffer = self._buffer + chunk
+        # A CR ending a chunk may be followed by a LF in the next chunk
+        pending_cr = buffer.endswith(b"\r")
+        if pending_cr:
+            buffer = buffer[:-1]
+        lines = buffer.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+        *complete, self._buffer = lines.split(b"\n")
+        if pending_cr:
+            self._buffer += b"\r"
+        for line in complete:
+            if not line:
+                # A blank line dispatches the event
+                if self._data:
+                    yield _ServerSentEvent(
+                        data="\n".join(self._data),
+                        event=self._event or "message",
+                        id=self.last_event_id,
+                    )
+                self._data, self._event = [], ""
+                continue
+            name, _, value = line.decode().partition(":")
+            value = value[1:] if value.startswith(" ") else value
+            if name == "data":
+                self._data.append(value)
+            elif name == "event":
+                self._event = value
+            elif name == "id" and "\0" not in value:
+                self.last_event_id = value
+            elif name == "retry" and value.isascii() and value.isdigit():
+                self.retry = int(value) / 1000
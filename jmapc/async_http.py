@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import ssl
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Generator,
+    Optional,
+    Tuple,
+    Union,
+)
+
+import httpx
+import requests
+
+from .transport import RequestsAuth
+
+__all__ = ["AsyncAuth", "AsyncHTTPTransport"]
+
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+DEFAULT_KEEPALIVE_EXPIRY = 5.0
+DEFAULT_TIMEOUT = 60.0
+MAX_REDIRECTS = 30
+
+AsyncAuth = Union[RequestsAuth, httpx.Auth]
+
+
+class AsyncHTTPTransport:
+    """Non-blocking HTTP transport built on httpx, from the httpx extra
+
+    Connections are kept alive and reused per origin. At most
+    max_connections requests are sent at once, and further requests wait
+    for one to complete. Up to max_keepalive_connections idle connections
+    are kept open for at most keepalive_expiry seconds. timeout limits
+    connecting and waiting for data, in seconds. Proxies and CA bundles are
+    taken from the environment, as with requests, unless a proxy URL or
+    ssl_context is given.
+
+    auth may be an httpx.Auth, or the same auth as Client: digest auth from
+    requests is replaced with httpx.DigestAuth, and other requests auth
+    objects are applied to each request without their response hooks.
+
+    A transport may be shared by any number of clients running on the same
+    event loop, and is bound to the loop it is first used on.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+        timeout: Optional[float] = DEFAULT_TIMEOUT,
+        ssl_context: Optional[ssl.SSLContext] = None,
+        proxy: Optional[str] = None,
+    ) -> None:
+        self._client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            # Requests wait for a free connection without a time limit
+            timeout=httpx.Timeout(timeout, pool=None),
+            verify=True if ssl_context is None else ssl_context,
+            proxy=proxy,
+            follow_redirects=True,
+            max_redirects=MAX_REDIRECTS,
+        )
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def __aenter__(self) -> AsyncHTTPTransport:
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close all connections
+
+        The transport cannot be used after it is closed.
+        """
+        await self._client.aclose()
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        auth: Optional[AsyncAuth] = None,
+        headers: Optional[Dict[str, str]] = None,
+        data: Optional[bytes] = None,
+    ) -> httpx.Response:
+        """Send a request and return the response with its content read
+
+        Redirects are followed, and the response content is decoded if it is
+        compressed.
+        """
+        self._check_loop()
+        return await self._client.request(
+            method, url, auth=_httpx_auth(auth), headers=headers, content=data
+        )
+
+    @contextlib.asynccontextmanager
+    async def stream(
+        self,
+        method: str,
+        url: str,
+        auth: Optional[AsyncAuth] = None,
+        headers: Optional[Dict[str, str]] = None,
+        data: Optional[bytes] = None,
+    ) -> AsyncIterator[httpx.Response]:
+        """Send a request and yield the response before reading its content
+
+        The connection is returned to the pool if the content is read to the
+        end, and closed otherwise.
+        """
+        self._check_loop()
+        async with self._client.stream(
+            method, url, auth=_httpx_auth(auth), headers=headers, content=data
+        ) as response:
+            yield response
+
+    def _check_loop(self) -> None:
+        # Pooled connections can only be used on the loop which opened them
+        loop = asyncio.get_running_loop()
+        if self._loop is None:
+            self._loop = loop
+        elif self._loop is not loop:
+            raise RuntimeError(
+                "AsyncHTTPTransport used on a different event loop"
+            )
+
+
+class _RequestsAuthAdapter(httpx.Auth):
+    def __init__(self, auth: requests.auth.AuthBase) -> None:
+        self.auth = auth
+
+    def auth_flow(
+        self, request: httpx.Request
+    ) -> Generator[httpx.Request, httpx.Response, None]:
+        prepared = requests.PreparedRequest()
+        prepared.prepare(
+            method=request.method,
+            url=str(request.url),
+            headers=dict(request.headers),
+        )
+        prepared.body = request.content
+        prepared = self.auth(prepared)
+        request.headers.update(prepared.headers)
+        yield request
+
+
+def _httpx_auth(
+    auth: Optional[AsyncAuth],
+) -> Optional[Union[Tuple[str, str], httpx.Auth]]:
+    if auth is None or isinstance(auth, (tuple, httpx.Auth)):
+        return auth
+    if isinstance(auth, requests.auth.HTTPDigestAuth):
+        # Digest auth answers challenges in responses, which requests does
+        # with a response hook
+        return httpx.DigestAuth(auth.username, auth.password)
+    return _RequestsAuthAdapter(auth)
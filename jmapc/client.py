@@ -1,9 +1,16 @@
 from __future__ import annotations
 
+import dataclasses
 import json
+import logging
+import os
+import threading
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
 from dataclasses import asdict, dataclass
 from typing import (
+    TYPE_CHECKING,
     Any,
+    Callable,
     Dict,
     Generator,
     List,
@@ -19,26 +26,59 @@ from typing import (
 )
 
 import requests
-import sseclient
 
 from . import constants, errors
 from .auth import BearerAuth
-from .logging import log
+from .interning import DEFAULT_MAX_ADDRESSES, Interner
+from .json import (
+    STREAM_CHUNK_SIZE,
+    ArraySplit,
+    JSONBackend,
+    iter_array_items,
+    split_method_responses,
+    stdlib_json_backend,
+)
+from .logging import log, log_body
 from .methods import (
     CustomResponse,
     Invocation,
     InvocationResponse,
     InvocationResponseOrError,
     Method,
+    RawResponse,
     Request,
     Response,
     ResponseOrError,
 )
+from .methods.base import Get, GetResponse
 from .models import Event
+from .serializer import (
+    LazyList,
+    MethodCallsSlice,
+    decode_models,
+    model_list_fields,
+)
 from .session import Session
+from .spool import BodyValueSpooler, spooling_loads
+from .transport import DEFAULT_MAX_CONNECTIONS, HTTPTransport, RequestsAuth
+
+if TYPE_CHECKING:
+    import sseclient  # pragma: no cover
 
-RequestsAuth = Union[requests.auth.AuthBase, Tuple[str, str]]
-ClientType = TypeVar("ClientType", bound="Client")
+DEFAULT_LOG_MAX_BYTES = 65536
+DEFAULT_OFFLOAD_MIN_BYTES = 8 * 1024 * 1024
+# Attempts to get all chunks of a Get call in the same state
+GET_CHUNK_ATTEMPTS = 3
+
+# Part of a list of models decoded in a decoder executor, as (method response
+# index, field name, models)
+ResponsePart = Tuple[int, str, "Future[List[Any]]"]
+ClientType = TypeVar("ClientType", bound="BaseClient")
+# Responses to one request of a stage
+StageResponses = TypeVar(
+    "StageResponses",
+    bound=Sequence[Union[InvocationResponseOrError, RawResponse]],
+)
 
 
 @dataclass
@@ -48,7 +88,16 @@ class EventSourceConfig:
     ping: int = 0
 
 
-class Client:
+class BaseClient:
+    """Request encoding and response decoding shared by JMAP clients
+
+    If spool_min_bytes is set, email body values of at least that many UTF-8
+    bytes are moved to temporary files (in spool_dir, if given) while
+    response bodies are parsed, and are decoded to
+    EmailBodyValue.spooled_value instead of value. Response bodies are then
+    parsed with the json module, and are not decoded in a decode_executor.
+    """
+
     @classmethod
     def create_with_api_token(
         cls: Type[ClientType],
@@ -80,6 +129,17 @@ class Client:
         auth: Optional[RequestsAuth] = None,
         last_event_id: Optional[str] = None,
         event_source_config: Optional[EventSourceConfig] = None,
+        json_backend: Optional[JSONBackend] = None,
+        log_max_bytes: Optional[int] = DEFAULT_LOG_MAX_BYTES,
+        lazy_decode: bool = False,
+        decode_executor: Optional[Executor] = None,
+        offload_min_bytes: int = DEFAULT_OFFLOAD_MIN_BYTES,
+        offload_chunks: Optional[int] = None,
+        intern_values: bool = False,
+        max_interned_addresses: int = DEFAULT_MAX_ADDRESSES,
+        spool_min_bytes: Optional[int] = None,
+        spool_dir: Optional[str] = None,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
     ) -> None:
         self._host: str = host
         self._auth: Optional[RequestsAuth] = auth
@@ -87,52 +147,577 @@ class Client:
         self._event_source_config: EventSourceConfig = (
             event_source_config or EventSourceConfig()
         )
+        self._json: JSONBackend = json_backend or stdlib_json_backend
+        self._log_max_bytes: Optional[int] = log_max_bytes
+        self._lazy_decode: bool = lazy_decode
+        self._decode_executor: Optional[Executor] = decode_executor
+        self._offload_min_bytes: int = offload_min_bytes
+        self._offload_chunks: int = offload_chunks or os.cpu_count() or 1
+        self._interner: Optional[Interner] = (
+            Interner(max_interned_addresses) if intern_values else None
+        )
+        self._spool_min_bytes: Optional[int] = spool_min_bytes
+        self._spool_dir: Optional[str] = spool_dir
+        self._max_connections: int = max_connections
         self._jmap_session: Optional[Session] = None
+        # Guards lazily created attributes shared between threads
+        self._lock = threading.RLock()
+
+    @property
+    def _session_url(self) -> str:
+        return f"https://{self._host}/.well-known/jmap"
+
+    def _load_session(self, content: bytes) -> Session:
+        return Session.from_dict(self._json.loads(content))
+
+    def _event_source_url(self, session: Session) -> str:
+        return session.event_source_url.format(
+            **asdict(self._event_source_config)
+        )
+
+    @staticmethod
+    def _primary_account_id(session: Session) -> str:
+        primary_account_id = (
+            session.primary_accounts.core
+            or session.primary_accounts.mail
+            or session.primary_accounts.submission
+        )
+        if not primary_account_id:
+            raise Exception("No primary account ID found")
+        return primary_account_id
+
+    @staticmethod
+    def _check_calls(
+        calls: Union[Sequence[Request], Sequence[Method], Method],
+        single_response: bool,
+    ) -> None:
+        if isinstance(calls, list) and single_response:
+            raise ValueError(
+                "single_response cannot be used with "
+                "multiple JMAP request methods"
+            )
+
+    @staticmethod
+    def _raw_request_result(
+        calls: Union[Sequence[Request], Sequence[Method], Method],
+        raw_result: List[RawResponse],
+        raise_errors: bool,
+        single_response: bool,
+    ) -> Union[Sequence[RawResponse], RawResponse]:
+        if raise_errors and any(r.is_error for r in raw_result):
+            raise RuntimeError("Errors found")
+        if isinstance(calls, Method):
+            if len(raw_result) > 1:
+                if single_response:
+                    raise RuntimeError(
+                        f"{len(raw_result)} results received for single "
+                        f"method call {calls.jmap_method_name}"
+                    )
+                return raw_result
+            return raw_result[0]
+        return raw_result
+
+    @staticmethod
+    def _request_result(
+        calls: Union[Sequence[Request], Sequence[Method], Method],
+        method_calls: List[Invocation],
+        result: Union[
+            Sequence[InvocationResponseOrError], Sequence[InvocationResponse]
+        ],
+        raise_errors: bool,
+        single_response: bool,
+    ) -> Union[
+        Sequence[InvocationResponseOrError],
+        Sequence[InvocationResponse],
+        Union[Sequence[ResponseOrError], ResponseOrError],
+        Union[Sequence[Response], Response],
+    ]:
+        if raise_errors:
+            if any(isinstance(r.response, errors.Error) for r in result):
+                raise RuntimeError("Errors found")
+            result = [
+                InvocationResponse(
+                    id=r.id, response=cast(Response, r.response)
+                )
+                for r in result
+            ]
+        if isinstance(calls, Method):
+            if len(result) > 1:
+                if single_response:
+                    raise RuntimeError(
+                        f"{len(result)} results received for single method "
+                        f"call {method_calls[0].method.jmap_method_name}"
+                    )
+                return [r.response for r in result]
+            return result[0].response
+        return result
+
+    def _prepare_request(
+        self,
+        calls: Union[Sequence[Request], Sequence[Method], Method],
+        account_id: str,
+    ) -> Tuple[List[Invocation], Dict[str, Any], Dict[str, List[str]]]:
+        calls_list = calls if isinstance(calls, list) else [calls]
+        method_calls: List[Invocation] = []
+        # Create Invocations for Methods
+        for i, c in enumerate(calls_list):
+            if isinstance(c, Invocation):
+                method_calls.append(c)
+                continue
+            method_call_id = (
+                f"{i}.{c.jmap_method_name}"
+                if len(calls_list) > 1
+                else f"single.{c.jmap_method_name}"
+            )
+            method_calls.append(Invocation(id=method_call_id, method=c))
+        method_call_ids = MethodCallsSlice.index_method_call_ids(method_calls)
+        # Decode Get responses with decoders specialized to their properties
+        properties = {
+            c.id: c.method.properties
+            for c in method_calls
+            if isinstance(c.method, Get) and c.method.properties is not None
+        }
+        # Collect set of JMAP URNs used by all methods in this request
+        using = list(
+            set([constants.JMAP_URN_CORE]).union(
+                *[c.method.using for c in method_calls]
+            )
+        )
+        request = {
+            "using": sorted(using),
+            "methodCalls": [
+                [
+                    c.method.jmap_method_name,
+                    c.method.to_dict(
+                        account_id=account_id,
+                        method_calls_slice=MethodCallsSlice(
+                            method_calls, i, method_call_ids
+                        ),
+                        encode_json=True,
+                    ),
+                    c.id,
+                ]
+                for i, c in enumerate(method_calls)
+            ],
+        }
+        return method_calls, request, properties
+
+    @staticmethod
+    def _split_request(
+        request: Dict[str, Any], session: Session
+    ) -> List[Dict[str, Any]]:
+        """Split a request into requests within the server's call limit
+
+        Requests are only split between method calls where no later call
+        references the result or created records of an earlier call. If a
+        request cannot be split within the limit, the smallest request
+        possible is sent for the server to accept or reject.
+        """
+        max_calls = session.capabilities.core.max_calls_in_request
+        method_calls = request["methodCalls"]
+        if not max_calls or len(method_calls) <= max_calls:
+            return [request]
+        splittable = _split_points(method_calls)
+        requests = []
+        start = 0
+        while start < len(method_calls):
+            stop = min(start + max_calls, len(method_calls))
+            while stop > start + 1 and not splittable[stop]:
+                stop -= 1
+            if not splittable[stop]:
+                stop = splittable.index(True, start + 1)
+            requests.append(
+                dict(request, methodCalls=method_calls[start:stop])
+            )
+            start = stop
+        return requests
+
+    def _plan_request(
+        self,
+        request: Dict[str, Any],
+        method_calls: List[Invocation],
+        session: Session,
+    ) -> List[List[Dict[str, Any]]]:
+        """Split a request into stages of requests to send in order
+
+        A Get call with more ids than the server's maxObjectsInGet is sent in
+        a stage of its own, with one request for each chunk of ids. The
+        requests of a stage may be sent concurrently, and their responses are
+        merged into one. The chunks are fetched again if the state changes
+        between them. Get calls are only chunked if they have literal ids,
+        no other call depends on them and they depend on no other call. The
+        remaining calls are split by _split_request, one request per stage.
+        """
+        max_objects = session.capabilities.core.max_objects_in_get
+        calls = request["methodCalls"]
+        if not max_objects:
+            return [[rq] for rq in self._split_request(request, session)]
+        splittable = _split_points(calls)
+        stages: List[List[Dict[str, Any]]] = []
+        start = 0
+        for i, (name, arguments, method_id) in enumerate(calls):
+            ids = arguments.get("ids")
+            if not (
+                isinstance(method_calls[i].method, Get)
+                and isinstance(ids, list)
+                and len(ids) > max_objects
+                and splittable[i]
+                and splittable[i + 1]
+            ):
+                continue
+            if start < i:
+                stages += [
+                    [rq]
+                    for rq in self._split_request(
+                        dict(request, methodCalls=calls[start:i]), session
+                    )
+                ]
+            stages.append(
+                [
+                    dict(
+                        request,
+                        methodCalls=[
+                            [
+                                name,
+                                dict(arguments, ids=chunk),
+                                method_id,
+                            ]
+                        ],
+                    )
+                    for chunk in _chunks(ids, max_objects)
+                ]
+            )
+            start = i + 1
+        if start < len(calls):
+            stages += [
+                [rq]
+                for rq in self._split_request(
+                    dict(request, methodCalls=calls[start:]), session
+                )
+            ]
+        return stages
+
+    @staticmethod
+    def _max_concurrent_requests(session: Session) -> int:
+        return session.capabilities.core.max_concurrent_requests or 1
+
+    @staticmethod
+    def _merge_get_responses(
+        results: List[Sequence[InvocationResponseOrError]],
+    ) -> Sequence[InvocationResponseOrError]:
+        """Merge the responses to the chunks of a Get call
+
+        An error response to any chunk is returned instead of the partial
+        results. All chunks have the same state, as checked by
+        _check_chunk_states.
+        """
+        if len(results) == 1:
+            return results[0]
+        responses = [r for result in results for r in result]
+        for r in responses:
+            if not isinstance(r.response, GetResponse):
+                return [r]
+        get_responses = [cast(GetResponse, r.response) for r in responses]
+        fields: Dict[str, Any] = {
+            "not_found": _join_lists([r.not_found for r in get_responses])
+        }
+        if hasattr(get_responses[0], "data"):
+            fields["data"] = _join_lists(
+                [cast(Any, r).data for r in get_responses]
+            )
+        return [
+            dataclasses.replace(
+                responses[0],
+                response=dataclasses.replace(get_responses[0], **fields),
+            )
+        ]
+
+    @staticmethod
+    def _check_chunk_states(
+        stage: List[Dict[str, Any]],
+        results: Sequence[
+            Sequence[Union[InvocationResponseOrError, RawResponse]]
+        ],
+        attempt: int,
+    ) -> bool:
+        """Return whether the chunks of a Get call have the same state
+
+        Raises RuntimeError if they did not on the last attempt, as merging
+        objects from different states would break later changes calls.
+        """
+        states = set()
+        for result in results:
+            for r in result:
+                if isinstance(r, RawResponse):
+                    if not r.is_error:
+                        states.add(r.data.get("state"))
+                elif isinstance(r.response, GetResponse):
+                    states.add(r.response.state)
+        if len(states) <= 1:
+            return True
+        name = stage[0]["methodCalls"][0][0]
+        if attempt + 1 >= GET_CHUNK_ATTEMPTS:
+            raise RuntimeError(
+                f"State changed while getting {name} in chunks "
+                f"{GET_CHUNK_ATTEMPTS} times"
+            )
+        log.debug(f"State changed while getting {name} in chunks, retrying")
+        return False
+
+    @staticmethod
+    def _merge_raw_get_responses(
+        results: List[List[RawResponse]],
+    ) -> List[RawResponse]:
+        if len(results) == 1:
+            return results[0]
+        responses = [r for result in results for r in result]
+        for r in responses:
+            if r.is_error:
+                return [r]
+        data = dict(responses[0].data)
+        for key in ("list", "notFound"):
+            data[key] = _join_lists([r.data.get(key) for r in responses])
+        return [dataclasses.replace(responses[0], data=data)]
+
+    def _parse_method_responses(
+        self,
+        data: dict[str, Any],
+        properties: Optional[Dict[str, List[str]]] = None,
+    ) -> Sequence[InvocationResponseOrError]:
+        method_responses = cast(
+            Sequence[Tuple[str, Dict[str, Any], str]],
+            data.get("methodResponses", []),
+        )
+        properties = properties or {}
+
+        return [
+            self._parse_method_response(name, response, method_id, properties)
+            for name, response, method_id in method_responses
+        ]
+
+    def _offload_decode(self, body: bytes) -> bool:
+        return (
+            self._decode_executor is not None
+            and not self._lazy_decode
+            and self._spool_min_bytes is None
+            and len(body) >= self._offload_min_bytes
+        )
+
+    def _submit_response_split(
+        self, body: bytes
+    ) -> Future[Tuple[List[List[Any]], List[ArraySplit]]]:
+        assert self._decode_executor
+        return self._decode_executor.submit(
+            _split_response, body, self._offload_chunks
+        )
+
+    def _submit_response_parts(
+        self,
+        body: bytes,
+        split: Tuple[List[List[Any]], List[ArraySplit]],
+        properties: Dict[str, List[str]],
+    ) -> Tuple[List[InvocationResponseOrError], List[ResponsePart]]:
+        assert self._decode_executor
+        # Each part decodes a share of the items of a list of models, sent as
+        # a slice of the body, while the rest of the response is decoded here
+        method_responses, splits = split
+        body_view = memoryview(body)
+        parts: List[ResponsePart] = []
+        for index, key, ranges in splits:
+            name, _, method_id = method_responses[index]
+            field_name, item_type = _model_list_keys(name)[key]
+            for start, stop in ranges:
+                parts.append(
+                    (
+                        index,
+                        field_name,
+                        self._decode_executor.submit(
+                            _decode_models_part,
+                            item_type,
+                            b"".join((b"[", body_view[start:stop], b"]")),
+                            properties.get(method_id),
+                        ),
+                    )
+                )
+        return [
+            InvocationResponseOrError(
+                id=method_id,
+                response=_response_type(name, response).from_dict(
+                    response, properties=properties.get(method_id)
+                ),
+            )
+            for name, response, method_id in method_responses
+        ], parts
+
+    def _join_response_parts(
+        self,
+        method_responses: List[InvocationResponseOrError],
+        parts: List[Tuple[int, str, List[Any]]],
+    ) -> Sequence[InvocationResponseOrError]:
+        models: Dict[Tuple[int, str], List[Any]] = {}
+        for index, field_name, chunk in parts:
+            models.setdefault((index, field_name), []).extend(chunk)
+        for (index, field_name), field_models in models.items():
+            method_responses[index].response = dataclasses.replace(
+                cast(Response, method_responses[index].response),
+                **{field_name: field_models},
+            )
+        for r in method_responses:
+            self._process_response(r.response)
+        return method_responses
+
+    def _raw_responses(self, body: bytes) -> List[RawResponse]:
+        data = self._json.loads(body)
+        return [
+            RawResponse(id=method_id, method_name=name, data=response)
+            for name, response, method_id in data.get("methodResponses", [])
+        ]
+
+    def _request_body(self, request: Dict[str, Any]) -> bytes:
+        body = self._json.dumps(request)
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug(
+                f"Sending JMAP request ({len(body)} bytes) "
+                f"{log_body(body, self._log_max_bytes)}"
+            )
+        return body
+
+    def _log_response(self, content: bytes) -> None:
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug(
+                f"Received JMAP response ({len(content)} bytes) "
+                f"{log_body(content, self._log_max_bytes)}"
+            )
+
+    def _parse_method_response(
+        self,
+        name: str,
+        response: Dict[str, Any],
+        method_id: str,
+        properties: Dict[str, List[str]],
+    ) -> InvocationResponseOrError:
+        result = InvocationResponseOrError(
+            id=method_id,
+            response=_response_type(name, response).from_dict(
+                response,
+                lazy=self._lazy_decode,
+                properties=properties.get(method_id),
+            ),
+        )
+        self._process_response(result.response)
+        return result
+
+    def _process_response(self, response: ResponseOrError) -> None:
+        if self._interner is not None:
+            self._interner.intern_response(response)
+
+    def _body_value_spooler(self) -> Optional[BodyValueSpooler]:
+        if self._spool_min_bytes is None:
+            return None
+        return BodyValueSpooler(self._spool_min_bytes, self._spool_dir)
+
+    def _parse_streamed_response(
+        self,
+        item: Tuple[str, Dict[str, Any], str],
+        properties: Dict[str, List[str]],
+        spooler: Optional[BodyValueSpooler],
+        raise_errors: bool,
+    ) -> InvocationResponseOrError:
+        name, response, method_id = item
+        if spooler is not None:
+            spooler.spool_parsed(response)
+        result = self._parse_method_response(
+            name, response, method_id, properties
+        )
+        if raise_errors and isinstance(result.response, errors.Error):
+            raise RuntimeError("Errors found")
+        return result
+
+    def _decode_response_body(self, body: bytes) -> Any:
+        if self._spool_min_bytes is not None:
+            return spooling_loads(body, self._spool_min_bytes, self._spool_dir)
+        return self._json.loads(body)
+
+
+class Client(BaseClient):
+    """JMAP client using requests
+
+    A client may be shared by many threads. The JMAP session is fetched
+    once, by the first thread to need it, and method objects passed to
+    request are not modified. Up to max_connections connections to the JMAP
+    server are kept open for reuse, which should be at least the number of
+    threads making requests. The events iterator must only be used by one
+    thread at a time.
+
+    Requests are sent with an HTTPTransport, which may be shared by many
+    clients to reuse connections to the same hosts. If no transport is
+    given, the client creates one with max_connections, which is closed by
+    close() or on leaving the client's with block.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        *args: Any,
+        transport: Optional[HTTPTransport] = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(host, *args, **kwargs)
+        self._owns_transport = transport is None
+        self.transport: HTTPTransport = transport or HTTPTransport(
+            self._max_connections
+        )
         self._requests_session: Optional[requests.Session] = None
         self._events: Optional[sseclient.SSEClient] = None
 
+    def __enter__(self) -> Client:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._owns_transport:
+            self.transport.close()
+
     @property
     def events(self) -> Generator[Event, None, None]:
-        if not self._events:
-            self._events = sseclient.SSEClient(
-                self.jmap_session.event_source_url.format(
-                    **asdict(self._event_source_config)
-                ),
-                auth=self.requests_session.auth,
-                last_id=self._last_event_id,
-            )
+        with self._lock:
+            if not self._events:
+                import sseclient
+
+                self._events = sseclient.SSEClient(
+                    self._event_source_url(self.jmap_session),
+                    auth=self.requests_session.auth,
+                    last_id=self._last_event_id,
+                )
         for event in self._events:
             if event.event != "state":
                 continue
-            yield Event.load_from_sseclient_event(event)
+            yield Event.load_from_sseclient_event(event, self._json)
 
     @property
     def requests_session(self) -> requests.Session:
         if not self._requests_session:
-            self._requests_session = requests.Session()
-            self._requests_session.auth = self._auth
+            with self._lock:
+                if not self._requests_session:
+                    self._requests_session = self.transport.session(self._auth)
         return self._requests_session
 
     @property
     def jmap_session(self) -> Session:
         if not self._jmap_session:
-            r = self.requests_session.get(
-                f"https://{self._host}/.well-known/jmap"
-            )
-            r.raise_for_status()
-            self._jmap_session = Session.from_dict(r.json())
+            # Other threads wait for the first thread's session request
+            with self._lock:
+                if not self._jmap_session:
+                    r = self.requests_session.get(self._session_url)
+                    r.raise_for_status()
+                    self._jmap_session = self._load_session(r.content)
         return self._jmap_session
 
     @property
     def account_id(self) -> str:
-        primary_account_id = (
-            self.jmap_session.primary_accounts.core
-            or self.jmap_session.primary_accounts.mail
-            or self.jmap_session.primary_accounts.submission
-        )
-        if not primary_account_id:
-            raise Exception("No primary account ID found")
-        return primary_account_id
+        return self._primary_account_id(self.jmap_session)
 
     @overload
     def request(
@@ -186,114 +771,261 @@ class Client:
     ) -> Sequence[InvocationResponse]:
         ...  # pragma: no cover
 
+    @overload
+    def request(
+        self,
+        calls: Method,
+        raise_errors: bool = False,
+        *,
+        single_response: Literal[True],
+        raw: Literal[True],
+    ) -> RawResponse:
+        ...  # pragma: no cover
+
+    @overload
+    def request(
+        self,
+        calls: Method,
+        raise_errors: bool = False,
+        single_response: bool = False,
+        *,
+        raw: Literal[True],
+    ) -> Union[Sequence[RawResponse], RawResponse]:
+        ...  # pragma: no cover
+
+    @overload
+    def request(
+        self,
+        calls: Sequence[Request],
+        raise_errors: bool = False,
+        *,
+        raw: Literal[True],
+    ) -> Sequence[RawResponse]:
+        ...  # pragma: no cover
+
     def request(
         self,
         calls: Union[Sequence[Request], Sequence[Method], Method],
         raise_errors: bool = False,
         single_response: bool = False,
+        raw: bool = False,
     ) -> Union[
         Sequence[InvocationResponseOrError],
         Sequence[InvocationResponse],
         Union[Sequence[ResponseOrError], ResponseOrError],
         Union[Sequence[Response], Response],
+        Union[Sequence[RawResponse], RawResponse],
     ]:
-        if isinstance(calls, list) and single_response:
-            raise ValueError(
-                "single_response cannot be used with "
-                "multiple JMAP request methods"
-            )
-
-        calls_list = calls if isinstance(calls, list) else [calls]
-        method_calls: List[Invocation] = []
-        # Create Invocations for Methods
-        for i, c in enumerate(calls_list):
-            if isinstance(c, Invocation):
-                method_calls.append(c)
-                continue
-            method_call_id = (
-                f"{i}.{c.jmap_method_name}"
-                if len(calls_list) > 1
-                else f"single.{c.jmap_method_name}"
+        self._check_calls(calls, single_response)
+        method_calls, request, properties = self._prepare_request(
+            calls, self.account_id
+        )
+        # Execute request, split into several if it has too many calls or
+        # Get calls with too many ids
+        stages = self._plan_request(request, method_calls, self.jmap_session)
+        if raw:
+            raw_result: List[RawResponse] = []
+            for stage in stages:
+                raw_result += self._merge_raw_get_responses(
+                    self._send_stage(self._raw_api_request, stage)
+                )
+            return self._raw_request_result(
+                calls, raw_result, raise_errors, single_response
             )
-            method_calls.append(Invocation(id=method_call_id, method=c))
-        # Collect set of JMAP URNs used by all methods in this request
-        using = list(
-            set([constants.JMAP_URN_CORE]).union(
-                *[c.method.using for c in method_calls]
+        result: List[InvocationResponseOrError] = []
+        for stage in stages:
+            result += self._merge_get_responses(
+                self._send_stage(
+                    lambda rq: self._api_request(rq, properties), stage
+                )
             )
+        return self._request_result(
+            calls, method_calls, result, raise_errors, single_response
         )
-        # Execute request
-        result: Union[
-            Sequence[InvocationResponseOrError], Sequence[InvocationResponse]
-        ] = self._api_request(
-            {
-                "using": sorted(using),
-                "methodCalls": [
-                    [
-                        c.method.jmap_method_name,
-                        c.method.to_dict(
-                            account_id=self.account_id,
-                            method_calls_slice=method_calls[:i],
-                            encode_json=True,
-                        ),
-                        c.id,
-                    ]
-                    for i, c in enumerate(method_calls)
-                ],
-            },
-        )
-        if raise_errors:
-            if any(isinstance(r.response, errors.Error) for r in result):
-                raise RuntimeError("Errors found")
-            result = [
-                InvocationResponse(
-                    id=r.id, response=cast(Response, r.response)
-                )
-                for r in result
-            ]
-        if isinstance(calls, Method):
-            if len(result) > 1:
-                if single_response:
-                    raise RuntimeError(
-                        f"{len(result)} results received for single method "
-                        f"call {method_calls[0].method.jmap_method_name}"
+
+    def request_stream(
+        self,
+        calls: Union[Sequence[Request], Sequence[Method], Method],
+        raise_errors: bool = False,
+    ) -> Generator[InvocationResponseOrError, None, None]:
+        """Send a request and yield method responses as they are received
+
+        The response body is streamed and each method response is decoded as
+        soon as it has been received, so processing can start before the
+        whole response has arrived. The request is sent when the first
+        response is requested. Get calls are not split into chunks of ids.
+        """
+        _, request, properties = self._prepare_request(calls, self.account_id)
+        for rq in self._split_request(request, self.jmap_session):
+            spooler = self._body_value_spooler()
+            with self._post_request(rq, stream=True) as r:
+                for item in iter_array_items(
+                    r.iter_content(STREAM_CHUNK_SIZE), "methodResponses"
+                ):
+                    yield self._parse_streamed_response(
+                        item, properties, spooler, raise_errors
                     )
-                return [r.response for r in result]
-            return result[0].response
-        return result
+
+    def _send_stage(
+        self,
+        send: Callable[[Dict[str, Any]], StageResponses],
+        stage: List[Dict[str, Any]],
+    ) -> List[StageResponses]:
+        if len(stage) == 1:
+            return [send(stage[0])]
+        with ThreadPoolExecutor(
+            min(len(stage), self._max_concurrent_requests(self.jmap_session))
+        ) as executor:
+            for attempt in range(GET_CHUNK_ATTEMPTS):  # pragma: no branch
+                results = list(executor.map(send, stage))
+                if self._check_chunk_states(stage, results, attempt):
+                    break
+        return results
 
     def _api_request(
-        self, request: Dict[str, Any]
+        self,
+        request: Dict[str, Any],
+        properties: Optional[Dict[str, List[str]]] = None,
     ) -> Sequence[InvocationResponseOrError]:
-        log.debug(f"Sending JMAP request {json.dumps(request)}")
+        body = self._send_request(request)
+        if self._offload_decode(body):
+            return self._parse_method_responses_offloaded(
+                body, properties or {}
+            )
+        return self._parse_method_responses(
+            self._decode_response_body(body), properties
+        )
+
+    def _raw_api_request(self, request: Dict[str, Any]) -> List[RawResponse]:
+        return self._raw_responses(self._send_request(request))
+
+    def _send_request(self, request: Dict[str, Any]) -> bytes:
+        r = self._post_request(request)
+        self._log_response(r.content)
+        return r.content
+
+    def _post_request(
+        self, request: Dict[str, Any], stream: bool = False
+    ) -> requests.Response:
         r = self.requests_session.post(
             self.jmap_session.api_url,
             headers={"Content-Type": "application/json"},
-            data=json.dumps(request),
+            data=self._request_body(request),
+            stream=stream,
         )
         r.raise_for_status()
-        log.debug(f"Received JMAP response {r.text}")
-        return self._parse_method_responses(r.json())
+        return r
 
-    def _parse_method_responses(
-        self, data: dict[str, Any]
+    def _parse_method_responses_offloaded(
+        self, body: bytes, properties: Dict[str, List[str]]
     ) -> Sequence[InvocationResponseOrError]:
-        method_responses = cast(
-            Sequence[Tuple[str, Dict[str, Any], str]],
-            data.get("methodResponses", []),
+        split = self._submit_response_split(body).result()
+        method_responses, parts = self._submit_response_parts(
+            body, split, properties
+        )
+        return self._join_response_parts(
+            method_responses,
+            [(index, name, future.result()) for index, name, future in parts],
         )
 
-        return [
-            InvocationResponseOrError(
-                id=method_id,
-                response=self._response_type(name).from_dict(response),
-            )
-            for name, response, method_id in method_responses
-        ]
 
-    def _response_type(self, method_name: str) -> Type[ResponseOrError]:
-        if method_name == "error":
-            return errors.Error
-        if method_name in Response.response_types:
-            return Response.response_types[method_name]
-        return CustomResponse
+def _split_response(
+    body: bytes, parts: int
+) -> Tuple[List[List[Any]], List[ArraySplit]]:
+    # Split the lists of models in a response body in a decode executor
+    # worker, so that the calling thread does not parse the whole body
+    return split_method_responses(body, _model_list_keys, parts)
+
+
+def _model_list_keys(method_name: str) -> Dict[str, Tuple[str, type]]:
+    if method_name == "error":
+        return {}
+    response_type = Response.response_types.get(method_name, CustomResponse)
+    return {
+        key: (field_name, item_type)
+        for key, field_name, item_type in model_list_fields(response_type)
+    }
+
+
+def _decode_models_part(
+    item_type: type, items: bytes, properties: Optional[List[str]]
+) -> List[Any]:
+    # Decode part of a list of models in a decode executor worker. Response
+    # bodies are split with the json module, which also parses the parts, so
+    # that custom JSON backends do not need to be sent to worker processes.
+    return decode_models(item_type, json.loads(items), properties)
+
+
+def _join_lists(
+    lists: Sequence[Optional[Sequence[Any]]],
+) -> Optional[Sequence[Any]]:
+    present = [items for items in lists if items is not None]
+    if not present:
+        return None
+    if all(isinstance(items, LazyList) for items in present):
+        return LazyList.concat(cast(List[LazyList[Any]], present))
+    return [item for items in present for item in items]
+
+
+def _chunks(items: List[Any], size: int) -> List[List[Any]]:
+    chunks = []
+    for start in range(0, len(items), size):
+        stop = start + size
+        chunks.append(items[start:stop])
+    return chunks
+
+
+def _split_points(method_calls: List[List[Any]]) -> List[bool]:
+    # A split before call i is possible if no call from i onwards depends on
+    # a call before i
+    splittable = [False] * (len(method_calls) + 1)
+    splittable[0] = splittable[-1] = True
+    first_dependency = len(method_calls)
+    dependencies = _call_dependencies(method_calls)
+    for i in reversed(range(1, len(method_calls))):
+        first_dependency = min(first_dependency, dependencies[i])
+        splittable[i] = first_dependency >= i
+    return splittable
+
+
+def _call_dependencies(method_calls: List[List[Any]]) -> List[int]:
+    # Return the index of the first earlier call each method call depends on,
+    # or its own index if it depends on none
+    indexes = {
+        method_id: i for i, (_, _, method_id) in enumerate(method_calls)
+    }
+    dependencies = []
+    for i, (_, arguments, _) in enumerate(method_calls):
+        dependency = i
+        for key, value in arguments.items():
+            if key.startswith("#") and isinstance(value, dict):
+                dependency = min(
+                    dependency, indexes.get(value.get("resultOf"), i)
+                )
+            elif _has_creation_reference(value):
+                # Creation ids may refer to records created by any earlier
+                # call in the request
+                dependency = 0
+        dependencies.append(dependency)
+    return dependencies
+
+
+def _has_creation_reference(value: Any) -> bool:
+    if isinstance(value, str):
+        return value.startswith("#")
+    if isinstance(value, dict):
+        return any(
+            _has_creation_reference(k) or _has_creation_reference(v)
+            for k, v in value.items()
+        )
+    if isinstance(value, list):
+        return any(_has_creation_reference(v) for v in value)
+    return False
+
+
+def _response_type(
+    method_name: str, data: Dict[str, Any]
+) -> Type[ResponseOrError]:
+    if method_name == "error":
+        return errors.Error.error_class(data.get("type"))
+    return Response.response_types.get(method_name, CustomResponse)
@@ -0,0 +1,319 @@
+from __future__ import annotations
+
+from array import array
+from datetime import datetime, timedelta, timezone
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from .methods import (
+    EmailGetResponse,
+    InvocationResponseOrError,
+    RawResponse,
+    ResponseOrError,
+)
+from .models import Email, EmailAddress
+from .serializer import datetime_decode
+
+__all__ = ["DictionaryColumn", "EmailColumns", "StringColumn"]
+
+NULL_CODE = -1
+NULL_SIZE = -1
+# Same value as numpy.datetime64("NaT")
+NULL_TIMESTAMP = -(2**63)
+
+EMAIL_COLUMN_PROPERTIES = [
+    "id",
+    "threadId",
+    "receivedAt",
+    "size",
+    "keywords",
+    "from",
+]
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+T = TypeVar("T", bound=Hashable)
+Addresses = Tuple[Tuple[Optional[str], Optional[str]], ...]
+EmailResponse = Union[InvocationResponseOrError, ResponseOrError, RawResponse]
+
+
+class StringColumn:
+    """Strings stored as one UTF-8 buffer with an array of end offsets
+
+    None is stored as an empty string.
+    """
+
+    def __init__(self) -> None:
+        self.data = bytearray()
+        self.offsets = array("q")
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def __getitem__(self, index: int) -> str:
+        index = range(len(self.offsets))[index]
+        start = self.offsets[index - 1] if index else 0
+        stop = self.offsets[index]
+        return self.data[start:stop].decode()
+
+    def __iter__(self) -> Iterator[str]:
+        start = 0
+        for stop in self.offsets:
+            yield self.data[start:stop].decode()
+            start = stop
+
+    def append(self, value: Optional[str]) -> None:
+        if value:
+            self.data += value.encode()
+        self.offsets.append(len(self.data))
+
+
+class DictionaryColumn(Generic[T]):
+    """Dictionary encoded values, stored as an array of codes
+
+    Each distinct value is stored once in dictionary, and codes holds the
+    position of each row's value in dictionary, or NULL_CODE for None.
+    """
+
+    def __init__(self) -> None:
+        self.dictionary: List[T] = []
+        self.codes = array("i")
+        self._index: Dict[T, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, index: int) -> Optional[T]:
+        code = self.codes[index]
+        return None if code == NULL_CODE else self.dictionary[code]
+
+    def __iter__(self) -> Iterator[Optional[T]]:
+        dictionary = self.dictionary
+        for code in self.codes:
+            yield None if code == NULL_CODE else dictionary[code]
+
+    def append(self, value: Optional[T]) -> None:
+        self.codes.append(self.code(value, add=True))
+
+    def code(self, value: Optional[T], add: bool = False) -> int:
+        """Return the code for a value, or NULL_CODE if it is not present"""
+        if value is None:
+            return NULL_CODE
+        code = self._index.get(value)
+        if code is None:
+            if not add:
+                return NULL_CODE
+            code = self._index[value] = len(self.dictionary)
+            self.dictionary.append(value)
+        return code
+
+    def mask(self, predicate: Callable[[T], bool]) -> bytearray:
+        """Return a 0/1 byte per row for whether its value matches
+
+        predicate is called once per distinct value. The result for each row
+        is looked up with a vectorized NumPy operation if NumPy is installed
+        (with the numpy extra), or in a loop over the rows otherwise.
+        """
+        matches = bytes(
+            [bool(predicate(value)) for value in self.dictionary] + [False]
+        )
+        # Null codes (-1) select the trailing False entry
+        try:
+            import numpy
+        except ImportError:
+            return bytearray(matches[code] for code in self.codes)
+        return bytearray(
+            numpy.frombuffer(matches, numpy.uint8)[
+                numpy.frombuffer(self.codes, numpy.int32)
+            ]
+        )
+
+
+class EmailColumns:
+    """Email metadata stored as one contiguous array per property
+
+    Rows can be added from Email models or from Email/get response data
+    which has not been decoded to models. Sizes and received timestamps
+    (microseconds since the epoch, as UTC) are stored in int64 arrays, with
+    NULL_SIZE and NULL_TIMESTAMP for missing values. Thread ids and senders
+    are dictionary encoded, and each keyword has a 0/1 byte per row.
+    """
+
+    def __init__(self) -> None:
+        self.ids = StringColumn()
+        self.thread_ids: DictionaryColumn[str] = DictionaryColumn()
+        self.received_at = array("q")
+        self.sizes = array("q")
+        self.keywords: Dict[str, bytearray] = {}
+        self.mail_from: DictionaryColumn[Addresses] = DictionaryColumn()
+
+    def __len__(self) -> int:
+        return len(self.sizes)
+
+    @classmethod
+    def from_responses(
+        cls,
+        responses: Iterable[EmailResponse],
+    ) -> EmailColumns:
+        """Build columns from Email/get responses
+
+        Responses may be method responses from Client.request or
+        Client.request_stream, or raw responses. Other responses are
+        ignored. Use EMAIL_COLUMN_PROPERTIES as Email/get properties to fetch
+        only the columns' properties.
+        """
+        columns = cls()
+        for response in responses:
+            columns.add_response(response)
+        return columns
+
+    def add_response(self, response: EmailResponse) -> None:
+        if isinstance(response, InvocationResponseOrError):
+            self.add_response(response.response)
+        elif isinstance(response, EmailGetResponse):
+            self.extend(response.data)
+        elif (
+            isinstance(response, RawResponse)
+            and response.method_name == "Email/get"
+        ):
+            self.extend(response.list or [])
+
+    def extend(self, emails: Iterable[Union[Email, Dict[str, Any]]]) -> None:
+        for email in emails:
+            self.append(email)
+
+    def append(self, email: Union[Email, Dict[str, Any]]) -> None:
+        if isinstance(email, Email):
+            self._append_row(
+                email.id,
+                email.thread_id,
+                email.received_at,
+                email.size,
+                email.keywords,
+                email.mail_from,
+            )
+            return
+        received_at = email.get("receivedAt")
+        self._append_row(
+            email.get("id"),
+            email.get("threadId"),
+            datetime_decode(received_at) if received_at else None,
+            email.get("size"),
+            email.get("keywords"),
+            email.get("from"),
+        )
+
+    def _append_row(
+        self,
+        id: Optional[str],
+        thread_id: Optional[str],
+        received_at: Optional[datetime],
+        size: Optional[int],
+        keywords: Optional[Dict[str, bool]],
+        mail_from: Optional[List[Any]],
+    ) -> None:
+        row = len(self)
+        self.ids.append(id)
+        self.thread_ids.append(thread_id)
+        self.received_at.append(
+            NULL_TIMESTAMP if received_at is None else _timestamp(received_at)
+        )
+        self.sizes.append(NULL_SIZE if size is None else size)
+        for keyword, flags in self.keywords.items():
+            flags.append(bool(keywords and keywords.get(keyword)))
+        for keyword, value in (keywords or {}).items():
+            if value and keyword not in self.keywords:
+                self.keywords[keyword] = bytearray(row)
+                self.keywords[keyword].append(1)
+        self.mail_from.append(
+            None if mail_from is None else _addresses(mail_from)
+        )
+
+    def has_keyword(self, keyword: str) -> bytearray:
+        """Return a 0/1 byte per row for whether it has a keyword"""
+        return self.keywords.get(keyword) or bytearray(len(self))
+
+    def from_email(self, email: str) -> bytearray:
+        """Return a 0/1 byte per row for whether an address sent it"""
+        return self.mail_from.mask(
+            lambda addresses: any(a[1] == email for a in addresses)
+        )
+
+    def email(self, index: int) -> Email:
+        """Return a row as an Email model"""
+        index = range(len(self))[index]
+        received_at = self.received_at[index]
+        size = self.sizes[index]
+        addresses = self.mail_from[index]
+        return Email(
+            id=self.ids[index],
+            thread_id=self.thread_ids[index],
+            received_at=(
+                None
+                if received_at == NULL_TIMESTAMP
+                else _EPOCH + received_at * _MICROSECOND
+            ),
+            size=None if size == NULL_SIZE else size,
+            keywords={
+                keyword: True
+                for keyword, flags in self.keywords.items()
+                if flags[index]
+            },
+            mail_from=(
+                None
+                if addresses is None
+                else [EmailAddress(name=n, email=e) for n, e in addresses]
+            ),
+        )
+
+    def to_numpy(self) -> Dict[str, Any]:
+        """Return the columns as NumPy arrays
+
+        Requires NumPy, which is installed with the numpy extra. Fixed width
+        columns are returned without copying.
+        receivedAt is a datetime64[us] array with NaT for missing values,
+        threadId and from are arrays of dictionary codes, and keywords are
+        boolean arrays keyed by "keywords/<keyword>".
+        """
+        import numpy
+
+        columns: Dict[str, Any] = {
+            "id": numpy.array(list(self.ids), dtype=object),
+            "threadId": numpy.frombuffer(self.thread_ids.codes, numpy.int32),
+            "receivedAt": numpy.frombuffer(self.received_at, "datetime64[us]"),
+            "size": numpy.frombuffer(self.sizes, numpy.int64),
+            "from": numpy.frombuffer(self.mail_from.codes, numpy.int32),
+        }
+        for keyword, flags in self.keywords.items():
+            columns[f"keywords/{keyword}"] = numpy.frombuffer(
+                flags, numpy.bool_
+            )
+        return columns
+
+
+def _timestamp(dt: datetime) -> int:
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return (dt - _EPOCH) // _MICROSECOND
+
+
+def _addresses(addresses: List[Any]) -> Addresses:
+    return tuple(
+        (a.name, a.email)
+        if isinstance(a, EmailAddress)
+        else (a.get("name"), a.get("email"))
+        for a in addresses
+    )
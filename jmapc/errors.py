@@ -3,7 +3,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, Type, cast
 
-from .serializer import Model
+from .serializer import FrozenModel, Model
 
 __all__ = ["Error", "ServerFail"]
 
@@ -15,9 +15,15 @@ class ErrorCollector(Model):
     def __init_subclass__(cls) -> None:
         error_class = cast(Type["Error"], cls)
         type_attr = getattr(error_class, "_type", None)
-        if type_attr:
+        if type_attr and not issubclass(cls, FrozenModel):
             ErrorCollector.error_types[type_attr] = error_class
 
+    @staticmethod
+    def error_class(error_type: Any) -> Type[Error]:
+        if isinstance(error_type, str):
+            return ErrorCollector.error_types.get(error_type, Error)
+        return Error
+
 
 @dataclass
 class Error(ErrorCollector):
@@ -29,14 +35,13 @@ class Error(ErrorCollector):
             self.type = type_attr
 
     @classmethod
-    def from_dict(cls, *args: Any, **kwargs: Any) -> Error:
-        res = super().from_dict(*args, **kwargs)
-        if cls == Error:
-            res_type = ErrorCollector.error_types.get(res.type)
-            if res_type:
-                return res_type.from_dict(*args, **kwargs)
-            return res
-        return res
+    def from_dict(cls, kvs: Any, *args: Any, **kwargs: Any) -> Error:
+        if cls is Error and isinstance(kvs, dict):
+            # Decode straight to the error type's subclass
+            res_type = ErrorCollector.error_class(kvs.get("type"))
+            if res_type is not Error:
+                return res_type.from_dict(kvs, *args, **kwargs)
+        return super().from_dict(kvs, *args, **kwargs)
 
 
 @dataclass
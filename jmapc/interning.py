@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple, TypeVar
+
+from .models import Email, EmailAddress, EmailBodyPart, Mailbox, Thread
+from .serializer import LazyList
+
+DEFAULT_MAX_ADDRESSES = 65536
+
+T = TypeVar("T")
+
+
+class Interner:
+    """Share repeated values between decoded models
+
+    Mailbox ids, keywords, thread ids and body part types and charsets are
+    interned, and identical email addresses are replaced with a single shared
+    frozen EmailAddress (see frozen_model) from a table holding up to
+    max_addresses entries. Shared addresses cannot be modified, and like
+    other frozen models, only compare equal to frozen addresses. Models in
+    lazily decoded lists are interned as they are decoded.
+    """
+
+    def __init__(self, max_addresses: int = DEFAULT_MAX_ADDRESSES) -> None:
+        self.max_addresses = max_addresses
+        self._addresses: OrderedDict[
+            Tuple[Optional[str], Optional[str]], EmailAddress
+        ] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._addresses)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._addresses.clear()
+
+    def intern_response(self, response: Any) -> None:
+        data = getattr(response, "data", None)
+        if isinstance(data, LazyList):
+            data.add_decode_hook(self._interned)
+        elif isinstance(data, list):
+            for model in data:
+                self.intern_model(model)
+
+    def _interned(self, model: T) -> T:
+        self.intern_model(model)
+        return model
+
+    def intern_model(self, model: Any) -> None:
+        if isinstance(model, Email):
+            self.intern_email(model)
+        elif isinstance(model, Thread):
+            model.id = _intern(model.id)
+            model.email_ids = _intern_list(model.email_ids)
+        elif isinstance(model, Mailbox):
+            model.id = _intern(model.id)
+            model.parent_id = _intern(model.parent_id)
+            model.role = _intern(model.role)
+
+    def intern_email(self, email: Email) -> None:
+        email.thread_id = _intern(email.thread_id)
+        email.mailbox_ids = _intern_keys(email.mailbox_ids)
+        email.keywords = _intern_keys(email.keywords)
+        email.mail_from = self.addresses(email.mail_from)
+        email.to = self.addresses(email.to)
+        email.cc = self.addresses(email.cc)
+        email.bcc = self.addresses(email.bcc)
+        email.reply_to = self.addresses(email.reply_to)
+        if email.body_structure:
+            self.intern_body_part(email.body_structure)
+        for parts in (email.text_body, email.html_body, email.attachments):
+            for part in parts or []:
+                self.intern_body_part(part)
+
+    def intern_body_part(self, part: EmailBodyPart) -> None:
+        part.type = _intern(part.type)
+        part.charset = _intern(part.charset)
+        for sub_part in part.sub_parts or []:
+            self.intern_body_part(sub_part)
+
+    def addresses(
+        self, addresses: Optional[List[EmailAddress]]
+    ) -> Optional[List[EmailAddress]]:
+        if not addresses:
+            return addresses
+        return [self.address(a) for a in addresses]
+
+    def address(self, address: EmailAddress) -> EmailAddress:
+        key = (address.name, address.email)
+        with self._lock:
+            shared = self._addresses.get(key)
+            if shared is not None:
+                self._addresses.move_to_end(key)
+                return shared
+            if self.max_addresses <= 0:
+                return address
+            if len(self._addresses) >= self.max_addresses:
+                self._addresses.popitem(last=False)
+            shared = EmailAddress(
+                name=_intern(address.name), email=_intern(address.email)
+            ).freeze()
+            self._addresses[key] = shared
+        return shared
+
+
+def _intern(value: T) -> T:
+    if isinstance(value, str):
+        return sys.intern(value)  # type: ignore
+    return value
+
+
+def _intern_list(values: List[str]) -> List[str]:
+    return [_intern(v) for v in values]
+
+
+def _intern_keys(
+    values: Optional[Dict[str, bool]]
+) -> Optional[Dict[str, bool]]:
+    if values is None:
+        return None
+    return {_intern(k): v for k, v in values.items()}
@@ -0,0 +1,371 @@
+from __future__ import annotations
+
+import codecs
+import json
+import re
+from dataclasses import dataclass
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Collection,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Tuple,
+    Union,
+    cast,
+)
+
+JSONInput = Union[bytes, bytearray, str]
+# Index of a method response, key of a split array in its arguments, and
+# the byte ranges of the shares of its items
+ArraySplit = Tuple[int, str, List[Tuple[int, int]]]
+
+__all__ = [
+    "JSONBackend",
+    "aiter_array_items",
+    "iter_array_items",
+    "split_method_responses",
+    "orjson_backend",
+    "stdlib_json_backend",
+]
+
+
+@dataclass(frozen=True)
+class JSONBackend:
+    """JSON encoder and decoder used for JMAP request and response bodies
+
+    dumps must return UTF-8 encoded bytes, and loads must accept bytes or str.
+    """
+
+    dumps: Callable[[Any], bytes]
+    loads: Callable[[JSONInput], Any]
+    name: str = "custom"
+
+
+def _stdlib_dumps(data: Any) -> bytes:
+    return json.dumps(data).encode()
+
+
+stdlib_json_backend = JSONBackend(
+    dumps=_stdlib_dumps, loads=json.loads, name="json"
+)
+
+
+def orjson_backend() -> JSONBackend:
+    """Return a JSON backend using orjson, from the orjson extra
+
+    orjson is faster than the json module, but encodes some data
+    differently. Requests with non-str dict keys or integers that do not fit
+    in 64 bits (for example, in CustomMethod arguments) raise TypeError, and
+    NaN and infinity are encoded as null.
+    """
+    import orjson
+
+    return JSONBackend(dumps=orjson.dumps, loads=orjson.loads, name="orjson")
+
+
+STREAM_CHUNK_SIZE = 65536
+
+_stream_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = _WHITESPACE + ",:]}"
+
+
+# Yielded by stream parsing generators when they need more text
+_MORE = object()
+
+
+class _StreamReader:
+    def __init__(self) -> None:
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._pending: List[str] = []
+        self._pending_length = 0
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def feed(self, chunk: bytes) -> None:
+        self._append(self._text_decoder.decode(chunk))
+
+    def finish(self) -> None:
+        self._append(self._text_decoder.decode(b"", final=True))
+        self.eof = True
+
+    def _append(self, text: str) -> None:
+        if text:
+            self._pending.append(text)
+            self._pending_length += len(text)
+
+    @property
+    def available(self) -> int:
+        return len(self.buf) - self.pos + self._pending_length
+
+    def join(self) -> None:
+        if self._pending:
+            # Drop text that has already been parsed
+            start = self.pos
+            self.buf = self.buf[start:] + "".join(self._pending)
+            self.pos = 0
+            self._pending = []
+            self._pending_length = 0
+
+    def peek(self) -> Generator[object, None, str]:
+        while True:
+            while (
+                self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE
+            ):
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._pending:
+                if self.eof:
+                    return ""
+                yield _MORE
+            self.join()
+
+    def expect(self, char: str) -> Generator[object, None, None]:
+        if (yield from self.peek()) != char:
+            raise json.JSONDecodeError(
+                f"Expecting '{char}'", self.buf, self.pos
+            )
+        self.pos += 1
+
+    def value(self) -> Generator[object, None, Any]:
+        yield from self.peek()
+        # Only retry incomplete values once the available text has grown
+        # fourfold, so that large values are decoded in linear time
+        min_length = 0
+        while True:
+            available = self.available
+            if available >= min_length or self.eof:
+                self.join()
+                try:
+                    value, end = _stream_decoder.raw_decode(self.buf, self.pos)
+                except json.JSONDecodeError:
+                    if self.eof:
+                        raise
+                else:
+                    # Numbers may continue in the next chunk, so values are
+                    # only complete if they are followed by a delimiter
+                    if self.eof or (
+                        end < len(self.buf) and self.buf[end] in _DELIMITERS
+                    ):
+                        self.pos = end
+                        return value
+                min_length = available * 4
+            if not self.eof:
+                yield _MORE
+
+
+def _array_items(
+    reader: _StreamReader, key: str
+) -> Generator[object, None, None]:
+    # Yields the items of the array, or _MORE when the reader needs more text
+    yield from reader.expect("{")
+    if (yield from reader.peek()) == "}":
+        return
+    while True:
+        name = yield from reader.value()
+        yield from reader.expect(":")
+        if name != key:
+            yield from reader.value()
+        else:
+            yield from reader.expect("[")
+            if (yield from reader.peek()) == "]":
+                reader.pos += 1
+            else:
+                while True:
+                    yield (yield from reader.value())
+                    if (yield from reader.peek()) != ",":
+                        yield from reader.expect("]")
+                        break
+                    reader.pos += 1
+        if (yield from reader.peek()) != ",":
+            yield from reader.expect("}")
+            return
+        reader.pos += 1
+
+
+def iter_array_items(chunks: Iterable[bytes], key: str) -> Iterator[Any]:
+    """Decode the items of an array in a JSON object as they are received
+
+    chunks is UTF-8 encoded JSON text, such as a streamed HTTP response
+    body. Each item of the array at the given top level key of the object is
+    yielded as soon as it is complete, and the text it was decoded from is
+    released. Values of other keys are decoded and discarded. Decoding uses
+    the standard library json module.
+    """
+    reader = _StreamReader()
+    chunks = iter(chunks)
+    for item in _array_items(reader, key):
+        if item is not _MORE:
+            yield item
+            continue
+        chunk = next(chunks, None)
+        if chunk is None:
+            reader.finish()
+        else:
+            reader.feed(chunk)
+
+
+async def aiter_array_items(
+    chunks: AsyncIterable[bytes], key: str
+) -> AsyncIterator[Any]:
+    """Decode the items of an array in a JSON object as they are received
+
+    Like iter_array_items, for chunks received asynchronously.
+    """
+    reader = _StreamReader()
+    chunk_iterator = chunks.__aiter__()
+    for item in _array_items(reader, key):
+        if item is not _MORE:
+            yield item
+            continue
+        try:
+            reader.feed(await chunk_iterator.__anext__())
+        except StopAsyncIteration:
+            reader.finish()
+
+
+_SKIP_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+class _TextReader:
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.pos = 0
+
+    def peek(self) -> str:
+        match = _SKIP_WHITESPACE.match(self.text, self.pos)
+        assert match
+        self.pos = match.end()
+        return self.text[self.pos] if self.pos < len(self.text) else ""
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise json.JSONDecodeError(
+                f"Expecting '{char}'", self.text, self.pos
+            )
+        self.pos += 1
+
+    def value(self) -> Any:
+        self.peek()
+        value, self.pos = _stream_decoder.raw_decode(self.text, self.pos)
+        return value
+
+    def key(self) -> str:
+        if self.peek() != '"':
+            raise json.JSONDecodeError(
+                "Expecting property name enclosed in double quotes",
+                self.text,
+                self.pos,
+            )
+        key = self.value()
+        self.expect(":")
+        return cast(str, key)
+
+    def items(self, close: str) -> Iterator[None]:
+        # Yield before each item of an array or member of an object, after
+        # its opening bracket has been read
+        if self.peek() == close:
+            self.pos += 1
+            return
+        while True:
+            yield
+            if self.peek() != ",":
+                self.expect(close)
+                return
+            self.pos += 1
+
+
+def split_method_responses(
+    body: bytes, split_keys: Callable[[str], Collection[str]], parts: int
+) -> Tuple[List[List[Any]], List[ArraySplit]]:
+    """Decode a JMAP response body, except for the arrays to be split
+
+    Returns the method responses in the body. Arrays in the arguments of a
+    method response at the keys given by split_keys(method_name) are left
+    empty. For each of these arrays, the byte ranges of its items in the
+    body are returned in up to parts contiguous, non-empty shares instead,
+    so that they can be decoded elsewhere, such as in worker processes.
+
+    The body is read with the standard library json module, which decodes
+    each item to find where it ends, but no item is encoded again.
+    """
+    text = body.decode()
+    reader = _TextReader(text)
+    method_responses: List[List[Any]] = []
+    splits: List[ArraySplit] = []
+    reader.expect("{")
+    for _ in reader.items("}"):
+        if reader.key() != "methodResponses":
+            reader.value()
+            continue
+        reader.expect("[")
+        for _ in reader.items("]"):
+            reader.expect("[")
+            name = reader.value()
+            reader.expect(",")
+            keys = split_keys(name)
+            arguments = {}
+            reader.expect("{")
+            for _ in reader.items("}"):
+                key = reader.key()
+                if key not in keys or reader.peek() != "[":
+                    arguments[key] = reader.value()
+                    continue
+                reader.pos += 1
+                spans = []
+                for _ in reader.items("]"):
+                    start = reader.pos
+                    reader.value()
+                    spans.append((start, reader.pos))
+                splits.append(
+                    (len(method_responses), key, _shares(spans, parts))
+                )
+                arguments[key] = []
+            reader.expect(",")
+            method_id = reader.value()
+            reader.expect("]")
+            method_responses.append([name, arguments, method_id])
+    if reader.peek():
+        raise json.JSONDecodeError("Extra data", text, reader.pos)
+    if len(text) != len(body):
+        splits = _byte_ranges(text, splits)
+    return method_responses, splits
+
+
+def _shares(spans: List[Tuple[int, int]], parts: int) -> List[Tuple[int, int]]:
+    shares = []
+    for part in range(parts):
+        start = len(spans) * part // parts
+        stop = len(spans) * (part + 1) // parts
+        if start < stop:
+            shares.append((spans[start][0], spans[stop - 1][1]))
+    return shares
+
+
+def _byte_ranges(text: str, splits: List[ArraySplit]) -> List[ArraySplit]:
+    # Convert character offsets in the decoded text to byte offsets in the
+    # UTF-8 body. Ranges are in order, so only the text between them is
+    # encoded.
+    char, byte = 0, 0
+
+    def _offset(pos: int) -> int:
+        nonlocal char, byte
+        byte += len(text[char:pos].encode())
+        char = pos
+        return byte
+
+    return [
+        (
+            index,
+            key,
+            [(_offset(start), _offset(stop)) for start, stop in ranges],
+        )
+        for index, key, ranges in splits
+    ]
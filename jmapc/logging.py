@@ -1,5 +1,20 @@
 import logging
+from typing import Optional
 
 # Set default logging handler to avoid "No handler found" warnings.
 log = logging.getLogger(__package__)
 log.addHandler(logging.NullHandler())
+
+
+def log_body(data: bytes, max_bytes: Optional[int]) -> str:
+    """Format a request or response body for logging
+
+    Bodies longer than max_bytes are truncated. Invalid UTF-8 sequences (for
+    example, at a truncation point) are replaced.
+    """
+    if max_bytes is not None and len(data) > max_bytes:
+        return (
+            f"{data[:max_bytes].decode(errors='replace')}"
+            f"... ({len(data) - max_bytes} more bytes)"
+        )
+    return data.decode(errors="replace")
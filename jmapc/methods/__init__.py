@@ -55,6 +55,7 @@ from .mailbox import (
     MailboxSet,
     MailboxSetResponse,
 )
+from .raw import RawResponse
 from .thread import (
     ThreadChanges,
     ThreadChangesResponse,
@@ -109,6 +110,7 @@ __all__ = [
     "MailboxSet",
     "MailboxSetResponse",
     "Method",
+    "RawResponse",
     "Request",
     "Response",
     "ResponseOrError",
@@ -8,7 +8,7 @@ from typing import Type, Union, cast
 
 from ..errors import Error
 from ..models import AddedItem, Comparator, ListOrRef, SetError, StrOrRef
-from ..serializer import Model
+from ..serializer import FrozenModel, Model
 
 
 class MethodBase(Model):
@@ -43,6 +43,8 @@ class ResponseCollector(MethodBase):
 
     @classmethod
     def __init_subclass__(cls) -> None:
+        if issubclass(cls, FrozenModel):
+            return
         with contextlib.suppress(ValueError):
             method_name = cls.get_method_name()
             ResponseCollector.response_types[method_name] = cast(
@@ -28,5 +28,6 @@ class CustomResponse(ResponseWithAccount):
 
     @classmethod
     def from_dict(cls, kvs: Any, *args: Any, **kwargs: Any) -> CustomResponse:
-        account_id = kvs.pop("accountId")
-        return CustomResponse(account_id=account_id, data=kvs)
+        data = dict(kvs)
+        account_id = data.pop("accountId")
+        return CustomResponse(account_id=account_id, data=data)
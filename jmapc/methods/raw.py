@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Union
+
+from ..serializer import slotted
+
+
+@slotted
+@dataclass
+class RawResponse:
+    """Method response or error as decoded JSON, without model decoding
+
+    created and updated are lists of ids in changes responses, and maps of
+    ids to objects in set responses.
+    """
+
+    id: str
+    method_name: str
+    data: Dict[str, Any]
+
+    def __getitem__(self, key: str) -> Any:
+        return self.data[key]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.data.get(key, default)
+
+    @property
+    def is_error(self) -> bool:
+        return self.method_name == "error"
+
+    @property
+    def error_type(self) -> Optional[str]:
+        return self.data.get("type") if self.is_error else None
+
+    @property
+    def account_id(self) -> Optional[str]:
+        return self.data.get("accountId")
+
+    @property
+    def state(self) -> Optional[str]:
+        return self.data.get("state")
+
+    @property
+    def old_state(self) -> Optional[str]:
+        return self.data.get("oldState")
+
+    @property
+    def new_state(self) -> Optional[str]:
+        return self.data.get("newState")
+
+    @property
+    def query_state(self) -> Optional[str]:
+        return self.data.get("queryState")
+
+    @property
+    def ids(self) -> Optional[List[str]]:
+        return self.data.get("ids")
+
+    @property
+    def list(self) -> Optional[List[Dict[str, Any]]]:
+        return self.data.get("list")
+
+    @property
+    def not_found(self) -> Optional[List[str]]:
+        return self.data.get("notFound")
+
+    @property
+    def total(self) -> Optional[int]:
+        return self.data.get("total")
+
+    @property
+    def position(self) -> Optional[int]:
+        return self.data.get("position")
+
+    @property
+    def has_more_changes(self) -> Optional[bool]:
+        return self.data.get("hasMoreChanges")
+
+    @property
+    def created(self) -> Union[Dict[str, Any], List[str], None]:
+        return self.data.get("created")
+
+    @property
+    def updated(self) -> Union[Dict[str, Any], List[str], None]:
+        return self.data.get("updated")
+
+    @property
+    def destroyed(self) -> Optional[List[str]]:
+        return self.data.get("destroyed")
+
+    @property
+    def not_created(self) -> Optional[Dict[str, Any]]:
+        return self.data.get("notCreated")
+
+    @property
+    def not_updated(self) -> Optional[Dict[str, Any]]:
+        return self.data.get("notUpdated")
+
+    @property
+    def not_destroyed(self) -> Optional[Dict[str, Any]]:
+        return self.data.get("notDestroyed")
@@ -6,10 +6,12 @@ from typing import Dict, List, Optional, Union
 
 from dataclasses_json import config
 
-from ..serializer import Model, datetime_decode, datetime_encode
+from ..serializer import Model, datetime_decode, datetime_encode, slotted
+from ..spool import SpooledText
 from .models import EmailAddress, ListOrRef, Operator, StrOrRef
 
 
+@slotted
 @dataclass
 class Email(Model):
     id: Optional[str] = field(metadata=config(field_name="id"), default=None)
@@ -47,12 +49,14 @@ class Email(Model):
     preview: Optional[str] = None
 
 
+@slotted
 @dataclass
 class EmailHeader(Model):
     name: Optional[str] = None
     value: Optional[str] = None
 
 
+@slotted
 @dataclass
 class EmailBodyPart(Model):
     part_id: Optional[str] = None
@@ -69,13 +73,26 @@ class EmailBodyPart(Model):
     sub_parts: Optional[List[EmailBodyPart]] = None
 
 
+@slotted
 @dataclass
 class EmailBodyValue(Model):
     value: Optional[str] = None
     is_encoding_problem: Optional[bool] = None
     is_truncated: Optional[bool] = None
+    # Set instead of value for values spooled by the client (see
+    # Client(spool_min_bytes=...)). Not included in to_dict().
+    spooled_value: Optional[SpooledText] = field(
+        default=None, metadata=config(exclude=lambda _: True)
+    )
+
+    def read(self) -> Optional[str]:
+        """Return value, or the text of spooled_value if it is spooled"""
+        if self.spooled_value is not None:
+            return self.spooled_value.read()
+        return self.value
 
 
+@slotted
 @dataclass
 class EmailQueryFilterCondition(Model):
     in_mailbox: Optional[StrOrRef] = None
@@ -107,6 +124,7 @@ class EmailQueryFilterCondition(Model):
     header: Optional[ListOrRef] = None
 
 
+@slotted
 @dataclass
 class EmailQueryFilterOperator(Model):
     operator: Operator
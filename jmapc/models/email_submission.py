@@ -5,12 +5,19 @@ from datetime import datetime
 from enum import Enum
 from typing import Dict, List, Optional, Union
 
-from dataclasses_json import DataClassJsonMixin, config
-
-from ..serializer import Model, datetime_decode, datetime_encode
+from dataclasses_json import config
+
+from ..serializer import (
+    Model,
+    SlottedDataClassJsonMixin,
+    datetime_decode,
+    datetime_encode,
+    slotted,
+)
 from .models import Operator
 
 
+@slotted
 @dataclass
 class EmailSubmission(Model):
     id: Optional[str] = field(metadata=config(field_name="id"), default=None)
@@ -28,14 +35,16 @@ class EmailSubmission(Model):
     mdn_blob_ids: Optional[List[str]] = None
 
 
+@slotted
 @dataclass
 class Envelope(Model):
     mail_from: Optional[Address] = None
     rcpt_to: Optional[List[Address]] = None
 
 
+@slotted
 @dataclass
-class Address(DataClassJsonMixin):
+class Address(SlottedDataClassJsonMixin):
     email: Optional[str] = None
     parameters: Optional[Dict[str, str]] = None
 
@@ -46,6 +55,7 @@ class UndoStatus(Enum):
     CANCELED = "canceled"
 
 
+@slotted
 @dataclass
 class DeliveryStatus(Model):
     smtp_reply: str
@@ -65,6 +75,7 @@ class Displayed(Enum):
     YES = "yes"
 
 
+@slotted
 @dataclass
 class EmailSubmissionQueryFilterCondition(Model):
     identity_ids: Optional[List[str]] = None
@@ -81,6 +92,7 @@ class EmailSubmissionQueryFilterCondition(Model):
     )
 
 
+@slotted
 @dataclass
 class EmailSubmissionQueryFilterOperator(Model):
     operator: Operator
@@ -1,13 +1,16 @@
-import json
 from dataclasses import dataclass, field
-from typing import Dict, Optional
+from typing import TYPE_CHECKING, Dict, Optional
 
-import sseclient
 from dataclasses_json import config
 
-from ..serializer import Model
+from ..json import JSONBackend, stdlib_json_backend
+from ..serializer import Model, slotted
 
+if TYPE_CHECKING:
+    import sseclient  # pragma: no cover
 
+
+@slotted
 @dataclass
 class TypeState(Model):
     calendar_event: Optional[str] = field(
@@ -27,18 +30,24 @@ class TypeState(Model):
     )
 
 
+@slotted
 @dataclass
 class StateChange(Model):
     changed: Dict[str, TypeState]
     type: Optional[str] = None
 
 
+@slotted
 @dataclass
 class Event(Model):
     id: Optional[str]
     data: StateChange
 
     @classmethod
-    def load_from_sseclient_event(cls, event: sseclient.Event) -> "Event":
-        data = json.loads(event.data)
+    def load_from_sseclient_event(
+        cls,
+        event: "sseclient.Event",
+        json_backend: JSONBackend = stdlib_json_backend,
+    ) -> "Event":
+        data = json_backend.loads(event.data)
         return cls.from_dict({"id": event.id, "data": data})
@@ -3,10 +3,11 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import List, Optional
 
-from ..serializer import Model
+from ..serializer import Model, slotted
 from .models import EmailAddress
 
 
+@slotted
 @dataclass
 class Identity(Model):
     name: str
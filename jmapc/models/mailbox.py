@@ -5,10 +5,11 @@ from typing import List, Optional, Union
 
 from dataclasses_json import config
 
-from ..serializer import Model
+from ..serializer import Model, slotted
 from .models import Operator, StrOrRef
 
 
+@slotted
 @dataclass
 class Mailbox(Model):
     id: Optional[str] = field(metadata=config(field_name="id"), default=None)
@@ -25,6 +26,7 @@ class Mailbox(Model):
     )
 
 
+@slotted
 @dataclass
 class MailboxQueryFilterCondition(Model):
     name: Optional[StrOrRef] = None
@@ -34,6 +36,7 @@ class MailboxQueryFilterCondition(Model):
     is_subscribed: Optional[bool] = None
 
 
+@slotted
 @dataclass
 class MailboxQueryFilterOperator(Model):
     operator: Operator
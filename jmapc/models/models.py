@@ -7,25 +7,28 @@ from typing import List, Optional, TypeVar, Union
 from dataclasses_json import config
 
 from ..ref import Ref, ResultReference
-from ..serializer import Model
+from ..serializer import Model, slotted
 
 T = TypeVar("T")
 StrOrRef = Union[str, ResultReference, Ref]
 ListOrRef = Union[List[T], ResultReference, Ref]
 
 
+@slotted
 @dataclass
 class AddedItem(Model):
     id: str = field(metadata=config(field_name="id"))
     index: int
 
 
+@slotted
 @dataclass
 class EmailAddress(Model):
     name: Optional[str] = None
     email: Optional[str] = None
 
 
+@slotted
 @dataclass
 class Comparator(Model):
     property: str
@@ -38,6 +41,7 @@ class Comparator(Model):
     position: int = 0
 
 
+@slotted
 @dataclass
 class FilterOperator(Model):
     operator: Operator
@@ -49,6 +53,7 @@ class Operator(Enum):
     NOT = "NOT"
 
 
+@slotted
 @dataclass
 class SetError(Model):
     type: str
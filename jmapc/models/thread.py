@@ -3,9 +3,10 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import List
 
-from ..serializer import Model
+from ..serializer import Model, slotted
 
 
+@slotted
 @dataclass
 class Thread(Model):
     def __len__(self) -> int:
@@ -1,31 +1,336 @@
 from __future__ import annotations
 
 import contextlib
-from datetime import datetime
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, cast
+import copy
+import dataclasses
+import functools
+import re
+import warnings
+from datetime import datetime, timedelta, timezone
+from datetime import tzinfo as tzinfo_type
+from decimal import Decimal
+from enum import Enum
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Collection,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Match,
+    MutableSequence,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    cast,
+    get_type_hints,
+    overload,
+)
+from uuid import UUID
 
 import dataclasses_json
-import dateutil.parser
+import dataclasses_json.core
+import dataclasses_json.utils
 
+from .logging import log
 from .ref import REF_SENTINEL_KEY, Ref, ResultReference
 
 if TYPE_CHECKING:
     from .client import Invocation  # pragma: no cover
 
+ModelType = TypeVar("ModelType", bound="Model")
+ItemType = TypeVar("ItemType")
+Decoder = Callable[[Any], Any]
+
+_MISSING = object()
+# Errors raised while resolving the type hints of classes that cannot be
+# compiled, such as those with unresolvable forward references
+_UNSUPPORTED_CLASS_ERRORS = (NameError, TypeError)
+# Replaces raw items of lazy lists once they have been decoded
+_DECODED = object()
+
+
+def _exclude_none(value: Any) -> bool:
+    return value is None
+
+
+# RFC 3339 date-time, as used by the JMAP UTCDate and Date types
+_RFC3339_DATETIME = re.compile(
+    r"(\d{4})-(\d{2})-(\d{2})T(\d{2}):(\d{2}):(\d{2})(?:[.,](\d+))?"
+    r"(?:(Z)|([+-])(\d{2}):(\d{2}))?"
+)
+DATETIME_CACHE_SIZE = 4096
+
 
 def datetime_encode(dt: datetime) -> str:
+    if dt.tzinfo is None:
+        return f"{dt.isoformat()}Z"
+    if dt.tzinfo is timezone.utc:
+        # Strip the "+00:00" offset suffix instead of copying the datetime
+        return f"{dt.isoformat()[:-6]}Z"
     return f"{dt.replace(tzinfo=None).isoformat()}Z"
 
 
 def datetime_decode(value: Optional[str]) -> Optional[datetime]:
     if not value:
         return None
+    return _datetime_decode(value)
+
+
+@functools.lru_cache(maxsize=DATETIME_CACHE_SIZE)
+def _datetime_decode(value: str) -> datetime:
+    m = _RFC3339_DATETIME.fullmatch(value)
+    if m:
+        with contextlib.suppress(ValueError):
+            return _datetime_from_match(m)
+    # Leave anything else, including invalid values, to dateutil's parser,
+    # which is only imported if it is needed
+    import dateutil.parser
+
     return dateutil.parser.isoparse(value)
 
 
+def _datetime_from_match(m: Match[str]) -> datetime:
+    (
+        year,
+        month,
+        day,
+        hour,
+        minute,
+        second,
+        fraction,
+        utc,
+        sign,
+        offset_hours,
+        offset_minutes,
+    ) = m.groups()
+    tzinfo: Optional[tzinfo_type] = None
+    if utc:
+        tzinfo = timezone.utc
+    elif sign:
+        if int(offset_hours) > 23 or int(offset_minutes) > 59:
+            raise ValueError("Invalid time zone offset")
+        offset = timedelta(
+            hours=int(offset_hours), minutes=int(offset_minutes)
+        )
+        tzinfo = (
+            timezone.utc
+            if not offset
+            else timezone(-offset if sign == "-" else offset)
+        )
+    return datetime(
+        int(year),
+        int(month),
+        int(day),
+        int(hour),
+        int(minute),
+        int(second),
+        int(fraction[:6].ljust(6, "0")) if fraction else 0,
+        tzinfo=tzinfo,
+    )
+
+
+class MethodCallsSlice(Sequence["Invocation"]):
+    """Read-only view of the method calls that precede a call in a request
+
+    Views share the request's method call list and a call ID to index map,
+    so creating a view and resolving a reference by call ID are both O(1).
+    """
+
+    def __init__(
+        self,
+        method_calls: Sequence[Invocation],
+        stop: int,
+        method_call_ids: Optional[Dict[str, int]] = None,
+    ) -> None:
+        self._method_calls = method_calls
+        self._stop = stop
+        if method_call_ids is None:
+            method_call_ids = self.index_method_call_ids(method_calls)
+        self._method_call_ids = method_call_ids
+
+    @staticmethod
+    def index_method_call_ids(
+        method_calls: Sequence[Invocation],
+    ) -> Dict[str, int]:
+        method_call_ids: Dict[str, int] = {}
+        for i, m in enumerate(method_calls):
+            method_call_ids.setdefault(m.id, i)
+        return method_call_ids
+
+    def index_of_id(self, method_call_id: str) -> int:
+        i = self._method_call_ids.get(method_call_id, self._stop)
+        if i >= self._stop:
+            raise IndexError(
+                f'Call "{method_call_id}" for reference not found'
+            )
+        return i
+
+    def __len__(self) -> int:
+        return self._stop
+
+    @overload
+    def __getitem__(self, i: int) -> Invocation:
+        ...  # pragma: no cover
+
+    @overload
+    def __getitem__(self, i: slice) -> Sequence[Invocation]:
+        ...  # pragma: no cover
+
+    def __getitem__(
+        self, i: Union[int, slice]
+    ) -> Union[Invocation, Sequence[Invocation]]:
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self._stop))]
+        if i < 0:
+            i += self._stop
+        if not 0 <= i < self._stop:
+            raise IndexError("Method call index out of range")
+        return self._method_calls[i]
+
+
+class StrValue:
+    """Base for field values which are encoded as their str()"""
+
+    __slots__ = ()
+
+
+class LazyList(MutableSequence[ItemType]):
+    """List of models decoded from their JSON items on first access
+
+    Each raw item is decoded the first time it is indexed or iterated, and
+    the decoded model is kept for later accesses. Decoding errors are raised
+    on access instead of when the response is parsed. Modifying the list,
+    comparing it or pickling it decodes all remaining items. Items may be
+    read by several threads at once.
+    """
+
+    __slots__ = ("_raw", "_items", "_decode")
+
+    def __init__(self, raw_items: Sequence[Any], decode: Decoder) -> None:
+        self._raw: Optional[List[Any]] = list(raw_items)
+        self._items: List[Any] = [_MISSING] * len(self._raw)
+        self._decode = decode
+
+    @classmethod
+    def concat(cls, lists: Sequence[LazyList[ItemType]]) -> LazyList[ItemType]:
+        """Join lists decoded alike without decoding their items"""
+        raw: List[Any] = []
+        items: List[Any] = []
+        for lazy_list in lists:
+            raw += (
+                lazy_list._raw
+                if lazy_list._raw is not None
+                else [_DECODED] * len(lazy_list._items)
+            )
+            items += lazy_list._items
+        joined = cls([], lists[0]._decode)
+        joined._raw, joined._items = raw, items
+        return joined
+
+    def _item(self, index: int) -> ItemType:
+        item = self._items[index]
+        if item is _MISSING:
+            raw = self._raw
+            raw_item = _DECODED if raw is None else raw[index]
+            if raw is None or raw_item is _DECODED:
+                # Decoded by another thread since the check above
+                return cast(ItemType, self._items[index])
+            item = self._items[index] = self._decode(raw_item)
+            # Release the raw item once it has been decoded
+            raw[index] = _DECODED
+        return cast(ItemType, item)
+
+    def add_decode_hook(self, hook: Callable[[ItemType], ItemType]) -> None:
+        """Pass each item to hook when it is decoded
+
+        Items which have already been decoded are passed to hook now. The
+        items returned by hook are kept in the list.
+        """
+        decode = self._decode
+        self._decode = lambda raw_item: hook(decode(raw_item))
+        for i, item in enumerate(self._items):
+            if item is not _MISSING:
+                self._items[i] = hook(item)
+
+    def _materialize(self) -> List[ItemType]:
+        if self._raw is not None:
+            for i in range(len(self._items)):
+                self._item(i)
+            self._raw = None
+        return self._items
+
+    @property
+    def decoded_count(self) -> int:
+        if self._raw is None:
+            return len(self._items)
+        return sum(1 for item in self._items if item is not _MISSING)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @overload
+    def __getitem__(self, index: int) -> ItemType:
+        ...  # pragma: no cover
+
+    @overload
+    def __getitem__(self, index: slice) -> List[ItemType]:
+        ...  # pragma: no cover
+
+    def __getitem__(
+        self, index: Union[int, slice]
+    ) -> Union[ItemType, List[ItemType]]:
+        if isinstance(index, slice):
+            return [
+                self._item(i) for i in range(*index.indices(len(self._items)))
+            ]
+        return self._item(index)
+
+    def __iter__(self) -> Iterator[ItemType]:
+        i = 0
+        while i < len(self._items):
+            yield self._item(i)
+            i += 1
+
+    @overload
+    def __setitem__(self, index: int, value: ItemType) -> None:
+        ...  # pragma: no cover
+
+    @overload
+    def __setitem__(self, index: slice, value: Any) -> None:
+        ...  # pragma: no cover
+
+    def __setitem__(self, index: Any, value: Any) -> None:
+        self._materialize()[index] = value
+
+    def __delitem__(self, index: Union[int, slice]) -> None:
+        del self._materialize()[index]
+
+    def insert(self, index: int, value: ItemType) -> None:
+        self._materialize().insert(index, value)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, LazyList):
+            other = other._materialize()
+        if not isinstance(other, list):
+            return NotImplemented
+        return self._materialize() == other
+
+    def __repr__(self) -> str:
+        return f"LazyList({self._materialize()!r})"
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (list, (self._materialize(),))
+
+
 class ModelToDictPostprocessor:
     def __init__(
-        self, method_calls_slice: Optional[List[Invocation]] = None
+        self, method_calls_slice: Optional[Sequence[Invocation]] = None
     ) -> None:
         self.method_calls_slice = method_calls_slice
 
@@ -56,6 +361,8 @@ class ModelToDictPostprocessor:
         if isinstance(ref.method, int):
             return ref.method
         if isinstance(ref.method, str):
+            if isinstance(self.method_calls_slice, MethodCallsSlice):
+                return self.method_calls_slice.index_of_id(ref.method)
             for i, m in enumerate(self.method_calls_slice):
                 if m.id == ref.method:
                     return i
@@ -71,29 +378,34 @@ class ModelToDictPostprocessor:
             result_of=self.method_calls_slice[ref_target].id,
         )
 
-    def fix_result_reference(
-        self,
-        data: Dict[str, dataclasses_json.core.Json],
-        key: str,
+    def result_reference_to_dict(
+        self, value: Dict[str, Any]
     ) -> Dict[str, dataclasses_json.core.Json]:
-        ref_type = cast(Dict[str, Any], data[key]).get(REF_SENTINEL_KEY)
+        ref_type = value.get(REF_SENTINEL_KEY)
         if ref_type == "ResultReference":
-            rr = ResultReference.from_dict(data[key])
+            rr = class_decoder(ResultReference)(value)
         elif ref_type == "Ref":
-            rr = self.ref_to_result_reference(Ref.from_dict(data[key]))
+            rr = self.ref_to_result_reference(class_decoder(Ref)(value))
         else:
             raise ValueError(
                 f"Unexpected reference sentinel value: {ref_type}"
             )
-        data[key] = rr.to_dict()
+        rr_dict = class_encoder(ResultReference)(rr, False, None, None)
+        # Remove ref sentinel key from serialized output
+        del rr_dict[REF_SENTINEL_KEY]
+        return rr_dict
+
+    def fix_result_reference(
+        self,
+        data: Dict[str, dataclasses_json.core.Json],
+        key: str,
+    ) -> Dict[str, dataclasses_json.core.Json]:
+        rr_dict = self.result_reference_to_dict(
+            cast(Dict[str, Any], data[key])
+        )
         # Replace existing key with #-prefixed key
-        new_key = f"#{key}"
-        data[new_key] = data[key]
+        data[f"#{key}"] = rr_dict
         del data[key]
-        # Remove ref sentinel key from serialized output
-        new_data = data[new_key]
-        assert isinstance(new_data, dict)
-        del new_data[REF_SENTINEL_KEY]
         return data
 
     def fix_email_headers(
@@ -110,21 +422,865 @@ class ModelToDictPostprocessor:
         return data
 
 
-class Model(dataclasses_json.DataClassJsonMixin):
+DecoderSpec = Tuple[str, Any, bool, bool, Optional[Decoder]]
+
+_class_decoders: Dict[Any, Decoder] = {}
+_specialized_class_decoders: Dict[Any, Decoder] = {}
+_projected_class_decoders: Dict[Any, Decoder] = {}
+
+
+def class_decoder(
+    cls: type,
+    lazy: bool = False,
+    properties: Optional[Collection[str]] = None,
+) -> Decoder:
+    """Return the compiled decoder for a dataclass, building it if needed
+
+    Compiled decoders produce the same results as dataclasses_json's
+    reflective from_dict, but resolve field names, type hints and config
+    overrides once per class instead of once per decoded object.
+
+    If lazy is set, list of model fields (such as GetResponse data) are
+    decoded to a LazyList instead of a list. If properties is set, the
+    models in those lists are decoded with projected_class_decoder.
+    """
+    key: Any = cls
+    cache = _class_decoders
+    if lazy or properties is not None:
+        key = (
+            cls,
+            lazy,
+            None if properties is None else frozenset(properties),
+        )
+        cache = _specialized_class_decoders
+    decoder = cache.get(key)
+    if decoder is not None:
+        return decoder
+    try:
+        decoder = _compile_class_decoder(cls, lazy, properties)
+    except _UNSUPPORTED_CLASS_ERRORS as e:
+        # Leave unsupported classes to dataclasses_json, which raises the
+        # same errors if they are used
+        log.debug(f"Using reflective decoder for {cls.__qualname__}: {e}")
+        return _reflective_decoder(cls)
+    cache[key] = decoder
+    return decoder
+
+
+def projected_class_decoder(cls: type, properties: Collection[str]) -> Decoder:
+    """Return a decoder for a dataclass specialized to a set of properties
+
+    The decoder only looks up the given properties (and id) in each input,
+    so decoding time depends on the number of properties fetched instead of
+    the number of fields. Inputs with any other keys are passed to the full
+    class decoder, so results are always the same as class_decoder(cls).
+    """
+    key = (cls, frozenset(properties))
+    decoder = _projected_class_decoders.get(key)
+    if decoder is not None:
+        return decoder
+    try:
+        decoder = _compile_projected_decoder(cls, key[1])
+    except _UNSUPPORTED_CLASS_ERRORS as e:
+        log.debug(f"Using full decoder for {cls.__qualname__}: {e}")
+        return class_decoder(cls)
+    _projected_class_decoders[key] = decoder
+    return decoder
+
+
+def decode_models(
+    cls: type,
+    items: Sequence[Any],
+    properties: Optional[Collection[str]] = None,
+) -> List[Any]:
+    """Decode a list of models, such as a chunk of GetResponse data
+
+    This is a module level function so that it can run in worker processes.
+    """
+    if properties is None:
+        decode = class_decoder(cls)
+    else:
+        decode = projected_class_decoder(cls, properties)
+    return [decode(item) for item in items]
+
+
+@functools.lru_cache(maxsize=None)
+def model_list_fields(cls: type) -> Tuple[Tuple[str, str, type], ...]:
+    """Return the input key, field name and item class of list of model fields
+
+    These are the fields that are decoded lazily or with projected decoders.
+    """
+    overrides = dataclasses_json.core._user_overrides_or_exts(cls)
+    types = get_type_hints(cls)
+    list_fields = []
+    for f in dataclasses.fields(cls):
+        override = overrides[f.name]
+        item_type = _list_item_class(types[f.name])
+        if item_type is None or override.decoder is not None:
+            continue
+        key = override.letter_case(f.name) if override.letter_case else f.name
+        list_fields.append((key, f.name, item_type))
+    return tuple(list_fields)
+
+
+def _reflective_decoder(cls: type) -> Decoder:
+    def _decode(kvs: Any) -> Any:
+        return dataclasses_json.core._decode_dataclass(cls, kvs, False)
+
+    return _decode
+
+
+def _decoder_specs(
+    cls: type,
+    lazy: bool = False,
+    properties: Optional[Collection[str]] = None,
+) -> Tuple[Dict[str, str], Dict[str, str], List[DecoderSpec]]:
+    overrides = dataclasses_json.core._user_overrides_or_exts(cls)
+    types = get_type_hints(cls)
+    fields = dataclasses.fields(cls)
+    decode_names = dataclasses_json.core._decode_letter_case_overrides(
+        [f.name for f in fields], overrides
+    )
+    # Map each accepted input key to its field name. Keys without a letter
+    # case mapping are matched against field names verbatim.
+    key_map = {f.name: f.name for f in fields}
+    key_map.update(decode_names)
+    specs: List[DecoderSpec] = []
+    for f in fields:
+        if not f.init:
+            continue
+        if f.default is not dataclasses.MISSING:
+            default, factory = f.default, False
+        elif f.default_factory is not dataclasses.MISSING:
+            default, factory = f.default_factory, True
+        else:
+            default, factory = _MISSING, False
+        field_type = types[f.name]
+        override = overrides[f.name].decoder
+        item_type = None
+        if lazy or properties is not None:
+            item_type = _list_item_class(field_type)
+        decoder: Optional[Decoder]
+        if item_type is not None and override is None:
+            decoder = _model_list_decoder(item_type, lazy, properties)
+        else:
+            decoder = _field_decoder(field_type, override)
+        specs.append(
+            (
+                f.name,
+                default,
+                factory,
+                dataclasses_json.utils._is_optional(field_type),
+                decoder,
+            )
+        )
+    return key_map, decode_names, specs
+
+
+def _compile_class_decoder(
+    cls: type,
+    lazy: bool = False,
+    properties: Optional[Collection[str]] = None,
+) -> Decoder:
+    undefined = dataclasses_json.utils._undefined_parameter_action_safe(cls)
+    if undefined not in (None, dataclasses_json.Undefined.EXCLUDE):
+        return _reflective_decoder(cls)
+    key_map, _, specs = _decoder_specs(cls, lazy, properties)
+    cls_name = cls.__name__
+
+    def _decode(kvs: Any) -> Any:
+        if isinstance(kvs, cls):
+            return kvs
+        if not isinstance(kvs, dict):
+            return dataclasses_json.core._decode_dataclass(cls, kvs, False)
+        values = {}
+        for key, value in kvs.items():
+            name = key_map.get(key)
+            if name is not None:
+                values[name] = value
+        init_kwargs: Dict[str, Any] = {}
+        for name, default, factory, optional, decoder in specs:
+            value = values.get(name, _MISSING)
+            if value is _MISSING:
+                if default is _MISSING:
+                    raise KeyError(name)
+                value = default() if factory else default
+            if value is None:
+                if not optional:
+                    warnings.warn(
+                        f"'NoneType' object value of non-optional type "
+                        f"{name} detected when decoding {cls_name}.",
+                        RuntimeWarning,
+                        stacklevel=2,
+                    )
+                init_kwargs[name] = None
+            elif decoder is None:
+                init_kwargs[name] = value
+            else:
+                init_kwargs[name] = decoder(value)
+        return cls(**init_kwargs)
+
+    return _decode
+
+
+def _compile_projected_decoder(
+    cls: type, properties: Collection[str]
+) -> Decoder:
+    decode_full = class_decoder(cls)
+    undefined = dataclasses_json.utils._undefined_parameter_action_safe(cls)
+    if undefined not in (None, dataclasses_json.Undefined.EXCLUDE):
+        return decode_full
+    key_map, decode_names, specs = _decoder_specs(cls)
+    input_keys = {name: key for key, name in decode_names.items()}
+    # Object ids are always returned, even if they were not requested
+    projected = {key_map[p] for p in properties if p in key_map} | {"id"}
+    fetched: List[Tuple[str, DecoderSpec]] = []
+    unfetched: List[DecoderSpec] = []
+    none_defaults: Dict[str, Any] = {}
+    for spec in specs:
+        name, default, _, optional, _ = spec
+        if name in projected or default is _MISSING:
+            fetched.append((input_keys.get(name, name), spec))
+        elif default is None and optional:
+            none_defaults[name] = None
+        else:
+            unfetched.append(spec)
+    fetched_keys = [key for key, _ in fetched]
+    # Unfetched fields are decoded from their defaults, after fetched fields
+    decode_specs = [spec for _, spec in fetched] + unfetched
+    unfetched_values = [_MISSING] * len(unfetched)
+    cls_name = cls.__name__
+
+    def _decode(kvs: Any) -> Any:
+        if not isinstance(kvs, dict):
+            return decode_full(kvs)
+        values = [kvs.get(key, _MISSING) for key in fetched_keys]
+        if len(kvs) != len(values) - values.count(_MISSING):
+            # Unexpected keys, which may map to other fields
+            return decode_full(kvs)
+        init_kwargs = dict(none_defaults)
+        for value, (name, default, factory, optional, decoder) in zip(
+            values + unfetched_values, decode_specs
+        ):
+            if value is _MISSING:
+                if default is _MISSING:
+                    return decode_full(kvs)
+                value = default() if factory else default
+            if value is None:
+                if not optional:
+                    warnings.warn(
+                        f"'NoneType' object value of non-optional type "
+                        f"{name} detected when decoding {cls_name}.",
+                        RuntimeWarning,
+                        stacklevel=2,
+                    )
+                init_kwargs[name] = None
+            elif decoder is None:
+                init_kwargs[name] = value
+            else:
+                init_kwargs[name] = decoder(value)
+        return cls(**init_kwargs)
+
+    return _decode
+
+
+def _field_decoder(
+    field_type: Any, override: Optional[Decoder]
+) -> Optional[Decoder]:
+    while dataclasses_json.utils._is_new_type(field_type):
+        field_type = field_type.__supertype__
+    if override is not None:
+        if not isinstance(field_type, type):
+            return override
+
+        def _decode_override(value: Any) -> Any:
+            return value if type(value) is field_type else override(value)
+
+        return _decode_override
+    if dataclasses.is_dataclass(field_type):
+        nested = _nested_class_decoder(cast(type, field_type))
+
+        def _decode_nested(value: Any) -> Any:
+            if dataclasses.is_dataclass(value):
+                return value
+            return nested(value)
+
+        return _decode_nested
+    if (
+        dataclasses_json.core._is_supported_generic(field_type)
+        and field_type != str
+    ):
+        return _generic_decoder(field_type)
+    return _extended_type_decoder(field_type)
+
+
+def _nested_class_decoder(cls: type) -> Decoder:
+    # Resolve nested decoders on first use so that self-referencing and
+    # mutually recursive models can be compiled
+    def _decode(value: Any) -> Any:
+        return class_decoder(cls)(value)
+
+    return _decode
+
+
+def _list_item_class(field_type: Any) -> Optional[type]:
+    utils = dataclasses_json.utils
+    if utils._is_optional(field_type):
+        args = utils._get_type_args(field_type)
+        if args is utils._NO_ARGS or len(args) != 2:
+            return None
+        field_type = utils._get_type_arg_param(field_type, 0)
+    if getattr(field_type, "__origin__", None) is not list:
+        return None
+    item_type = utils._get_type_arg_param(field_type, 0)
+    if dataclasses.is_dataclass(item_type):
+        return cast(type, item_type)
+    return None
+
+
+def _model_list_decoder(
+    item_type: type, lazy: bool, properties: Optional[Collection[str]]
+) -> Decoder:
+    if properties is None:
+        decode_item = _nested_class_decoder(item_type)
+    else:
+        decode_item = projected_class_decoder(item_type, properties)
+    if lazy:
+        return lambda value: LazyList(value, decode_item)
+    return lambda value: list(map(decode_item, value))
+
+
+def _item_decoder(item_type: Any) -> Optional[Decoder]:
+    if dataclasses.is_dataclass(item_type):
+        return _nested_class_decoder(cast(type, item_type))
+    if dataclasses_json.core._is_supported_generic(item_type):
+        decoder = _generic_decoder(item_type)
+        if decoder is None:
+            return None
+
+        def _decode_generic_item(value: Any) -> Any:
+            return None if value is None else decoder(value)
+
+        return _decode_generic_item
+    return None
+
+
+def _generic_decoder(type_: Any) -> Optional[Decoder]:
+    utils = dataclasses_json.utils
+    if utils._issubclass_safe(type_, Enum):
+        return cast(Decoder, type_)
+    if utils._is_collection(type_):
+        origin = getattr(type_, "__origin__", None)
+        if utils._is_mapping(type_):
+            key_type, value_type = utils._get_type_args(type_, (Any, Any))
+            if origin is not dict or key_type not in (str, Any):
+                return _reflective_generic_decoder(type_)
+            decode_key = str if key_type is str else None
+            decode_value = _item_decoder(value_type)
+            return _mapping_decoder(decode_key, decode_value)
+        if origin not in (list, set, frozenset):
+            return _reflective_generic_decoder(type_)
+        item_decoder = _item_decoder(utils._get_type_arg_param(type_, 0))
+        if item_decoder is None:
+            return cast(Decoder, origin)
+        return lambda value: origin(map(item_decoder, value))
+    args = utils._get_type_args(type_)
+    if args is utils._NO_ARGS:
+        return None
+    if utils._is_optional(type_) and len(args) == 2:
+        type_arg = utils._get_type_arg_param(type_, 0)
+        if dataclasses.is_dataclass(type_arg):
+            return _nested_class_decoder(cast(type, type_arg))
+        if dataclasses_json.core._is_supported_generic(type_arg):
+            return _generic_decoder(type_arg)
+        return _extended_type_decoder(type_arg)
+    # Other unions are passed through as-is
+    return None
+
+
+def _mapping_decoder(
+    decode_key: Optional[Decoder], decode_value: Optional[Decoder]
+) -> Decoder:
+    if decode_value is None:
+        if decode_key is None:
+            return dict
+        return lambda value: dict(zip(map(decode_key, value), value.values()))
+    if decode_key is None:
+        return lambda value: dict(
+            zip(value, map(decode_value, value.values()))
+        )
+    return lambda value: dict(
+        zip(map(decode_key, value), map(decode_value, value.values()))
+    )
+
+
+def _reflective_generic_decoder(type_: Any) -> Decoder:
+    def _decode(value: Any) -> Any:
+        return dataclasses_json.core._decode_generic(type_, value, False)
+
+    return _decode
+
+
+def _extended_type_decoder(type_: Any) -> Optional[Decoder]:
+    if dataclasses_json.utils._issubclass_safe(type_, (int, float, str, bool)):
+
+        def _decode_primitive(value: Any) -> Any:
+            return value if isinstance(value, type_) else type_(value)
+
+        return _decode_primitive
+    if dataclasses_json.utils._issubclass_safe(
+        type_, (datetime, Decimal, UUID)
+    ):
+
+        def _decode_extended(value: Any) -> Any:
+            return dataclasses_json.core._support_extended_types(type_, value)
+
+        return _decode_extended
+    return None
+
+
+ClassEncoder = Callable[
+    [Any, bool, Optional[ModelToDictPostprocessor], Optional[str]],
+    Dict[str, Any],
+]
+
+_class_encoders: Dict[type, ClassEncoder] = {}
+_JSON_SCALARS = (str, int, float, bool, type(None))
+
+
+def class_encoder(cls: type) -> ClassEncoder:
+    """Return the compiled encoder for a dataclass, building it if needed
+
+    Compiled encoders produce the same output as dataclasses_json's to_dict
+    followed by ModelToDictPostprocessor in a single traversal. When given a
+    postprocessor, references are rewritten to their #-prefixed form and
+    email headers are flattened while each dict is built. When given an
+    account id, it is encoded in place of the object's account_id field.
+    """
+    encoder = _class_encoders.get(cls)
+    if encoder is not None:
+        return encoder
+    try:
+        encoder = _compile_class_encoder(cls)
+    except _UNSUPPORTED_CLASS_ERRORS as e:
+        log.debug(f"Using reflective encoder for {cls.__qualname__}: {e}")
+        return _reflective_encoder
+    _class_encoders[cls] = encoder
+    return encoder
+
+
+def _reflective_encoder(
+    obj: Any,
+    encode_json: bool,
+    todict: Optional[ModelToDictPostprocessor],
+    account_id: Optional[str],
+) -> Dict[str, Any]:
+    if account_id is not None and "account_id" in obj.__dataclass_fields__:
+        obj = copy.copy(obj)
+        object.__setattr__(obj, "account_id", account_id)
+    data = dataclasses_json.core._asdict(obj, encode_json=encode_json)
+    return todict.postprocess(data) if todict else data
+
+
+def _compile_class_encoder(cls: type) -> ClassEncoder:
+    undefined = dataclasses_json.utils._undefined_parameter_action_safe(cls)
+    if undefined is dataclasses_json.Undefined.INCLUDE:
+        return _reflective_encoder
+    overrides = dataclasses_json.core._user_overrides_or_exts(cls)
+    specs: List[Tuple[str, str, bool, Optional[Callable[[Any], Any]]]] = []
+    for f in dataclasses.fields(cls):
+        override = overrides[f.name]
+        if override.exclude not in (None, _exclude_none):
+            return _reflective_encoder
+        key = override.letter_case(f.name) if override.letter_case else f.name
+        if key in [spec[1] for spec in specs]:
+            # dataclasses_json raises an error for this if both are set
+            return _reflective_encoder
+        specs.append(
+            (f.name, key, override.exclude is not None, override.encoder)
+        )
+
+    def _encode(
+        obj: Any,
+        encode_json: bool,
+        todict: Optional[ModelToDictPostprocessor],
+        account_id: Optional[str],
+    ) -> Dict[str, Any]:
+        data: Dict[str, Any] = {}
+        tail: List[Tuple[str, Any]] = []
+        for name, key, exclude_none, encoder in specs:
+            value: Any
+            if account_id is not None and name == "account_id":
+                value = account_id
+            else:
+                value = getattr(obj, name)
+            if value is None and exclude_none:
+                continue
+            if encoder is not None:
+                value = encoder(value)
+                if encode_json:
+                    value = dataclasses_json.core._encode_json_type(value)
+                if todict and isinstance(value, dict):
+                    value = todict.postprocess(value)
+            else:
+                value = encode_value(value, encode_json, todict)
+            if todict is None or not _postprocess_item(
+                todict, key, value, tail
+            ):
+                data[key] = value
+        for key, value in tail:
+            data[key] = value
+        return data
+
+    return _encode
+
+
+def encode_value(
+    value: Any,
+    encode_json: bool = False,
+    todict: Optional[ModelToDictPostprocessor] = None,
+) -> Any:
+    """Encode a model field value to its wire representation
+
+    If a postprocessor is given, dicts at this level are postprocessed.
+    List items are never postprocessed.
+    """
+    if isinstance(value, _JSON_SCALARS):
+        return value
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return class_encoder(type(value))(value, encode_json, todict, None)
+    if isinstance(value, Mapping):
+        if todict is None:
+            return {
+                _encode_key(k): encode_value(v, encode_json)
+                for k, v in value.items()
+            }
+        data: Dict[Any, Any] = {}
+        tail: List[Tuple[str, Any]] = []
+        for k, v in value.items():
+            k = _encode_key(k)
+            if k.startswith("#"):
+                data[k] = encode_value(v, encode_json)
+                continue
+            v = encode_value(v, encode_json, todict)
+            if not _postprocess_item(todict, k, v, tail):
+                data[k] = v
+        for k, v in tail:
+            data[k] = v
+        return data
+    if isinstance(value, StrValue):
+        return str(value)
+    if isinstance(value, Collection) and not isinstance(
+        value, (str, bytes, Enum)
+    ):
+        return [encode_value(v, encode_json) for v in value]
+    value = copy.deepcopy(value)
+    if encode_json:
+        return dataclasses_json.core._encode_json_type(value)
+    return value
+
+
+def _encode_key(key: Any) -> Any:
+    if isinstance(key, _JSON_SCALARS):
+        return key
+    return dataclasses_json.core._asdict(key)
+
+
+def _postprocess_item(
+    todict: ModelToDictPostprocessor,
+    key: str,
+    value: Any,
+    tail: List[Tuple[str, Any]],
+) -> bool:
+    # Returns True if the item is moved to the end of its containing dict.
+    # Moved items are appended in order once all other items are added,
+    # matching ModelToDictPostprocessor.postprocess's in-place rewrites.
+    if isinstance(value, dict):
+        if REF_SENTINEL_KEY in value:
+            with contextlib.suppress(KeyError):
+                tail.append(
+                    (f"#{key}", todict.result_reference_to_dict(value))
+                )
+                return True
+    elif (
+        key == "headers"
+        and isinstance(value, list)
+        and len(value) > 0
+        and isinstance(value[0], dict)
+        and set(value[0].keys()) == set(["name", "value"])
+    ):
+        for header in value:
+            tail.append((f"header:{header['name']}", header["value"]))
+        return True
+    return False
+
+
+if TYPE_CHECKING:
+    SlottedDataClassJsonMixin = dataclasses_json.DataClassJsonMixin
+else:
+
+    @dataclasses_json.dataclass_json
+    class SlottedDataClassJsonMixin:
+        """DataClassJsonMixin for classes with __slots__
+
+        dataclass_json adds the methods of DataClassJsonMixin and registers
+        the class as its subclass. Subclassing the mixin itself would add a
+        base without __slots__, which gives instances a __dict__.
+        """
+
+        __slots__ = ()
+
+
+class Model(SlottedDataClassJsonMixin):
+    __slots__ = ()
+
     dataclass_json_config = dataclasses_json.config(
         letter_case=dataclasses_json.LetterCase.CAMEL,  # type: ignore
         undefined=dataclasses_json.Undefined.EXCLUDE,
-        exclude=lambda f: f is None,  # type: ignore
+        exclude=_exclude_none,  # type: ignore
     )["dataclasses_json"]
 
+    @classmethod
+    def from_dict(
+        cls: Type[ModelType],
+        kvs: dataclasses_json.core.Json,
+        *,
+        infer_missing: bool = False,
+        lazy: bool = False,
+        properties: Optional[Collection[str]] = None,
+    ) -> ModelType:
+        if infer_missing:
+            return super().from_dict(kvs, infer_missing=infer_missing)
+        return cast(ModelType, class_decoder(cls, lazy, properties)(kvs))
+
     def to_dict(
         self,
-        *args: Any,
+        encode_json: bool = False,
+        *,
         account_id: Optional[str] = None,
-        method_calls_slice: Optional[List[Invocation]] = None,
-        **kwargs: Any,
+        method_calls_slice: Optional[Sequence[Invocation]] = None,
     ) -> Dict[str, dataclasses_json.core.Json]:
-        if account_id:
-            self.account_id: Optional[str] = account_id
         todict = ModelToDictPostprocessor(method_calls_slice)
-        return todict.postprocess(super().to_dict(*args, **kwargs))
+        return class_encoder(type(self))(
+            self, encode_json, todict, account_id or None
+        )
+
+    def freeze(self: ModelType) -> ModelType:
+        """Return a frozen, hashable copy of this model"""
+        return cast(ModelType, freeze_value(self))
+
+    def thaw(self: ModelType) -> ModelType:
+        """Return a mutable copy of a frozen model"""
+        return cast(ModelType, _thaw_value(self))
+
+
+SlottedType = TypeVar("SlottedType", bound=type)
+
+
+def slotted(cls: SlottedType) -> SlottedType:
+    """Recreate a dataclass with its fields stored in __slots__
+
+    This is equivalent to dataclass(slots=True) from Python 3.10. Field
+    values are stored in slots instead of a per-instance __dict__. Classes
+    are still dataclasses and can be pickled, compared and serialized as
+    before. Apply this decorator after (above) the dataclass decorator.
+    """
+    inherited_slots = {
+        slot
+        for base in cls.__mro__[1:-1]
+        for slot in base.__dict__.get("__slots__", ())
+    }
+    slots = tuple(
+        f.name
+        for f in dataclasses.fields(cls)
+        if f.name not in inherited_slots
+    )
+    cls_dict = dict(cls.__dict__)
+    cls_dict["__slots__"] = slots
+    for name in slots:
+        # Remove class attributes for field defaults, which conflict with
+        # slot descriptors. Dataclass __init__ methods do not use them.
+        cls_dict.pop(name, None)
+    cls_dict.pop("__dict__", None)
+    cls_dict.pop("__weakref__", None)
+    slotted_cls = cast(
+        SlottedType, type(cls)(cls.__name__, cls.__bases__, cls_dict)
+    )
+    slotted_cls.__qualname__ = cls.__qualname__
+    # Point zero-argument super() references in methods at the new class
+    for member in cls_dict.values():
+        member = getattr(member, "__func__", member)
+        for cell in getattr(member, "__closure__", None) or ():
+            if cell.cell_contents is cls:
+                cell.cell_contents = slotted_cls
+    return slotted_cls
+
+
+class FrozenDict(Dict[Any, Any]):
+    """Immutable, hashable dict used for dict fields of frozen models"""
+
+    __slots__ = ("_hash",)
+
+    def __hash__(self) -> int:  # type: ignore[override]
+        try:
+            return self._hash
+        except AttributeError:
+            self._hash: int = hash(frozenset(self.items()))
+            return self._hash
+
+    def _immutable(self, *args: Any, **kwargs: Any) -> Any:
+        raise TypeError(f"{type(self).__name__} is immutable")
+
+    __setitem__ = __delitem__ = _immutable
+    clear = pop = popitem = setdefault = update = _immutable
+    __ior__ = _immutable
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (FrozenDict, (dict(self),))
+
+
+class FrozenModel:
+    """Base for frozen, hashable model variants created by frozen_model
+
+    Field values are frozen when an instance is created: lists become
+    tuples, dicts become FrozenDicts, sets become frozensets and nested
+    dataclasses become their frozen variants. Hashes are computed once, on
+    first use.
+    """
+
+    __slots__ = ()
+    __frozen_base__: type
+    _frozen: bool
+    _hash: int
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        # The dataclass __init__ assigns fields normally until the instance
+        # is marked as frozen
+        super().__init__(*args, **kwargs)
+        for f in dataclasses.fields(cast(Any, self)):
+            if hasattr(self, f.name):
+                object.__setattr__(
+                    self, f.name, freeze_value(getattr(self, f.name))
+                )
+        object.__setattr__(self, "_frozen", True)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if getattr(self, "_frozen", False):
+            raise dataclasses.FrozenInstanceError(
+                f"cannot assign to field {name!r}"
+            )
+        object.__setattr__(self, name, value)
+
+    def __delattr__(self, name: str) -> None:
+        raise dataclasses.FrozenInstanceError(f"cannot delete field {name!r}")
+
+    def __hash__(self) -> int:
+        try:
+            return self._hash
+        except AttributeError:
+            value = hash(
+                (
+                    self.__frozen_base__,
+                    tuple(
+                        getattr(self, f.name, None)
+                        for f in dataclasses.fields(cast(Any, self))
+                    ),
+                )
+            )
+            object.__setattr__(self, "_hash", value)
+            return value
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (
+            _new_frozen,
+            (
+                self.__frozen_base__,
+                {
+                    f.name: getattr(self, f.name)
+                    for f in dataclasses.fields(cast(Any, self))
+                    if hasattr(self, f.name)
+                },
+            ),
+        )
+
+
+_frozen_models: Dict[type, type] = {}
+_FROZEN_SCALARS = _JSON_SCALARS + (FrozenModel, FrozenDict)
+
+
+def frozen_model(cls: Type[ModelType]) -> Type[ModelType]:
+    """Return the frozen, hashable variant of a dataclass
+
+    Frozen variants are subclasses which encode and decode like the original
+    class, but compare equal only to other instances of the frozen variant.
+    Response variants are not registered as response types.
+    """
+    if issubclass(cls, FrozenModel):
+        return cls
+    variant = _frozen_models.get(cls)
+    if variant is None:
+        name = f"Frozen{cls.__name__}"
+        metaclass: Any = type(cls)
+        variant = metaclass(
+            name,
+            (FrozenModel, cls),
+            {
+                "__slots__": ("_frozen", "_hash"),
+                "__frozen_base__": cls,
+                "__module__": cls.__module__,
+                "__qualname__": f"Frozen{cls.__qualname__}",
+            },
+        )
+        # Keep the first variant if another thread created one meanwhile
+        variant = _frozen_models.setdefault(cls, variant)
+    return cast(Type[ModelType], variant)
+
+
+def freeze_value(value: Any) -> Any:
+    """Return a frozen, hashable equivalent of a model field value"""
+    if isinstance(value, _FROZEN_SCALARS):
+        return value
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return _new_frozen(
+            type(value),
+            {
+                f.name: freeze_value(getattr(value, f.name))
+                for f in dataclasses.fields(value)
+                if hasattr(value, f.name)
+            },
+        )
+    if isinstance(value, Mapping):
+        return FrozenDict(
+            (freeze_value(k), freeze_value(v)) for k, v in value.items()
+        )
+    if isinstance(value, (set, frozenset)):
+        return frozenset(freeze_value(v) for v in value)
+    if isinstance(value, (list, tuple, LazyList)):
+        return tuple(freeze_value(v) for v in value)
+    return value
+
+
+def _thaw_value(value: Any) -> Any:
+    if isinstance(value, FrozenModel):
+        obj: Any = object.__new__(value.__frozen_base__)
+        for f in dataclasses.fields(cast(Any, value)):
+            if hasattr(value, f.name):
+                object.__setattr__(
+                    obj, f.name, _thaw_value(getattr(value, f.name))
+                )
+        return obj
+    if isinstance(value, FrozenDict):
+        return {k: _thaw_value(v) for k, v in value.items()}
+    if isinstance(value, frozenset):
+        return {_thaw_value(v) for v in value}
+    if isinstance(value, tuple):
+        return [_thaw_value(v) for v in value]
+    return value
+
+
+def _new_frozen(cls: type, values: Dict[str, Any]) -> Any:
+    obj: Any = object.__new__(frozen_model(cls))
+    for name, value in values.items():
+        object.__setattr__(obj, name, value)
+    object.__setattr__(obj, "_frozen", True)
+    return obj
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import List, Optional
 
 from dataclasses_json import config
 
@@ -9,6 +9,26 @@ from . import constants
 from .serializer import Model
 
 
+@dataclass
+class SessionCapabilitiesCore(Model):
+    max_size_upload: Optional[int] = None
+    max_concurrent_upload: Optional[int] = None
+    max_size_request: Optional[int] = None
+    max_concurrent_requests: Optional[int] = None
+    max_calls_in_request: Optional[int] = None
+    max_objects_in_get: Optional[int] = None
+    max_objects_in_set: Optional[int] = None
+    collation_algorithms: List[str] = field(default_factory=list)
+
+
+@dataclass
+class SessionCapabilities(Model):
+    core: SessionCapabilitiesCore = field(
+        metadata=config(field_name=constants.JMAP_URN_CORE),
+        default_factory=SessionCapabilitiesCore,
+    )
+
+
 @dataclass
 class Session(Model):
     username: str
@@ -17,6 +37,9 @@ class Session(Model):
     primary_accounts: SessionPrimaryAccount = field(
         metadata=config(field_name="primaryAccounts")
     )
+    capabilities: SessionCapabilities = field(
+        default_factory=SessionCapabilities
+    )
 
 
 @dataclass
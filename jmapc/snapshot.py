@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import dataclasses
+import io
+import pickle  # nosec B403
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    cast,
+)
+
+from .serializer import FrozenModel, frozen_model
+
+__all__ = [
+    "SnapshotReader",
+    "SnapshotWriter",
+    "dump",
+    "dumps",
+    "load",
+    "loads",
+]
+
+SNAPSHOT_MAGIC = b"JMAPC-SNAPSHOT\n"
+SNAPSHOT_VERSION = 1
+DEFAULT_BATCH_SIZE = 1000
+
+Schema = Tuple[str, ...]
+Reducer = Callable[[Any], Tuple[Any, ...]]
+
+
+class SnapshotWriter:
+    """Write models to a versioned binary snapshot
+
+    Dataclass instances, including models nested in other values, are
+    stored as tuples of their field values in declaration order. Each
+    class's field names are stored once per batch, so snapshots can be
+    read after fields are added to or removed from a class. Objects are
+    pickled in batches of batch_size.
+    """
+
+    def __init__(
+        self, file: IO[bytes], batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> None:
+        self._file = file
+        self._batch_size = batch_size
+        self._batch: List[Any] = []
+        self._pickler = _SnapshotPickler(file)
+        file.write(SNAPSHOT_MAGIC + bytes([SNAPSHOT_VERSION]))
+
+    def __enter__(self) -> SnapshotWriter:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.flush()
+
+    def write(self, obj: Any) -> None:
+        self._batch.append(obj)
+        if len(self._batch) >= self._batch_size:
+            self.flush()
+
+    def write_all(self, objects: Iterable[Any]) -> None:
+        for obj in objects:
+            self.write(obj)
+
+    def flush(self) -> None:
+        if self._batch:
+            self._pickler.dump(self._batch)
+            # Release references held by the pickle memo between batches
+            self._pickler.clear_memo()
+            self._batch = []
+        self._file.flush()
+
+
+class SnapshotReader:
+    """Read models from a snapshot written by SnapshotWriter
+
+    Fields missing from the snapshot are set to their defaults, and stored
+    fields which no longer exist are ignored. Snapshots must only be read
+    from trusted sources, as with pickle.
+    """
+
+    def __init__(self, file: IO[bytes]) -> None:
+        header = file.read(len(SNAPSHOT_MAGIC) + 1)
+        if not header.startswith(SNAPSHOT_MAGIC):
+            raise ValueError("Not a jmapc snapshot")
+        if header[-1] != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version {header[-1]}")
+        # Snapshots are written and read back by the application itself
+        self._unpickler = pickle.Unpickler(file)  # nosec B301
+
+    def __iter__(self) -> Iterator[Any]:
+        while True:
+            try:
+                batch = self._unpickler.load()
+            except EOFError:
+                return
+            yield from batch
+
+
+def dump(
+    objects: Iterable[Any],
+    file: IO[bytes],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> None:
+    with SnapshotWriter(file, batch_size) as writer:
+        writer.write_all(objects)
+
+
+def dumps(objects: Iterable[Any]) -> bytes:
+    file = io.BytesIO()
+    dump(objects, file)
+    return file.getvalue()
+
+
+def load(file: IO[bytes]) -> Iterator[Any]:
+    """Iterate over the models in a snapshot file
+
+    Only load snapshots written by the application itself, as loading a
+    snapshot can execute arbitrary code in the same way as pickle.
+    """
+    return iter(SnapshotReader(file))
+
+
+def loads(data: bytes) -> List[Any]:
+    return list(load(io.BytesIO(data)))
+
+
+class _SnapshotPickler(pickle.Pickler):
+    def __init__(self, file: IO[bytes]) -> None:
+        super().__init__(file, protocol=5)
+
+    def reducer_override(self, obj: Any) -> Any:
+        try:
+            reducer = _reducers[type(obj)]
+        except KeyError:
+            reducer = _reducers[type(obj)] = _reducer(type(obj))
+        if reducer is None:
+            return NotImplemented
+        return reducer(obj)
+
+
+_reducers: Dict[type, Optional[Reducer]] = {}
+
+
+def _reducer(cls: type) -> Optional[Reducer]:
+    if not dataclasses.is_dataclass(cls):
+        return None
+    frozen = issubclass(cls, FrozenModel)
+    base = cast(Any, cls).__frozen_base__ if frozen else cls
+    # The same schema tuple is used for every object so the pickle memo
+    # stores it once per batch
+    schema: Schema = tuple(f.name for f in dataclasses.fields(cls))
+    restore = _restore_frozen if frozen else _restore
+    unset = _UNSET
+
+    def _reduce(obj: Any) -> Tuple[Any, ...]:
+        values = tuple(getattr(obj, name, unset) for name in schema)
+        return (restore, (base, schema, values))
+
+    return _reduce
+
+
+class _Unset:
+    def __reduce__(self) -> str:
+        return "_UNSET"
+
+
+# Value of fields which were not set, such as init=False fields without a
+# default
+_UNSET = _Unset()
+
+_constructors: Dict[Tuple[type, Schema], Callable[[Tuple[Any, ...]], Any]] = {}
+
+
+def _restore(cls: type, schema: Schema, values: Tuple[Any, ...]) -> Any:
+    construct = _constructors.get((cls, schema))
+    if construct is None:
+        construct = _constructor(cls, schema)
+    return construct(values)
+
+
+def _restore_frozen(cls: type, schema: Schema, values: Tuple[Any, ...]) -> Any:
+    return _restore(frozen_model(cls), schema, values)
+
+
+def _constructor(
+    cls: type, schema: Schema
+) -> Callable[[Tuple[Any, ...]], Any]:
+    fields = {f.name: f for f in dataclasses.fields(cls)}
+    positions = [(i, name) for i, name in enumerate(schema) if name in fields]
+    defaults: List[Tuple[str, Any, bool]] = []
+    for name, f in fields.items():
+        if name in schema:
+            continue
+        if f.default_factory is not dataclasses.MISSING:
+            defaults.append((name, f.default_factory, True))
+        elif f.default is not dataclasses.MISSING:
+            defaults.append((name, f.default, False))
+        elif f.init:
+            raise ValueError(
+                f"Snapshot of {cls.__qualname__} has no value for {name}"
+            )
+    set_attr = object.__setattr__
+    new = object.__new__
+    unset = _UNSET
+    frozen = issubclass(cls, FrozenModel)
+
+    def _construct(values: Tuple[Any, ...]) -> Any:
+        obj: Any = new(cls)
+        for i, name in positions:
+            value = values[i]
+            if value is not unset:
+                set_attr(obj, name, value)
+        for name, default, factory in defaults:
+            set_attr(obj, name, default() if factory else default)
+        if frozen:
+            set_attr(obj, "_frozen", True)
+        return obj
+
+    _constructors[(cls, schema)] = _construct
+    return _construct
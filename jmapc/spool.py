@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import tempfile
+import threading
+import weakref
+from typing import Any, Dict, Optional, Tuple
+
+from .json import JSONInput
+from .serializer import StrValue
+
+DEFAULT_SPOOL_MIN_BYTES = 1024 * 1024
+
+# Keys of an EmailBodyValue object, all of which are required in responses
+_BODY_VALUE_KEYS = frozenset(("value", "isEncodingProblem", "isTruncated"))
+
+
+class BodySpool:
+    """Temporary file holding spooled body values
+
+    The file is only open while a value is written or read, so spools do not
+    hold file descriptors. It is removed once the spool and all of its
+    values are no longer referenced.
+    """
+
+    def __init__(self, directory: Optional[str] = None) -> None:
+        fd, self._path = tempfile.mkstemp(prefix="jmapc-", dir=directory)
+        os.close(fd)
+        weakref.finalize(self, _remove, self._path)
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def write(self, value: str, data: Optional[bytes] = None) -> SpooledText:
+        if data is None:
+            data = value.encode()
+        with self._lock:
+            offset = self._size
+            with open(self._path, "ab") as f:
+                f.write(data)
+            self._size += len(data)
+        return SpooledText(self, offset, len(data), len(value))
+
+    def read(self, offset: int, length: int) -> bytes:
+        if not length:
+            return b""
+        with open(self._path, "rb") as f:
+            f.seek(offset)
+            return f.read(length)
+
+
+def _remove(path: str) -> None:
+    with contextlib.suppress(OSError):
+        os.remove(path)
+
+
+class SpooledText(StrValue):
+    """Body value stored in a BodySpool
+
+    The text is read from the spool file and decoded each time read() or
+    str() is called, and is not kept in memory in between. It compares equal
+    to the same text as a str, and is encoded as a str. Unpickled values are
+    written to a new spool in the default temporary directory.
+    """
+
+    __slots__ = ("_spool", "_offset", "_size", "_length")
+
+    def __init__(
+        self, spool: BodySpool, offset: int, size: int, length: int
+    ) -> None:
+        self._spool = spool
+        self._offset = offset
+        self._size = size
+        self._length = length
+
+    def read(self) -> str:
+        return self.encode().decode()
+
+    def __str__(self) -> str:
+        return self.read()
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, SpooledText):
+            other = other.read()
+        if not isinstance(other, str):
+            return NotImplemented
+        return self.read() == other
+
+    def __hash__(self) -> int:
+        return hash(self.read())
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._length} characters)"
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (_unpickle_spooled_text, (self.read(),))
+
+    def encode(
+        self, encoding: Optional[str] = "utf-8", errors: Optional[str] = None
+    ) -> bytes:
+        data = self._spool.read(self._offset, self._size)
+        if encoding in (None, "utf-8", "utf8") and errors in (None, "strict"):
+            return data
+        return data.decode().encode(encoding or "utf-8", errors or "strict")
+
+
+def _unpickle_spooled_text(value: str) -> SpooledText:
+    return BodySpool().write(value)
+
+
+class BodyValueSpooler:
+    """JSON object hook which spools large body values as they are parsed
+
+    Each EmailBodyValue object with a value of at least min_bytes UTF-8
+    bytes has its value moved to a spool file when the object is parsed,
+    and replaced with a spooledValue key holding the SpooledText, which is
+    decoded to EmailBodyValue.spooled_value. A spool is created for the
+    first spooled value.
+    """
+
+    def __init__(
+        self, min_bytes: int, directory: Optional[str] = None
+    ) -> None:
+        self.min_bytes = min_bytes
+        self.directory = directory
+        self.spool: Optional[BodySpool] = None
+
+    def __call__(self, obj: Dict[str, Any]) -> Dict[str, Any]:
+        value = obj.get("value")
+        # UTF-8 uses at most 4 bytes per character
+        if (
+            not isinstance(value, str)
+            or len(value) * 4 < self.min_bytes
+            or obj.keys() != _BODY_VALUE_KEYS
+        ):
+            return obj
+        encoded = value.encode()
+        if len(encoded) < self.min_bytes:
+            return obj
+        self.spool = self.spool or BodySpool(self.directory)
+        del obj["value"]
+        obj["spooledValue"] = self.spool.write(value, encoded)
+        return obj
+
+    def spool_parsed(self, value: Any) -> Any:
+        """Spool the body values in already parsed JSON data"""
+        if isinstance(value, dict):
+            for item in value.values():
+                self.spool_parsed(item)
+            return self(value)
+        if isinstance(value, list):
+            for item in value:
+                self.spool_parsed(item)
+        return value
+
+
+def spooling_loads(
+    body: JSONInput, min_bytes: int, directory: Optional[str] = None
+) -> Any:
+    """Decode a JSON response body, spooling large body values
+
+    Body values are spooled while the body is parsed (see BodyValueSpooler),
+    so at most one value of at least min_bytes is held in memory at a time
+    besides the body itself. Parsing uses the standard library json module.
+    Values spooled from the same body share one spool file.
+    """
+    return json.loads(body, object_hook=BodyValueSpooler(min_bytes, directory))
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from typing import Any, Optional, Tuple, Union
+
+import requests
+
+__all__ = ["HTTPTransport"]
+
+DEFAULT_MAX_CONNECTIONS = 64
+DEFAULT_MAX_HOSTS = 10
+
+RequestsAuth = Union[requests.auth.AuthBase, Tuple[str, str]]
+
+
+class HTTPTransport:
+    """Pools of HTTP connections which may be shared by many clients
+
+    A transport keeps a connection pool for each of up to max_hosts hosts,
+    and keeps up to max_connections connections open in each pool for
+    reuse. If block is set, no more than max_connections connections are
+    opened to a host, and requests wait for a free connection. Otherwise
+    connections opened beyond max_connections are closed after use. If
+    keep_alive is not set, connections are closed after each request.
+
+    Clients given the same transport reuse each other's connections and TLS
+    sessions, while each keeps its own requests session and credentials.
+    Transports are safe to use from several threads.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        block: bool = False,
+        max_hosts: int = DEFAULT_MAX_HOSTS,
+        keep_alive: bool = True,
+        max_retries: int = 0,
+    ) -> None:
+        self.keep_alive = keep_alive
+        self.adapter = requests.adapters.HTTPAdapter(
+            pool_connections=max_hosts,
+            pool_maxsize=max_connections,
+            max_retries=max_retries,
+            pool_block=block,
+        )
+
+    def __enter__(self) -> HTTPTransport:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def session(self, auth: Optional[RequestsAuth] = None) -> requests.Session:
+        """Return a new requests session which uses this transport"""
+        session = requests.Session()
+        session.auth = auth
+        session.mount("https://", self.adapter)
+        session.mount("http://", self.adapter)
+        if not self.keep_alive:
+            session.headers["Connection"] = "close"
+        return session
+
+    def close(self) -> None:
+        """Close all connections in the transport's pools
+
+        The transport can still be used afterwards, and opens new
+        connections as needed.
+        """
+        self.adapter.close()
@@ -1,3 +1,4 @@
+import importlib.util
 import json
 import logging
 import time
@@ -11,6 +12,13 @@ from jmapc.logging import log
 
 pytest.register_assert_rewrite("tests.utils")
 
+# The asyncio client requires the httpx extra
+collect_ignore = (
+    ["test_async_client.py", "test_async_http.py"]
+    if importlib.util.find_spec("httpx") is None
+    else []
+)
+
 
 @pytest.fixture(autouse=True)
 def test_log() -> Iterable[None]:
@@ -55,6 +63,19 @@ def http_responses(
                     "{types}/{closeafter}/{ping}"
                 ),
                 "username": "ness@onett.example.net",
+                "capabilities": {
+                    "urn:ietf:params:jmap:core": {
+                        "maxSizeUpload": 50000000,
+                        "maxConcurrentUpload": 4,
+                        "maxSizeRequest": 10000000,
+                        "maxConcurrentRequests": 4,
+                        "maxCallsInRequest": 16,
+                        "maxObjectsInGet": 500,
+                        "maxObjectsInSet": 500,
+                        "collationAlgorithms": ["i;ascii-casemap"],
+                    },
+                    "urn:ietf:params:jmap:mail": {},
+                },
                 "primary_accounts": {
                     "urn:ietf:params:jmap:core": "u1138",
                     "urn:ietf:params:jmap:mail": "u1138",
@@ -48,6 +48,15 @@ def test_custom_method(
     assert resp == CustomResponse(account_id="u1138", data=test_data)
 
 
+def test_custom_response_from_dict() -> None:
+    data = dict(accountId="u1138", custom_value="Spiteful Crow")
+    resp = CustomResponse.from_dict(data)
+    assert resp == CustomResponse(
+        account_id="u1138", data=dict(custom_value="Spiteful Crow")
+    )
+    assert data == dict(accountId="u1138", custom_value="Spiteful Crow")
+
+
 def test_custom_method_as_result_reference_target(
     client: Client, http_responses: responses.RequestsMock
 ) -> None:
@@ -12,6 +12,7 @@ from jmapc import (
     EmailBodyValue,
     EmailHeader,
     EmailQueryFilterCondition,
+    serializer,
 )
 from jmapc.methods import (
     EmailChanges,
@@ -248,6 +249,76 @@ def test_email_get(
     )
 
 
+def test_email_get_properties(
+    client: Client, http_responses: responses.RequestsMock
+) -> None:
+    expected_request = {
+        "methodCalls": [
+            [
+                "Email/get",
+                {
+                    "accountId": "u1138",
+                    "ids": ["f0001", "f1000"],
+                    "properties": ["threadId", "from"],
+                },
+                "single.Email/get",
+            ]
+        ],
+        "using": [
+            "urn:ietf:params:jmap:core",
+            "urn:ietf:params:jmap:mail",
+        ],
+    }
+    response = {
+        "methodResponses": [
+            [
+                "Email/get",
+                {
+                    "accountId": "u1138",
+                    "list": [
+                        {
+                            "id": "f0001",
+                            "threadId": "T1",
+                            "from": [
+                                {
+                                    "name": "Paula",
+                                    "email": "paula@twoson.example.net",
+                                }
+                            ],
+                        },
+                    ],
+                    "notFound": ["f1000"],
+                    "state": "2187",
+                },
+                "single.Email/get",
+            ]
+        ]
+    }
+    expect_jmap_call(http_responses, expected_request, response)
+    assert client.request(
+        EmailGet(ids=["f0001", "f1000"], properties=["threadId", "from"])
+    ) == EmailGetResponse(
+        account_id="u1138",
+        state="2187",
+        not_found=["f1000"],
+        data=[
+            Email(
+                id="f0001",
+                thread_id="T1",
+                mail_from=[
+                    EmailAddress(
+                        name="Paula", email="paula@twoson.example.net"
+                    ),
+                ],
+            ),
+        ],
+    )
+    assert (
+        Email,
+        frozenset(["threadId", "from"]),
+    ) in serializer._projected_class_decoders
+
+
 def test_email_query(
     client: Client, http_responses: responses.RequestsMock
 ) -> None:
@@ -1,9 +1,10 @@
-from typing import Any, Dict
+from typing import Any, Dict, Type
+from unittest import mock
 
 import pytest
 import responses
 
-from jmapc import Client, Error, errors
+from jmapc import Client, Error, errors, serializer
 from jmapc.methods import CoreEcho
 
 from ..utils import expect_jmap_call
@@ -110,3 +111,27 @@ def test_method_error(
     else:
         resp = client.request(CoreEcho(data=test_data), raise_errors=False)
         assert resp == expected_error
+
+
+@pytest.mark.parametrize(
+    ["data", "expected_type"],
+    [
+        (
+            {"type": "serverFail", "description": "Onett is under attack"},
+            errors.ServerFail,
+        ),
+        ({"type": "unsupportedUnitTestErrorType"}, errors.Error),
+        ({"type": ["serverFail"]}, errors.Error),
+    ],
+)
+def test_error_from_dict_decodes_once(
+    data: Dict[str, Any], expected_type: Type[Error]
+) -> None:
+    with mock.patch(
+        "jmapc.serializer.class_decoder", wraps=serializer.class_decoder
+    ) as class_decoder_mock:
+        error = Error.from_dict(data)
+    assert type(error) is expected_type
+    assert [c.args[0] for c in class_decoder_mock.call_args_list] == [
+        expected_type
+    ]
@@ -0,0 +1,454 @@
+import asyncio
+import base64
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Dict, List
+
+import httpx
+import pytest
+
+from jmapc import AsyncClient, Event, StateChange, TypeState, errors
+from jmapc.async_client import _ServerSentEvent, _ServerSentEventParser
+from jmapc.async_http import AsyncHTTPTransport
+from jmapc.methods import (
+    CoreEcho,
+    CoreEchoResponse,
+    InvocationResponseOrError,
+    MailboxGet,
+    MailboxGetResponse,
+    RawResponse,
+)
+
+from .utils import AsyncTestServer, ServerRequest, ServerResponse
+
+echo_test_data = dict(
+    who="Ness", goods=["Mr. Saturn coin", "Hall of Fame Bat"]
+)
+
+
+def jmap_session(server: AsyncTestServer) -> Dict[str, Any]:
+    return {
+        "apiUrl": f"https://{server.host}/api",
+        "eventSourceUrl": (
+            f"https://{server.host}/events/{{types}}/{{closeafter}}/{{ping}}"
+        ),
+        "username": "ness@onett.example.net",
+        "capabilities": {
+            "urn:ietf:params:jmap:core": {
+                "maxCallsInRequest": 16,
+                "maxObjectsInGet": 500,
+                "maxConcurrentRequests": 2,
+            }
+        },
+        "primary_accounts": {
+            "urn:ietf:params:jmap:core": "u1138",
+            "urn:ietf:params:jmap:mail": "u1138",
+            "urn:ietf:params:jmap:submission": "u1138",
+        },
+    }
+
+
+def async_client(server: AsyncTestServer, **kwargs: Any) -> AsyncClient:
+    server.add_json("GET", "/.well-known/jmap", jmap_session(server))
+    kwargs.setdefault(
+        "transport",
+        AsyncHTTPTransport(ssl_context=server.client_ssl_context()),
+    )
+    return AsyncClient(server.host, auth=("ness", "pk_fire"), **kwargs)
+
+
+async def echo(request: ServerRequest) -> ServerResponse:
+    data = json.loads(request.body)
+    return (
+        200,
+        {"Content-Type": "application/json"},
+        json.dumps(
+            {
+                "methodResponses": [
+                    [name, arguments, method_id]
+                    for name, arguments, method_id in data["methodCalls"]
+                ]
+            }
+        ).encode(),
+    )
+
+
+def test_async_client_request() -> None:
+    async def _test() -> None:
+        async with AsyncTestServer() as server:
+            server.add("POST", "/api", echo)
+            transport = AsyncHTTPTransport(
+                max_connections=2, ssl_context=server.client_ssl_context()
+            )
+            async with async_client(server, transport=transport) as client:
+                results = await asyncio.gather(
+                    *(
+                        client.request(
+                            CoreEcho(data=dict(echo_test_data, count=i))
+                        )
+                        for i in range(20)
+                    )
+                )
+                assert results == [
+                    CoreEchoResponse(data=dict(echo_test_data, count=i))
+                    for i in range(20)
+                ]
+                assert await client.get_account_id() == "u1138"
+            await transport.aclose()
+        # The session is requested once, and connections are reused
+        assert [(r.method, r.path) for r in server.requests].count(
+            ("GET", "/.well-known/jmap")
+        ) == 1
+        assert server.connections <= 2
+        auth = base64.b64encode(b"ness:pk_fire").decode()
+        assert all(
+            r.headers["authorization"] == f"Basic {auth}"
+            for r in server.requests
+        )
+        api_request = json.loads(server.requests[-1].body)
+        assert api_request["methodCalls"][0][0] == "Core/echo"
+        assert api_request["methodCalls"][0][2] == "single.Core/echo"
+
+    asyncio.run(_test())
+
+
+@pytest.mark.parametrize("raw", [True, False])
+def test_async_client_request_split(raw: bool) -> None:
+    async def _test() -> None:
+        async with AsyncTestServer() as server:
+            server.add("POST", "/api", echo)
+            async with async_client(server) as client:
+                calls = [CoreEcho(data={"i": i}) for i in range(40)]
+                if raw:
+                    raw_results = await client.request(calls, raw=True)
+                    assert [r.data for r in raw_results] == [
+                        {"i": i} for i in range(40)
+                    ]
+                else:
+                    results = await client.request(calls)
+                    assert [r.response for r in results] == [
+                        CoreEchoResponse(data={"i": i}) for i in range(40)
+                    ]
+        assert [
+            len(json.loads(r.body)["methodCalls"])
+            for r in server.requests
+            if r.method == "POST"
+        ] == [16, 16, 8]
+
+    asyncio.run(_test())
+
+
+@pytest.mark.parametrize("raw", [True, False])
+def test_async_client_request_multiple(raw: bool) -> None:
+    async def mailbox_get(request: ServerRequest) -> ServerResponse:
+        return (
+            200,
+            {"Content-Type": "application/json"},
+            json.dumps(
+                {
+                    "methodResponses": [
+                        ["Core/echo", echo_test_data, "0.Core/echo"],
+                        ["error", {"type": "serverFail"}, "1.Mailbox/get"],
+                    ]
+                }
+            ).encode(),
+        )
+
+    async def _test() -> None:
+        async with AsyncTestServer() as server:
+            server.add("POST", "/api", mailbox_get)
+            async with async_client(server) as client:
+                calls = [CoreEcho(data=echo_test_data), MailboxGet(ids=[])]
+                if raw:
+                    assert await client.request(calls, raw=True) == [
+                        RawResponse(
+                            id="0.Core/echo",
+                            method_name="Core/echo",
+                            data=echo_test_data,
+                        ),
+                        RawResponse(
+                            id="1.Mailbox/get",
+                            method_name="error",
+                            data={"type": "serverFail"},
+                        ),
+                    ]
+                else:
+                    assert await client.request(calls) == [
+                        InvocationResponseOrError(
+                            id="0.Core/echo",
+                            response=CoreEchoResponse(data=echo_test_data),
+                        ),
+                        InvocationResponseOrError(
+                            id="1.Mailbox/get", response=errors.ServerFail()
+                        ),
+                    ]
+                with pytest.raises(RuntimeError):
+                    if raw:
+                        await client.request(
+                            calls, raise_errors=True, raw=True
+                        )
+                    else:
+                        await client.request(calls, raise_errors=True)
+                with pytest.raises(ValueError):
+                    await client.request(
+                        calls, single_response=True
+                    )  # type: ignore
+
+    asyncio.run(_test())
+
+
+def test_async_client_request_stream() -> None:
+    async def _test() -> None:
+        async with AsyncTestServer() as server:
+            server.add("POST", "/api", echo)
+            async with async_client(server) as client:
+                calls = [
+                    CoreEcho(data=dict(echo_test_data, count=i))
+                    for i in range(20)
+                ]
+                results = [r async for r in client.request_stream(calls)]
+                assert results == [
+                    InvocationResponseOrError(
+                        id=f"{i}.Core/echo",
+                        response=CoreEchoResponse(
+                            data=dict(echo_test_data, count=i)
+                        ),
+                    )
+                    for i in range(20)
+                ]
+        # Requests with too many calls are split
+        assert [
+            len(json.loads(r.body)["methodCalls"])
+            for r in server.requests
+            if r.method == "POST"
+        ] == [16, 4]
+
+    asyncio.run(_test())
+
+
+def test_async_client_request_stream_raise_errors() -> None:
+    async def api(request: ServerRequest) -> ServerResponse:
+        return (
+            200,
+            {"Content-Type": "application/json"},
+            json.dumps(
+                {
+                    "methodResponses": [
+                        ["Core/echo", echo_test_data, "single.Core/echo"],
+                        ["error", {"type": "serverFail"}, "single.Core/echo"],
+                    ]
+                }
+            ).encode(),
+        )
+
+    async def _test() -> None:
+        async with AsyncTestServer() as server:
+            server.add("POST", "/api", api)
+            async with async_client(server) as client:
+                stream = client.request_stream(
+                    CoreEcho(data=echo_test_data), raise_errors=True
+                )
+                result = await stream.__anext__()
+                assert result.response == CoreEchoResponse(data=echo_test_data)
+                with pytest.raises(RuntimeError):
+                    await stream.__anext__()
+
+    asyncio.run(_test())
+
+
+@pytest.mark.parametrize("raw", [True, False])
+def test_async_client_request_get_chunks(raw: bool) -> None:
+    active: List[int] = [0, 0]
+
+    async def mailbox_get(request: ServerRequest) -> ServerResponse:
+        active[0] += 1
+        active[1] = max(active)
+        await asyncio.sleep(0.01)
+        active[0] -= 1
+        name, arguments, method_id = json.loads(request.body)["methodCalls"][0]
+        return (
+            200,
+            {"Content-Type": "application/json"},
+            json.dumps(
+                {
+                    "methodResponses": [
+                        [
+                            name,
+                            {
+                                "accountId": "u1138",
+                                "list": [
+                                    {"id": i, "name": f"Box {i}"}
+                                    for i in arguments["ids"][1:]
+                                ],
+                                "notFound": arguments["ids"][:1],
+                                "state": "2187",
+                            },
+                            method_id,
+                        ]
+                    ]
+                }
+            ).encode(),
+        )
+
+    ids = [f"MBX{i}" for i in range(2000)]
+
+    async def _test() -> None:
+        async with AsyncTestServer() as server:
+            server.add("POST", "/api", mailbox_get)
+            async with async_client(server) as client:
+                if raw:
+                    raw_result = await client.request(
+                        MailboxGet(ids=ids), raw=True
+                    )
+                    assert isinstance(raw_result, RawResponse)
+                    assert [m["id"] for m in raw_result["list"]] == [
+                        i
+                        for i in ids
+                        if i[3:] not in ("0", "500", "1000", "1500")
+                    ]
+                    assert raw_result["notFound"] == [
+                        "MBX0",
+                        "MBX500",
+                        "MBX1000",
+                        "MBX1500",
+                    ]
+                else:
+                    result = await client.request(MailboxGet(ids=ids))
+                    assert isinstance(result, MailboxGetResponse)
+                    assert len(result.data) == 1996
+                    assert result.not_found == [
+                        "MBX0",
+                        "MBX500",
+                        "MBX1000",
+                        "MBX1500",
+                    ]
+        assert [r.method for r in server.requests].count("POST") == 4
+        # No more than maxConcurrentRequests requests are sent at once
+        assert active[1] == 2
+
+    asyncio.run(_test())
+
+
+def test_async_client_error_unauthorized() -> None:
+    async def _test() -> None:
+        async with AsyncTestServer() as server:
+            server.add_json("POST", "/api", {}, status=401)
+            async with async_client(server) as client:
+                with pytest.raises(httpx.HTTPStatusError) as e:
+                    await client.request(CoreEcho(data=echo_test_data))
+                assert e.value.response is not None
+                assert e.value.response.status_code == 401
+
+    asyncio.run(_test())
+
+
+def test_async_client_decode_executor() -> None:
+    mailboxes = [{"id": f"MBX{i}", "name": f"Box {i}"} for i in range(10)]
+    response = {
+        "methodResponses": [
+            [
+                "Mailbox/get",
+                {
+                    "accountId": "u1138",
+                    "list": mailboxes,
+                    "notFound": [],
+                    "state": "2187",
+                },
+                "single.Mailbox/get",
+            ]
+        ]
+    }
+
+    async def _test() -> None:
+        async with AsyncTestServer() as server:
+            server.add_json("POST", "/api", response)
+            with ThreadPoolExecutor(2) as executor:
+                async with async_client(
+                    server,
+                    decode_executor=executor,
+                    offload_min_bytes=0,
+                    offload_chunks=3,
+                ) as client:
+                    result = await client.request(MailboxGet(ids=None))
+        assert isinstance(result, MailboxGetResponse)
+        assert [m.id for m in result.data] == [m["id"] for m in mailboxes]
+
+    asyncio.run(_test())
+
+
+def test_async_client_events() -> None:
+    streams: List[List[bytes]] = [
+        [
+            b": connected\n\nretry: 0\n",
+            b"event: ping\ndata: {}\n\n",
+            b'id: 1\r\nevent: state\r\ndata: {"changed": ',
+            b'{"u1138": {"Email": "1"}}}\r',
+            b"\n\r\n",
+            # The id is kept, although no event is dispatched
+            b"id: 2\n\n",
+        ],
+        [
+            b"event: state\n",
+            b'data: {"changed": ',
+            b'{"u1138": {"Mailbox": "2"}}}\n\n',
+        ],
+    ]
+    last_event_ids: List[str] = []
+
+    async def event_source(request: ServerRequest) -> ServerResponse:
+        last_event_ids.append(request.headers.get("last-event-id", ""))
+        chunks = streams.pop(0)
+
+        async def _stream() -> AsyncIterator[bytes]:
+            for chunk in chunks:
+                yield chunk
+
+        return 200, {"Content-Type": "text/event-stream"}, _stream()
+
+    async def _test() -> List[Event]:
+        async with AsyncTestServer() as server:
+            server.add("GET", "/events/*/no/0", event_source)
+            async with async_client(server) as client:
+                events = []
+                # Close the event stream before the client's transport
+                event_stream = client.events
+                try:
+                    async for event in event_stream:
+                        events.append(event)
+                        if len(events) == 2:
+                            break
+                finally:
+                    await event_stream.aclose()
+                return events
+
+    assert asyncio.run(_test()) == [
+        Event(
+            id="1",
+            data=StateChange(changed={"u1138": TypeState(email="1")}),
+        ),
+        Event(
+            id="2",
+            data=StateChange(changed={"u1138": TypeState(mailbox="2")}),
+        ),
+    ]
+    assert last_event_ids == ["", "2"]
+
+
+def test_server_sent_event_parser() -> None:
+    parser = _ServerSentEventParser(None, 3.0)
+    assert not list(parser.feed(b"retry: 10\nid: 5\ndata: Ness"))
+    # The reconnection time and id are set before the event is dispatched
+    assert parser.retry == 0.01
+    assert parser.last_event_id == "5"
+    assert list(parser.feed(b"\n\ndata: Paula\n\n")) == [
+        _ServerSentEvent(data="Ness", id="5"),
+        _ServerSentEvent(data="Paula", id="5"),
+    ]
+    assert not list(parser.feed(b"retry: ten\nid: 6\0\nid\n"))
+    assert parser.retry == 0.01
+    assert parser.last_event_id == ""
+    assert not list(parser.feed(b"event: state\ndata: Jeff"))
+    parser.reset()
+    assert list(parser.feed(b"\ndata: Poo\n\n")) == [
+        _ServerSentEvent(data="Poo", id="")
+    ]
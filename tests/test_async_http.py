@@ -0,0 +1,285 @@
+import asyncio
+import gzip
+from typing import AsyncIterator, List, Optional
+
+import httpx
+import pytest
+import requests
+
+from jmapc.async_http import AsyncAuth, AsyncHTTPTransport
+from jmapc.auth import BearerAuth
+
+from .utils import CERTIFICATE, AsyncTestServer, ServerRequest, ServerResponse
+
+
+async def redirect(request: ServerRequest) -> ServerResponse:
+    return 303, {"Location": "/compressed"}, b""
+
+
+async def compressed(request: ServerRequest) -> ServerResponse:
+    content = gzip.compress(b"Happy Happy Village" * 1000)
+
+    async def _chunks() -> AsyncIterator[bytes]:
+        for i in range(0, len(content), 10):
+            yield content[i:][:10]
+
+    return 200, {"Content-Encoding": "gzip"}, _chunks()
+
+
+async def loop(request: ServerRequest) -> ServerResponse:
+    return 302, {"Location": "/loop"}, b""
+
+
+async def slow(request: ServerRequest) -> ServerResponse:
+    await asyncio.sleep(1)
+    return 200, {}, b""
+
+
+def test_async_http_transport() -> None:
+    async def _test() -> None:
+        async with AsyncTestServer() as server:
+            server.add("POST", "/redirect", redirect)
+            server.add("GET", "/compressed", compressed)
+            server.add("GET", "/slow", slow)
+            async with AsyncHTTPTransport(
+                max_keepalive_connections=1,
+                timeout=0.1,
+                ssl_context=server.client_ssl_context(),
+            ) as transport:
+                url = f"https://{server.host}"
+                responses: List[httpx.Response] = await asyncio.gather(
+                    *(
+                        transport.request(
+                            "POST", f"{url}/redirect", data=b"Onett"
+                        )
+                        for _ in range(3)
+                    )
+                )
+                for r in responses:
+                    assert r.status_code == 200
+                    assert r.url == f"{url}/compressed"
+                    assert r.content == b"Happy Happy Village" * 1000
+                r = await transport.request("GET", f"{url}/missing")
+                assert r.status_code == 404
+                with pytest.raises(httpx.HTTPStatusError):
+                    r.raise_for_status()
+                with pytest.raises(httpx.TimeoutException):
+                    await transport.request("GET", f"{url}/slow")
+            with pytest.raises(RuntimeError):
+                await transport.request("GET", f"{url}/missing")
+        # Idle connections are reused
+        assert server.connections < len(server.requests)
+        assert (
+            sorted((r.method, r.path) for r in server.requests[:6])
+            == [
+                ("GET", "/compressed"),
+            ]
+            * 3
+            + [("POST", "/redirect")] * 3
+        )
+        assert server.requests[-1].path == "/slow"
+
+    asyncio.run(_test())
+
+
+def test_async_http_too_many_redirects() -> None:
+    async def _test() -> None:
+        async with AsyncTestServer() as server:
+            server.add("GET", "/loop", loop)
+            async with AsyncHTTPTransport(
+                ssl_context=server.client_ssl_context()
+            ) as transport:
+                with pytest.raises(httpx.TooManyRedirects):
+                    await transport.request(
+                        "GET", f"https://{server.host}/loop"
+                    )
+        # Each redirect is followed on the same connection
+        assert server.connections == 1
+        assert len(server.requests) == 31
+
+    asyncio.run(_test())
+
+
+def test_async_http_stream() -> None:
+    async def _test() -> None:
+        async with AsyncTestServer() as server:
+            server.add("GET", "/compressed", compressed)
+            async with AsyncHTTPTransport(
+                ssl_context=server.client_ssl_context()
+            ) as transport:
+                async with transport.stream(
+                    "GET", f"https://{server.host}/compressed"
+                ) as response:
+                    assert response.status_code == 200
+                    content = b"".join(
+                        [chunk async for chunk in response.aiter_bytes()]
+                    )
+        assert content == b"Happy Happy Village" * 1000
+
+    asyncio.run(_test())
+
+
+def test_async_http_environment_ca_bundle(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("SSL_CERT_FILE", CERTIFICATE)
+
+    async def _test() -> None:
+        async with AsyncTestServer() as server:
+            async with AsyncHTTPTransport() as transport:
+                r = await transport.request(
+                    "GET", f"https://{server.host}/missing"
+                )
+                assert r.status_code == 404
+
+    asyncio.run(_test())
+
+
+async def authorization(request: ServerRequest) -> ServerResponse:
+    return 200, {}, request.headers.get("authorization", "").encode()
+
+
+async def digest(request: ServerRequest) -> ServerResponse:
+    if request.headers.get("authorization", "").startswith("Digest "):
+        return 200, {}, b"Welcome to Onett"
+    challenge = 'Digest realm="Onett", nonce="2187", qop="auth"'
+    return 401, {"WWW-Authenticate": challenge}, b""
+
+
+@pytest.mark.parametrize(
+    ["auth", "expected"],
+    [
+        (None, b""),
+        (("ness", "pk_fire"), b"Basic bmVzczpwa19maXJl"),
+        (
+            requests.auth.HTTPBasicAuth("ness", "pk_fire"),
+            b"Basic bmVzczpwa19maXJl",
+        ),
+        (BearerAuth("ness__pk_fire"), b"Bearer ness__pk_fire"),
+        (httpx.BasicAuth("ness", "pk_fire"), b"Basic bmVzczpwa19maXJl"),
+    ],
+)
+def test_async_http_auth(auth: Optional[AsyncAuth], expected: bytes) -> None:
+    async def _test() -> bytes:
+        async with AsyncTestServer() as server:
+            server.add("GET", "/auth", authorization)
+            async with AsyncHTTPTransport(
+                ssl_context=server.client_ssl_context()
+            ) as transport:
+                r = await transport.request(
+                    "GET", f"https://{server.host}/auth", auth=auth
+                )
+                return r.content
+
+    assert asyncio.run(_test()) == expected
+
+
+def test_async_http_digest_auth() -> None:
+    async def _test() -> None:
+        async with AsyncTestServer() as server:
+            server.add("GET", "/digest", digest)
+            async with AsyncHTTPTransport(
+                ssl_context=server.client_ssl_context()
+            ) as transport:
+                r = await transport.request(
+                    "GET",
+                    f"https://{server.host}/digest",
+                    auth=requests.auth.HTTPDigestAuth("ness", "pk_fire"),
+                )
+                assert r.content == b"Welcome to Onett"
+        assert [
+            r.headers["authorization"][:7] for r in server.requests[1:]
+        ] == ["Digest "]
+
+    asyncio.run(_test())
+
+
+def test_async_http_event_loop() -> None:
+    transport = AsyncHTTPTransport()
+
+    async def _test() -> None:
+        async with AsyncTestServer() as server:
+            await transport.request("GET", f"http://{server.host}/missing")
+
+    with pytest.raises(httpx.TransportError):
+        asyncio.run(_test())
+    # The transport cannot be used from another event loop
+    with pytest.raises(RuntimeError):
+        asyncio.run(_test())
+
+
+class RawServer:
+    """Plain HTTP server sending canned replies, closing on None"""
+
+    def __init__(self, replies: List[Optional[bytes]]) -> None:
+        self.replies = replies
+        self.requests: List[bytes] = []
+
+    async def __aenter__(self) -> "RawServer":
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.url = (
+            f"http://127.0.0.1:{self.server.sockets[0].getsockname()[1]}"
+        )
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        while self.replies:
+            try:
+                head = await reader.readuntil(b"\r\n\r\n")
+            except asyncio.IncompleteReadError:
+                break
+            for line in head.lower().split(b"\r\n"):
+                if line.startswith(b"content-length:"):
+                    await reader.readexactly(int(line.split(b":")[1]))
+            self.requests.append(head)
+            reply = self.replies.pop(0)
+            if reply is None:
+                break
+            writer.write(reply)
+            await writer.drain()
+        writer.close()
+
+
+@pytest.mark.parametrize(
+    "reply",
+    [
+        b"Onett\r\n\r\n",
+        b"HTTP/1.1 OK\r\n\r\n",
+        b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\nzz\r\n",
+        b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n",
+    ],
+)
+def test_async_http_malformed_response(reply: bytes) -> None:
+    async def _test() -> None:
+        async with RawServer([reply]) as server:
+            async with AsyncHTTPTransport() as transport:
+                with pytest.raises(httpx.TransportError):
+                    await transport.request("GET", f"{server.url}/")
+
+    asyncio.run(_test())
+
+
+def test_async_http_request_not_resent() -> None:
+    async def _test() -> None:
+        ok = b"HTTP/1.1 200 OK\r\nContent-Length: 0\r\n\r\n"
+        async with RawServer([ok, None, ok]) as server:
+            async with AsyncHTTPTransport() as transport:
+                url = server.url.replace("127.0.0.1", "ness:pk@127.0.0.1")
+                r = await transport.request("POST", url, data=b"Onett")
+                assert r.status_code == 200
+                # The connection is closed after the request was sent
+                with pytest.raises(httpx.TransportError):
+                    await transport.request("POST", url, data=b"Twoson")
+        assert len(server.requests) == 2
+        host = server.url.split("//")[1]
+        assert all(
+            f"\r\nHost: {host}\r\n".encode() in r for r in server.requests
+        )
+
+    asyncio.run(_test())
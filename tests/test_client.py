@@ -1,23 +1,45 @@
+import dataclasses
 import json
-from typing import List
+import logging
+import threading
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from typing import Any, Callable, Dict, List, Optional, Tuple, cast
+from unittest import mock
 
 import pytest
 import requests
 import responses
 
-from jmapc import Client
+from jmapc import Client, Email, Mailbox, errors
 from jmapc.auth import BearerAuth
+from jmapc.json import JSONBackend, stdlib_json_backend
 from jmapc.methods import (
     CoreEcho,
     CoreEchoResponse,
+    EmailGet,
+    EmailGetResponse,
+    EmailSet,
     Invocation,
     InvocationResponseOrError,
     MailboxGet,
     MailboxGetResponse,
+    Method,
+    RawResponse,
     Request,
 )
 from jmapc.ref import Ref, ResultReference
-from jmapc.session import Session, SessionPrimaryAccount
+from jmapc.serializer import LazyList
+from jmapc.session import (
+    Session,
+    SessionCapabilities,
+    SessionCapabilitiesCore,
+    SessionPrimaryAccount,
+)
+from jmapc.spool import SpooledText
 
 from .utils import expect_jmap_call
 
@@ -59,6 +81,18 @@ def test_jmap_session(
             mail="u1138",
             submission="u1138",
         ),
+        capabilities=SessionCapabilities(
+            core=SessionCapabilitiesCore(
+                max_size_upload=50000000,
+                max_concurrent_upload=4,
+                max_size_request=10000000,
+                max_concurrent_requests=4,
+                max_calls_in_request=16,
+                max_objects_in_get=500,
+                max_objects_in_set=500,
+                collation_algorithms=["i;ascii-casemap"],
+            )
+        ),
     )
 
 
@@ -308,3 +342,1121 @@ def test_error_unauthorized(
     with pytest.raises(requests.exceptions.HTTPError) as e:
         client.request(CoreEcho(data=echo_test_data))
     assert e.value.response.status_code == 401
+
+
+@pytest.mark.parametrize(
+    ["log_max_bytes", "expected_request_log"],
+    [
+        (
+            None,
+            'Sending JMAP request (109 bytes) {"using": '
+            '["urn:ietf:params:jmap:core"], "methodCalls": [["Core/echo", '
+            '{"who": "Ness"}, "single.Core/echo"]]}',
+        ),
+        (
+            16,
+            'Sending JMAP request (109 bytes) {"using": ["urn:... '
+            "(93 more bytes)",
+        ),
+    ],
+)
+def test_client_request_debug_log(
+    http_responses: responses.RequestsMock,
+    caplog: pytest.LogCaptureFixture,
+    log_max_bytes: Optional[int],
+    expected_request_log: str,
+) -> None:
+    client = Client(
+        host="jmap-example.localhost",
+        auth=("ness", "pk_fire"),
+        json_backend=stdlib_json_backend,
+        log_max_bytes=log_max_bytes,
+    )
+    test_data = dict(who="Ness")
+    expect_jmap_call(
+        http_responses,
+        {
+            "methodCalls": [["Core/echo", test_data, "single.Core/echo"]],
+            "using": ["urn:ietf:params:jmap:core"],
+        },
+        {"methodResponses": [["Core/echo", test_data, "single.Core/echo"]]},
+    )
+    with caplog.at_level(logging.DEBUG, logger="jmapc"):
+        client.request(CoreEcho(data=test_data))
+    messages = [r.getMessage() for r in caplog.records]
+    assert messages[0] == expected_request_log
+    assert messages[1].startswith("Received JMAP response (73 bytes) ")
+
+
+def test_client_request_no_debug_log(
+    client: Client,
+    http_responses: responses.RequestsMock,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    expect_jmap_call(
+        http_responses,
+        {
+            "methodCalls": [["Core/echo", echo_test_data, "single.Core/echo"]],
+            "using": ["urn:ietf:params:jmap:core"],
+        },
+        {
+            "methodResponses": [
+                ["Core/echo", echo_test_data, "single.Core/echo"]
+            ]
+        },
+    )
+    caplog.set_level(logging.INFO, logger="jmapc")
+    with mock.patch("jmapc.client.log_body") as log_body_mock:
+        client.request(CoreEcho(data=echo_test_data))
+    log_body_mock.assert_not_called()
+
+
+@pytest.mark.parametrize("lazy_decode", [True, False])
+def test_client_request_lazy_decode(
+    http_responses: responses.RequestsMock, lazy_decode: bool
+) -> None:
+    client = Client(
+        host="jmap-example.localhost",
+        auth=("ness", "pk_fire"),
+        lazy_decode=lazy_decode,
+    )
+    expect_jmap_call(
+        http_responses,
+        {
+            "methodCalls": [
+                [
+                    "Mailbox/get",
+                    {"accountId": "u1138", "ids": ["MBX1", "MBX5"]},
+                    "single.Mailbox/get",
+                ]
+            ],
+            "using": [
+                "urn:ietf:params:jmap:core",
+                "urn:ietf:params:jmap:mail",
+            ],
+        },
+        {
+            "methodResponses": [
+                [
+                    "Mailbox/get",
+                    {
+                        "accountId": "u1138",
+                        "list": [
+                            {"id": "MBX1", "name": "First"},
+                            {"id": "MBX5", "name": "Second"},
+                        ],
+                        "not_found": [],
+                        "state": "2187",
+                    },
+                    "single.Mailbox/get",
+                ]
+            ]
+        },
+    )
+    resp = client.request(MailboxGet(ids=["MBX1", "MBX5"]))
+    assert isinstance(resp, MailboxGetResponse)
+    assert isinstance(resp.data, LazyList) == lazy_decode
+    assert resp == MailboxGetResponse(
+        account_id="u1138",
+        state="2187",
+        not_found=[],
+        data=[
+            Mailbox(id="MBX1", name="First"),
+            Mailbox(id="MBX5", name="Second"),
+        ],
+    )
+
+
+def test_client_request_raw(
+    client: Client, http_responses: responses.RequestsMock
+) -> None:
+    expect_jmap_call(
+        http_responses,
+        {
+            "methodCalls": [
+                [
+                    "Mailbox/get",
+                    {"accountId": "u1138", "ids": ["MBX1", "MBX5"]},
+                    "0.Mailbox/get",
+                ],
+                [
+                    "Email/set",
+                    {
+                        "accountId": "u1138",
+                        "destroy": ["M1001"],
+                    },
+                    "1.Email/set",
+                ],
+                ["Core/echo", echo_test_data, "2.Core/echo"],
+            ],
+            "using": [
+                "urn:ietf:params:jmap:core",
+                "urn:ietf:params:jmap:mail",
+            ],
+        },
+        {
+            "methodResponses": [
+                [
+                    "Mailbox/get",
+                    {
+                        "accountId": "u1138",
+                        "list": [{"id": "MBX1", "name": "First"}],
+                        "notFound": ["MBX5"],
+                        "state": "2187",
+                    },
+                    "0.Mailbox/get",
+                ],
+                [
+                    "Email/set",
+                    {
+                        "accountId": "u1138",
+                        "oldState": "1",
+                        "newState": "2",
+                        "destroyed": ["M1001"],
+                    },
+                    "1.Email/set",
+                ],
+                ["error", {"type": "unknownMethod"}, "2.Core/echo"],
+            ]
+        },
+    )
+    resp = client.request(
+        [
+            MailboxGet(ids=["MBX1", "MBX5"]),
+            EmailSet(destroy=["M1001"]),
+            CoreEcho(data=echo_test_data),
+        ],
+        raw=True,
+    )
+    assert [r.id for r in resp] == [
+        "0.Mailbox/get",
+        "1.Email/set",
+        "2.Core/echo",
+    ]
+    mailboxes, emails, echo = resp
+    assert mailboxes.method_name == "Mailbox/get"
+    assert mailboxes.account_id == "u1138"
+    assert mailboxes.state == "2187"
+    assert mailboxes.list == [{"id": "MBX1", "name": "First"}]
+    assert mailboxes.not_found == ["MBX5"]
+    assert mailboxes["list"] is mailboxes.list
+    assert (
+        mailboxes.query_state,
+        mailboxes.ids,
+        mailboxes.total,
+        mailboxes.position,
+        mailboxes.has_more_changes,
+        mailboxes.created,
+        mailboxes.updated,
+        mailboxes.not_created,
+        mailboxes.not_updated,
+        mailboxes.not_destroyed,
+    ) == (None,) * 10
+    assert not mailboxes.is_error and mailboxes.error_type is None
+    assert emails.old_state == "1"
+    assert emails.new_state == "2"
+    assert emails.destroyed == ["M1001"]
+    assert emails.get("notDestroyed", {}) == {}
+    assert echo.is_error
+    assert echo.error_type == "unknownMethod"
+
+
+@pytest.mark.parametrize("single_response", [True, False])
+def test_client_request_raw_single(
+    client: Client,
+    http_responses: responses.RequestsMock,
+    single_response: bool,
+) -> None:
+    expect_jmap_call(
+        http_responses,
+        {
+            "methodCalls": [["Core/echo", echo_test_data, "single.Core/echo"]],
+            "using": ["urn:ietf:params:jmap:core"],
+        },
+        {
+            "methodResponses": [
+                ["Core/echo", echo_test_data, "single.Core/echo"]
+            ]
+        },
+    )
+    resp = client.request(
+        CoreEcho(data=echo_test_data),
+        single_response=single_response,
+        raw=True,
+    )
+    assert resp == RawResponse(
+        id="single.Core/echo", method_name="Core/echo", data=echo_test_data
+    )
+
+
+def test_client_request_raw_multiple_responses(
+    client: Client, http_responses: responses.RequestsMock
+) -> None:
+    for _ in range(3):
+        expect_jmap_call(
+            http_responses,
+            {
+                "methodCalls": [
+                    ["Core/echo", echo_test_data, "single.Core/echo"]
+                ],
+                "using": ["urn:ietf:params:jmap:core"],
+            },
+            {
+                "methodResponses": [
+                    ["Core/echo", echo_test_data, "single.Core/echo"],
+                    ["error", {"type": "serverFail"}, "single.Core/echo"],
+                ]
+            },
+        )
+    resp = client.request(CoreEcho(data=echo_test_data), raw=True)
+    assert isinstance(resp, list)
+    assert [r.method_name for r in resp] == ["Core/echo", "error"]
+    with pytest.raises(RuntimeError, match="2 results received"):
+        client.request(
+            CoreEcho(data=echo_test_data), single_response=True, raw=True
+        )
+    with pytest.raises(RuntimeError, match="Errors found"):
+        client.request(
+            CoreEcho(data=echo_test_data), raise_errors=True, raw=True
+        )
+
+
+def test_client_request_stream(
+    client: Client, http_responses: responses.RequestsMock
+) -> None:
+    expect_jmap_call(
+        http_responses,
+        {
+            "methodCalls": [
+                ["Core/echo", echo_test_data, "0.Core/echo"],
+                [
+                    "Mailbox/get",
+                    {"accountId": "u1138", "ids": ["MBX1"], "properties": []},
+                    "1.Mailbox/get",
+                ],
+                ["Core/echo", echo_test_data, "2.Core/echo"],
+            ],
+            "using": [
+                "urn:ietf:params:jmap:core",
+                "urn:ietf:params:jmap:mail",
+            ],
+        },
+        {
+            "methodResponses": [
+                ["Core/echo", echo_test_data, "0.Core/echo"],
+                [
+                    "Mailbox/get",
+                    {
+                        "accountId": "u1138",
+                        "list": [{"id": "MBX1"}],
+                        "notFound": [],
+                        "state": "2187",
+                    },
+                    "1.Mailbox/get",
+                ],
+                ["error", {"type": "serverFail"}, "2.Core/echo"],
+            ],
+            "sessionState": "2187",
+        },
+    )
+    stream = client.request_stream(
+        [
+            CoreEcho(data=echo_test_data),
+            MailboxGet(ids=["MBX1"], properties=[]),
+            CoreEcho(data=echo_test_data),
+        ]
+    )
+    assert not http_responses.calls
+    assert next(stream) == InvocationResponseOrError(
+        id="0.Core/echo", response=CoreEchoResponse(data=echo_test_data)
+    )
+    assert list(stream) == [
+        InvocationResponseOrError(
+            id="1.Mailbox/get",
+            response=MailboxGetResponse(
+                account_id="u1138",
+                state="2187",
+                not_found=[],
+                data=[Mailbox(id="MBX1")],
+            ),
+        ),
+        InvocationResponseOrError(
+            id="2.Core/echo", response=errors.ServerFail()
+        ),
+    ]
+
+
+def test_client_request_stream_raise_errors(
+    client: Client, http_responses: responses.RequestsMock
+) -> None:
+    expect_jmap_call(
+        http_responses,
+        {
+            "methodCalls": [["Core/echo", echo_test_data, "single.Core/echo"]],
+            "using": ["urn:ietf:params:jmap:core"],
+        },
+        {
+            "methodResponses": [
+                ["Core/echo", echo_test_data, "single.Core/echo"],
+                ["error", {"type": "serverFail"}, "single.Core/echo"],
+            ]
+        },
+    )
+    stream = client.request_stream(
+        CoreEcho(data=echo_test_data), raise_errors=True
+    )
+    assert next(stream) == InvocationResponseOrError(
+        id="single.Core/echo", response=CoreEchoResponse(data=echo_test_data)
+    )
+    with pytest.raises(RuntimeError, match="Errors found"):
+        next(stream)
+
+
+@pytest.mark.parametrize(
+    "executor_type", [ThreadPoolExecutor, ProcessPoolExecutor]
+)
+@pytest.mark.parametrize("offload_chunks", [1, 3])
+def test_client_request_decode_executor(
+    http_responses: responses.RequestsMock,
+    executor_type: Callable[[int], Executor],
+    offload_chunks: int,
+) -> None:
+    mailboxes = [dict(id=f"MBX{i}", name=f"Mailbox {i}") for i in range(10)]
+    expect_jmap_call(
+        http_responses,
+        {
+            "methodCalls": [
+                [
+                    "Mailbox/get",
+                    {"accountId": "u1138"},
+                    "0.Mailbox/get",
+                ],
+                [
+                    "Mailbox/get",
+                    {"accountId": "u1138", "ids": [], "properties": ["name"]},
+                    "1.Mailbox/get",
+                ],
+                ["Core/echo", echo_test_data, "2.Core/echo"],
+            ],
+            "using": [
+                "urn:ietf:params:jmap:core",
+                "urn:ietf:params:jmap:mail",
+            ],
+        },
+        {
+            "methodResponses": [
+                [
+                    "Mailbox/get",
+                    {
+                        "accountId": "u1138",
+                        "list": mailboxes,
+                        "notFound": [],
+                        "state": "2187",
+                    },
+                    "0.Mailbox/get",
+                ],
+                [
+                    "Mailbox/get",
+                    {
+                        "accountId": "u1138",
+                        "list": [],
+                        "notFound": [],
+                        "state": "2187",
+                    },
+                    "1.Mailbox/get",
+                ],
+                ["error", {"type": "serverFail"}, "2.Core/echo"],
+            ],
+        },
+    )
+    with executor_type(1) as executor:
+        client = Client(
+            host="jmap-example.localhost",
+            auth=("ness", "pk_fire"),
+            decode_executor=executor,
+            offload_min_bytes=0,
+            offload_chunks=offload_chunks,
+        )
+        resp = client.request(
+            [
+                MailboxGet(ids=None),
+                MailboxGet(ids=[], properties=["name"]),
+                CoreEcho(data=echo_test_data),
+            ]
+        )
+    assert resp == [
+        InvocationResponseOrError(
+            id="0.Mailbox/get",
+            response=MailboxGetResponse(
+                account_id="u1138",
+                state="2187",
+                not_found=[],
+                data=[Mailbox.from_dict(m) for m in mailboxes],
+            ),
+        ),
+        InvocationResponseOrError(
+            id="1.Mailbox/get",
+            response=MailboxGetResponse(
+                account_id="u1138", state="2187", not_found=[], data=[]
+            ),
+        ),
+        InvocationResponseOrError(
+            id="2.Core/echo", response=errors.ServerFail()
+        ),
+    ]
+
+
+def test_client_request_decode_executor_min_bytes(
+    http_responses: responses.RequestsMock,
+) -> None:
+    expect_jmap_call(
+        http_responses,
+        {
+            "methodCalls": [["Core/echo", echo_test_data, "single.Core/echo"]],
+            "using": ["urn:ietf:params:jmap:core"],
+        },
+        {
+            "methodResponses": [
+                ["Core/echo", echo_test_data, "single.Core/echo"]
+            ]
+        },
+    )
+    executor = mock.Mock(spec=Executor)
+    client = Client(
+        host="jmap-example.localhost",
+        auth=("ness", "pk_fire"),
+        decode_executor=executor,
+    )
+    assert client.request(CoreEcho(data=echo_test_data)) == CoreEchoResponse(
+        data=echo_test_data
+    )
+    executor.submit.assert_not_called()
+
+
+def test_client_decode_executor_parts() -> None:
+    mailboxes = [dict(id=f"MBX{i}", name=f"Mailbox {i}") for i in range(10)]
+    body = json.dumps(
+        {
+            "methodResponses": [
+                [
+                    "Mailbox/get",
+                    {
+                        "accountId": "u1138",
+                        "list": mailboxes,
+                        "notFound": [],
+                        "state": "2187",
+                    },
+                    "0.Mailbox/get",
+                ],
+                [
+                    "Mailbox/get",
+                    {
+                        "accountId": "u1138",
+                        "list": None,
+                        "notFound": None,
+                        "state": "2187",
+                    },
+                    "1.Mailbox/get",
+                ],
+                [
+                    "Mailbox/get",
+                    {
+                        "accountId": "u1138",
+                        "list": [{"id": "MBX1", "name": "Ŝaturn"}],
+                        "notFound": ["MBX2"],
+                        "state": "2187",
+                    },
+                    "2.Mailbox/get",
+                ],
+            ],
+            "sessionState": "42",
+        },
+        ensure_ascii=False,
+    ).encode()
+    with ThreadPoolExecutor(2) as executor:
+        client = Client(
+            host="jmap-example.localhost",
+            decode_executor=executor,
+            offload_min_bytes=0,
+            offload_chunks=3,
+        )
+        with mock.patch.object(
+            executor, "submit", wraps=executor.submit
+        ) as submit, pytest.warns(
+            RuntimeWarning, match="non-optional type data"
+        ):
+            result = client._parse_method_responses_offloaded(body, {})
+    # The body is split in the executor, and each part is only sent its share
+    # of a list of models. Lists with fewer items than parts are not sent
+    # empty parts.
+    assert submit.call_args_list[0].args[1] == body
+    assert [json.loads(c.args[2]) for c in submit.call_args_list[1:]] == [
+        mailboxes[:3],
+        mailboxes[3:6],
+        mailboxes[6:],
+        [{"id": "MBX1", "name": "Ŝaturn"}],
+    ]
+    assert result == [
+        InvocationResponseOrError(
+            id="0.Mailbox/get",
+            response=MailboxGetResponse(
+                account_id="u1138",
+                state="2187",
+                not_found=[],
+                data=[Mailbox.from_dict(m) for m in mailboxes],
+            ),
+        ),
+        InvocationResponseOrError(
+            id="1.Mailbox/get",
+            response=MailboxGetResponse(
+                account_id="u1138",
+                state="2187",
+                not_found=None,
+                data=cast(List[Mailbox], None),
+            ),
+        ),
+        InvocationResponseOrError(
+            id="2.Mailbox/get",
+            response=MailboxGetResponse(
+                account_id="u1138",
+                state="2187",
+                not_found=["MBX2"],
+                data=[Mailbox(id="MBX1", name="Ŝaturn")],
+            ),
+        ),
+    ]
+
+
+def test_client_decode_executor_custom_json_backend() -> None:
+    backend = JSONBackend(
+        dumps=lambda data: json.dumps(data).encode(),
+        loads=lambda data: json.loads(data),
+    )
+    mailboxes = [dict(id=f"MBX{i}", name=f"Mailbox {i}") for i in range(10)]
+    body = json.dumps(
+        {
+            "methodResponses": [
+                [
+                    "Mailbox/get",
+                    {
+                        "accountId": "u1138",
+                        "list": mailboxes,
+                        "notFound": [],
+                        "state": "1",
+                    },
+                    "0.Mailbox/get",
+                ]
+            ]
+        }
+    ).encode()
+    # Nothing from the client's JSON backend is sent to worker processes
+    with ProcessPoolExecutor(1) as executor:
+        client = Client(
+            host="jmap-example.localhost",
+            json_backend=backend,
+            decode_executor=executor,
+            offload_min_bytes=0,
+            offload_chunks=2,
+        )
+        result = client._parse_method_responses_offloaded(body, {})
+    assert result == [
+        InvocationResponseOrError(
+            id="0.Mailbox/get",
+            response=MailboxGetResponse(
+                account_id="u1138",
+                state="1",
+                not_found=[],
+                data=[Mailbox.from_dict(m) for m in mailboxes],
+            ),
+        )
+    ]
+
+
+@pytest.mark.parametrize("offload", [True, False])
+def test_client_request_intern_values(
+    http_responses: responses.RequestsMock, offload: bool
+) -> None:
+    emails = [
+        {
+            "id": f"f{i}",
+            "threadId": "T1",
+            "mailboxIds": {"MBX1": True},
+            "from": [{"name": "Paula", "email": "paula@twoson.example.net"}],
+        }
+        for i in range(2)
+    ]
+    expect_jmap_call(
+        http_responses,
+        {
+            "methodCalls": [
+                [
+                    "Email/get",
+                    {"accountId": "u1138", "ids": ["f0", "f1"]},
+                    "single.Email/get",
+                ]
+            ],
+            "using": [
+                "urn:ietf:params:jmap:core",
+                "urn:ietf:params:jmap:mail",
+            ],
+        },
+        {
+            "methodResponses": [
+                [
+                    "Email/get",
+                    {
+                        "accountId": "u1138",
+                        "list": emails,
+                        "notFound": [],
+                        "state": "2187",
+                    },
+                    "single.Email/get",
+                ]
+            ]
+        },
+    )
+    with ThreadPoolExecutor(1) as executor:
+        client = Client(
+            host="jmap-example.localhost",
+            auth=("ness", "pk_fire"),
+            decode_executor=executor if offload else None,
+            offload_min_bytes=0,
+            offload_chunks=2,
+            intern_values=True,
+        )
+        resp = client.request(EmailGet(ids=["f0", "f1"]))
+    assert isinstance(resp, EmailGetResponse)
+    first, second = resp.data
+    assert first.mail_from and second.mail_from
+    assert dataclasses.replace(
+        first, mail_from=[a.thaw() for a in first.mail_from]
+    ) == Email.from_dict(emails[0])
+    assert first.mail_from[0] is second.mail_from[0]
+    assert first.thread_id is second.thread_id
+    assert first.mailbox_ids and second.mailbox_ids
+    assert list(first.mailbox_ids)[0] is list(second.mailbox_ids)[0]
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_client_request_spool_body_values(
+    http_responses: responses.RequestsMock, stream: bool
+) -> None:
+    body_values = {
+        str(i): {
+            "value": value,
+            "isEncodingProblem": False,
+            "isTruncated": False,
+        }
+        for i, value in enumerate(("Pokey", "Ness " * 100), 1)
+    }
+    expect_jmap_call(
+        http_responses,
+        {
+            "methodCalls": [
+                [
+                    "Email/get",
+                    {
+                        "accountId": "u1138",
+                        "ids": ["f1"],
+                        "fetchAllBodyValues": True,
+                    },
+                    "single.Email/get",
+                ]
+            ],
+            "using": [
+                "urn:ietf:params:jmap:core",
+                "urn:ietf:params:jmap:mail",
+            ],
+        },
+        {
+            "methodResponses": [
+                [
+                    "Email/get",
+                    {
+                        "accountId": "u1138",
+                        "list": [{"id": "f1", "bodyValues": body_values}],
+                        "notFound": [],
+                        "state": "2187",
+                    },
+                    "single.Email/get",
+                ]
+            ]
+        },
+    )
+    executor = mock.MagicMock(spec=Executor)
+    client = Client(
+        host="jmap-example.localhost",
+        auth=("ness", "pk_fire"),
+        decode_executor=executor,
+        offload_min_bytes=0,
+        spool_min_bytes=100,
+    )
+    method = EmailGet(ids=["f1"], fetch_all_body_values=True)
+    if stream:
+        (result,) = client.request_stream(method)
+        resp = result.response
+    else:
+        resp = client.request(method)
+    assert isinstance(resp, EmailGetResponse)
+    executor.submit.assert_not_called()
+    email_body_values = resp.data[0].body_values
+    assert email_body_values
+    assert email_body_values["1"].value == "Pokey"
+    assert email_body_values["1"].spooled_value is None
+    assert email_body_values["2"].value is None
+    assert isinstance(email_body_values["2"].spooled_value, SpooledText)
+    assert email_body_values["2"].read() == "Ness " * 100
+
+
+def test_client_shared_between_threads(
+    client: Client, http_responses: responses.RequestsMock
+) -> None:
+    method = MailboxGet(ids=["MBX1"])
+    expect_jmap_call(
+        http_responses,
+        {
+            "methodCalls": [
+                [
+                    "Mailbox/get",
+                    {"accountId": "u1138", "ids": ["MBX1"]},
+                    "single.Mailbox/get",
+                ]
+            ],
+            "using": [
+                "urn:ietf:params:jmap:core",
+                "urn:ietf:params:jmap:mail",
+            ],
+        },
+        {
+            "methodResponses": [
+                [
+                    "Mailbox/get",
+                    {
+                        "accountId": "u1138",
+                        "list": [{"id": "MBX1", "name": "Onett"}],
+                        "not_found": [],
+                        "state": "2187",
+                    },
+                    "single.Mailbox/get",
+                ]
+            ]
+        },
+    )
+    threads = 16
+    barrier = threading.Barrier(threads)
+
+    def _request(_: int) -> Mailbox:
+        barrier.wait()
+        response = client.request(method)
+        assert isinstance(response, MailboxGetResponse)
+        return response.data[0]
+
+    with ThreadPoolExecutor(threads) as executor:
+        results = list(executor.map(_request, range(threads)))
+    assert results == [Mailbox(id="MBX1", name="Onett")] * threads
+    # The session is fetched once, and the shared method is not modified
+    assert [c.request.method for c in http_responses.calls].count("GET") == 1
+    assert method == MailboxGet(ids=["MBX1"])
+    assert method.account_id is None
+
+
+def test_client_max_connections() -> None:
+    client = Client("jmap-example.localhost", max_connections=128)
+    adapter = client.requests_session.get_adapter(
+        "https://jmap-example.localhost/"
+    )
+    assert isinstance(adapter, requests.adapters.HTTPAdapter)
+    assert adapter.poolmanager.connection_pool_kw["maxsize"] == 128
+    assert client.requests_session is client.requests_session
+
+
+def echo_callback(
+    sent: List[Dict[str, Any]]
+) -> Callable[[requests.PreparedRequest], Tuple[int, Dict[str, str], str]]:
+    def _callback(
+        request: requests.PreparedRequest,
+    ) -> Tuple[int, Dict[str, str], str]:
+        data = json.loads(request.body or "{}")
+        sent.append(data)
+        return (
+            200,
+            {},
+            json.dumps(
+                {
+                    "methodResponses": [
+                        [name, arguments, method_id]
+                        if name == "Core/echo"
+                        else [
+                            name,
+                            {
+                                "accountId": "u1138",
+                                "list": [],
+                                "notFound": [],
+                                "state": "2187",
+                            },
+                            method_id,
+                        ]
+                        for name, arguments, method_id in data["methodCalls"]
+                    ]
+                }
+            ),
+        )
+
+    return _callback
+
+
+@pytest.mark.parametrize(
+    ["calls", "expected_request_sizes"],
+    [
+        ([CoreEcho(data={})] * 40, [16, 16, 8]),
+        (
+            [CoreEcho(data={})] * 16
+            + [MailboxGet(ids=Ref("/ids"))]
+            + [CoreEcho(data={})] * 3,
+            [15, 5],
+        ),
+        (
+            [CoreEcho(data={})] * 16
+            + [MailboxGet(ids=Ref("/ids", method=0))]
+            + [CoreEcho(data={})] * 3,
+            [17, 3],
+        ),
+        (
+            [CoreEcho(data={})] * 16
+            + [CoreEcho(data={"emailIds": ["#draft"]})]
+            + [CoreEcho(data={})] * 3,
+            [17, 3],
+        ),
+    ],
+)
+@pytest.mark.parametrize("raw", [True, False])
+def test_client_request_split(
+    client: Client,
+    http_responses: responses.RequestsMock,
+    calls: List[Method],
+    expected_request_sizes: List[int],
+    raw: bool,
+) -> None:
+    sent: List[Dict[str, Any]] = []
+    http_responses.add_callback(
+        method=responses.POST,
+        url="https://jmap-api.localhost/api",
+        callback=echo_callback(sent),
+    )
+    expected_ids = [f"{i}.{c.jmap_method_name}" for i, c in enumerate(calls)]
+    if raw:
+        raw_results = client.request(calls, raw=True)
+        assert [r.id for r in raw_results] == expected_ids
+    else:
+        results = client.request(calls)
+        assert [r.id for r in results] == expected_ids
+        assert not any(isinstance(r.response, errors.Error) for r in results)
+    assert [len(r["methodCalls"]) for r in sent] == expected_request_sizes
+    assert [c[2] for r in sent for c in r["methodCalls"]] == expected_ids
+    assert all(r["using"] == sent[0]["using"] for r in sent)
+
+
+def test_client_request_stream_split(
+    client: Client, http_responses: responses.RequestsMock
+) -> None:
+    sent: List[Dict[str, Any]] = []
+    http_responses.add_callback(
+        method=responses.POST,
+        url="https://jmap-api.localhost/api",
+        callback=echo_callback(sent),
+    )
+    calls = [CoreEcho(data={"i": i}) for i in range(20)]
+    results = list(client.request_stream(calls))
+    assert [r.response for r in results] == [
+        CoreEchoResponse(data={"i": i}) for i in range(20)
+    ]
+    assert [len(r["methodCalls"]) for r in sent] == [16, 4]
+
+
+def mailbox_get_callback(
+    sent: List[Dict[str, Any]]
+) -> Callable[[requests.PreparedRequest], Tuple[int, Dict[str, str], str]]:
+    lock = threading.Lock()
+
+    def _callback(
+        request: requests.PreparedRequest,
+    ) -> Tuple[int, Dict[str, str], str]:
+        data = json.loads(request.body or "{}")
+        with lock:
+            sent.append(data)
+        method_responses = []
+        for name, arguments, method_id in data["methodCalls"]:
+            ids = arguments.get("ids") or []
+            if "MBX0" in ids:
+                method_responses.append(
+                    ["error", {"type": "serverFail"}, method_id]
+                )
+                continue
+            method_responses.append(
+                [
+                    name,
+                    {
+                        "accountId": "u1138",
+                        "list": [
+                            {"id": i, "name": f"Box {i}"}
+                            for i in ids
+                            if i.startswith("MBX")
+                        ],
+                        "notFound": [i for i in ids if i.startswith("X")],
+                        "state": "2187",
+                    },
+                    method_id,
+                ]
+            )
+        return 200, {}, json.dumps({"methodResponses": method_responses})
+
+    return _callback
+
+
+@pytest.mark.parametrize("lazy_decode", [True, False])
+@pytest.mark.parametrize("raw", [True, False])
+def test_client_request_get_chunks(
+    http_responses: responses.RequestsMock, lazy_decode: bool, raw: bool
+) -> None:
+    client = Client(
+        host="jmap-example.localhost",
+        auth=("ness", "pk_fire"),
+        lazy_decode=lazy_decode,
+    )
+    sent: List[Dict[str, Any]] = []
+    http_responses.add_callback(
+        method=responses.POST,
+        url="https://jmap-api.localhost/api",
+        callback=mailbox_get_callback(sent),
+    )
+    ids = [f"MBX{i}" for i in range(1, 1200)] + ["X1", "X2"]
+    calls = [
+        CoreEcho(data={}),
+        MailboxGet(ids=ids),
+        MailboxGet(ids=["MBX1", "X3"]),
+    ]
+    expected_ids = ["0.Core/echo", "1.Mailbox/get", "2.Mailbox/get"]
+    if raw:
+        raw_results = client.request(calls, raw=True)
+        assert [r.id for r in raw_results] == expected_ids
+        assert [m["id"] for m in raw_results[1]["list"]] == ids[:-2]
+        assert raw_results[1]["notFound"] == ["X1", "X2"]
+        assert raw_results[1]["state"] == "2187"
+    else:
+        results = client.request(calls)
+        assert [r.id for r in results] == expected_ids
+        response = results[1].response
+        assert isinstance(response, MailboxGetResponse)
+        assert isinstance(response.data, LazyList) == lazy_decode
+        assert [m.id for m in response.data] == ids[:-2]
+        assert response.not_found == ["X1", "X2"]
+        assert response.state == "2187"
+        assert results[2].response == MailboxGetResponse(
+            account_id="u1138",
+            state="2187",
+            not_found=["X3"],
+            data=[Mailbox(id="MBX1", name="Box MBX1")],
+        )
+    # The Get call is sent in chunks of maxObjectsInGet ids between the
+    # other calls
+    assert [c[0] for c in sent[0]["methodCalls"]] == ["Core/echo"]
+    chunks = sorted(
+        (r["methodCalls"][0][1]["ids"] for r in sent[1:4]),
+        key=lambda chunk: ids.index(chunk[0]),
+    )
+    assert [len(chunk) for chunk in chunks] == [500, 500, 201]
+    assert [i for chunk in chunks for i in chunk] == ids
+    assert all(r["methodCalls"][0][2] == "1.Mailbox/get" for r in sent[1:4])
+    assert sent[4]["methodCalls"][0][1]["ids"] == ["MBX1", "X3"]
+    assert len(sent) == 5
+
+
+@pytest.mark.parametrize(
+    ["states", "expected_requests"],
+    [
+        (["1", "2", "2", "3", "3", "3"], 6),
+        (["1", "2", "2", "2", "3", "3", "3", "3", "4"], None),
+    ],
+)
+@pytest.mark.parametrize("raw", [True, False])
+def test_client_request_get_chunks_state_changed(
+    client: Client,
+    http_responses: responses.RequestsMock,
+    states: List[str],
+    expected_requests: Optional[int],
+    raw: bool,
+) -> None:
+    sent: List[Dict[str, Any]] = []
+    callback = mailbox_get_callback(sent)
+    lock = threading.Lock()
+
+    def _callback(
+        request: requests.PreparedRequest,
+    ) -> Tuple[int, Dict[str, str], str]:
+        with lock:
+            state = states[len(sent)]
+            status, headers, body = callback(request)
+        data = json.loads(body)
+        data["methodResponses"][0][1]["state"] = state
+        return status, headers, json.dumps(data)
+
+    http_responses.add_callback(
+        method=responses.POST,
+        url="https://jmap-api.localhost/api",
+        callback=_callback,
+    )
+    ids = [f"MBX{i}" for i in range(1, 1200)]
+    if expected_requests is None:
+        # Chunks are fetched up to three times for a consistent state
+        with pytest.raises(RuntimeError, match="State changed"):
+            if raw:
+                client.request(MailboxGet(ids=ids), raw=True)
+            else:
+                client.request(MailboxGet(ids=ids))
+        assert len(sent) == 9
+        return
+    if raw:
+        raw_result = client.request(MailboxGet(ids=ids), raw=True)
+        assert isinstance(raw_result, RawResponse)
+        assert raw_result["state"] == "3"
+        assert len(raw_result["list"]) == len(ids)
+    else:
+        result = client.request(MailboxGet(ids=ids))
+        assert isinstance(result, MailboxGetResponse)
+        assert result.state == "3"
+        assert len(result.data) == len(ids)
+    assert len(sent) == expected_requests
+
+
+def test_client_request_get_chunks_error(
+    client: Client, http_responses: responses.RequestsMock
+) -> None:
+    http_responses.add_callback(
+        method=responses.POST,
+        url="https://jmap-api.localhost/api",
+        callback=mailbox_get_callback([]),
+    )
+    ids = [f"MBX{i}" for i in range(1000)]
+    assert client.request(MailboxGet(ids=ids)) == errors.ServerFail()
+    raw_result = client.request(MailboxGet(ids=ids), raw=True)
+    assert isinstance(raw_result, RawResponse)
+    assert raw_result.error_type == "serverFail"
+
+
+def test_client_request_get_chunks_referenced(
+    client: Client, http_responses: responses.RequestsMock
+) -> None:
+    sent: List[Dict[str, Any]] = []
+    http_responses.add_callback(
+        method=responses.POST,
+        url="https://jmap-api.localhost/api",
+        callback=mailbox_get_callback(sent),
+    )
+    ids = [f"MBX{i}" for i in range(1, 1000)]
+    results = client.request(
+        [MailboxGet(ids=ids), MailboxGet(ids=Ref("/list/*/id"))]
+    )
+    assert len(results) == 2
+    # Calls referencing a Get call are sent with all its ids
+    assert len(sent) == 1
+    assert sent[0]["methodCalls"][0][1]["ids"] == ids
@@ -0,0 +1,143 @@
+import sys
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+
+import pytest
+
+from jmapc import Email, EmailAddress, errors
+from jmapc.columns import (
+    NULL_SIZE,
+    NULL_TIMESTAMP,
+    DictionaryColumn,
+    EmailColumns,
+    EmailResponse,
+    StringColumn,
+)
+from jmapc.methods import (
+    EmailGetResponse,
+    InvocationResponseOrError,
+    RawResponse,
+)
+
+emails: List[Dict[str, Any]] = [
+    {
+        "id": "M1001",
+        "threadId": "T1",
+        "receivedAt": "1994-08-24T12:01:02Z",
+        "size": 2048,
+        "keywords": {"$seen": True},
+        "from": [{"name": "Paula", "email": "paula@twoson.example.net"}],
+    },
+    {
+        "id": "M1002",
+        "threadId": "T1",
+        "receivedAt": "1994-08-24T13:02:03Z",
+        "size": 1024,
+        "keywords": {"$flagged": True, "$seen": True},
+        "from": [{"name": "Ness", "email": "ness@onett.example.net"}],
+    },
+    {"id": "M1003"},
+    {
+        "id": "M1004",
+        "threadId": "T2",
+        "from": [{"name": "Paula", "email": "paula@twoson.example.net"}],
+    },
+]
+
+
+def test_string_column() -> None:
+    column = StringColumn()
+    for value in ("Onett", None, "Twoson ☃"):
+        column.append(value)
+    assert len(column) == 3
+    assert list(column) == ["Onett", "", "Twoson ☃"]
+    assert column[2] == column[-1] == "Twoson ☃"
+    with pytest.raises(IndexError):
+        column[3]
+
+
+@pytest.mark.parametrize("numpy", [True, False])
+def test_dictionary_column(
+    monkeypatch: pytest.MonkeyPatch, numpy: bool
+) -> None:
+    if numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setitem(sys.modules, "numpy", None)
+    column: DictionaryColumn[str] = DictionaryColumn()
+    for value in ("Onett", None, "Twoson", "Onett"):
+        column.append(value)
+    assert column.dictionary == ["Onett", "Twoson"]
+    assert list(column.codes) == [0, -1, 1, 0]
+    assert list(column) == ["Onett", None, "Twoson", "Onett"]
+    assert column[1] is None
+    assert column.code("Twoson") == 1
+    assert column.code("Threed") == -1
+    assert len(column.dictionary) == 2
+    assert column.mask(lambda v: v.startswith("O")) == bytearray([1, 0, 0, 1])
+
+
+@pytest.mark.parametrize("decoded", [True, False])
+def test_email_columns(decoded: bool) -> None:
+    response = EmailGetResponse.from_dict(
+        {"accountId": "u1138", "list": emails, "notFound": [], "state": "1"}
+    )
+    responses: List[EmailResponse] = [
+        InvocationResponseOrError(id="0.Email/get", response=response)
+        if decoded
+        else RawResponse(
+            id="0.Email/get", method_name="Email/get", data={"list": emails}
+        ),
+        InvocationResponseOrError(
+            id="1.Email/get", response=errors.ServerFail()
+        ),
+        RawResponse(id="2.Core/echo", method_name="Core/echo", data={}),
+    ]
+    columns = EmailColumns.from_responses(responses)
+    assert len(columns) == 4
+    assert list(columns.ids) == ["M1001", "M1002", "M1003", "M1004"]
+    assert columns.thread_ids.dictionary == ["T1", "T2"]
+    assert list(columns.thread_ids.codes) == [0, 0, -1, 1]
+    assert list(columns.sizes) == [2048, 1024, NULL_SIZE, NULL_SIZE]
+    assert list(columns.received_at) == [
+        777729662000000,
+        777733323000000,
+        NULL_TIMESTAMP,
+        NULL_TIMESTAMP,
+    ]
+    assert columns.has_keyword("$seen") == bytearray([1, 1, 0, 0])
+    assert columns.has_keyword("$flagged") == bytearray([0, 1, 0, 0])
+    assert columns.has_keyword("$draft") == bytearray(4)
+    assert columns.from_email("paula@twoson.example.net") == bytearray(
+        [1, 0, 0, 1]
+    )
+    assert len(columns.mail_from.dictionary) == 2
+    assert columns.email(1) == Email(
+        id="M1002",
+        thread_id="T1",
+        received_at=datetime(1994, 8, 24, 13, 2, 3, tzinfo=timezone.utc),
+        size=1024,
+        keywords={"$seen": True, "$flagged": True},
+        mail_from=[EmailAddress(name="Ness", email="ness@onett.example.net")],
+    )
+    assert columns.email(-2) == Email(id="M1003", keywords={})
+    columns.append(Email(id="M1005", received_at=datetime(1994, 8, 24)))
+    assert columns.received_at[-1] == 777686400000000
+    assert columns.has_keyword("$seen")[-1] == 0
+
+
+def test_email_columns_numpy() -> None:
+    numpy = pytest.importorskip("numpy")
+    columns = EmailColumns()
+    columns.extend(emails)
+    arrays = columns.to_numpy()
+    assert list(arrays["id"]) == ["M1001", "M1002", "M1003", "M1004"]
+    assert arrays["size"].sum() == 2048 + 1024 + 2 * NULL_SIZE
+    assert numpy.isnat(arrays["receivedAt"]).tolist() == [
+        False,
+        False,
+        True,
+        True,
+    ]
+    assert arrays["keywords/$seen"].tolist() == [True, True, False, False]
+    assert arrays["threadId"].tolist() == [0, 0, -1, 1]
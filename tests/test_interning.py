@@ -0,0 +1,134 @@
+import dataclasses
+import sys
+from typing import List, cast
+
+import pytest
+
+from jmapc import Email, EmailAddress, EmailBodyPart, Mailbox, Thread
+from jmapc.interning import Interner
+from jmapc.methods import EmailGetResponse
+from jmapc.serializer import LazyList
+
+
+def new_str(value: str) -> str:
+    # Build an equal string that is not the same object
+    return "".join(list(value))
+
+
+def test_interner_address() -> None:
+    interner = Interner(max_addresses=2)
+    ness = EmailAddress(name="Ness", email="ness@onett.example.net")
+    shared = interner.address(ness)
+    assert shared == ness.freeze()
+    assert (
+        interner.address(EmailAddress(name=new_str("Ness"), email=ness.email))
+        is shared
+    )
+    # Shared addresses cannot be modified for one of the emails using them
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        shared.name = "Pokey"
+    assert isinstance(shared, EmailAddress)
+    paula = interner.address(EmailAddress(email="paula@twoson.example.net"))
+    assert len(interner) == 2
+    # Ness was used most recently, so the oldest entry is Paula
+    interner.address(ness)
+    interner.address(EmailAddress(email="jeff@winters.example.net"))
+    assert len(interner) == 2
+    assert interner.address(ness) is shared
+    assert (
+        interner.address(EmailAddress(email="paula@twoson.example.net"))
+        is not paula
+    )
+    interner.clear()
+    assert len(interner) == 0
+
+
+def test_interner_address_disabled() -> None:
+    interner = Interner(max_addresses=0)
+    ness = EmailAddress(name="Ness")
+    assert interner.address(ness) is ness
+    assert interner.address(EmailAddress(name="Ness")) is not ness
+    assert len(interner) == 0
+
+
+def test_interner_email() -> None:
+    def email() -> Email:
+        return Email(
+            thread_id=new_str("T1"),
+            mailbox_ids={new_str("MBX1"): True},
+            keywords={new_str("$seen"): True},
+            to=[EmailAddress(name="Ness", email=new_str("ness@onett"))],
+            body_structure=EmailBodyPart(
+                type=new_str("multipart/mixed"),
+                sub_parts=[
+                    EmailBodyPart(
+                        type=new_str("text/plain"),
+                        charset=new_str("utf-8"),
+                    )
+                ],
+            ),
+            text_body=[EmailBodyPart(type=new_str("text/plain"))],
+        )
+
+    interner = Interner()
+    first, second = email(), email()
+    assert first == second
+    interner.intern_model(first)
+    interner.intern_model(second)
+    assert first == second
+    assert first.to and second.to
+    assert first.to == [a.freeze() for a in email().to or []]
+    assert first.thread_id is second.thread_id
+    assert first.mailbox_ids and second.mailbox_ids
+    assert list(first.mailbox_ids)[0] is list(second.mailbox_ids)[0]
+    assert first.keywords and second.keywords
+    assert list(first.keywords)[0] is list(second.keywords)[0]
+    assert first.to[0] is second.to[0]
+    assert first.body_structure and second.body_structure
+    assert first.body_structure.sub_parts and second.body_structure.sub_parts
+    assert (
+        first.body_structure.sub_parts[0].charset
+        is second.body_structure.sub_parts[0].charset
+    )
+    assert first.text_body and second.text_body
+    assert (
+        first.text_body[0].type
+        is second.text_body[0].type
+        is first.body_structure.sub_parts[0].type
+    )
+
+
+def test_interner_thread_and_mailbox() -> None:
+    interner = Interner()
+    thread = Thread(id=new_str("T1"), email_ids=[new_str("f1")])
+    mailbox = Mailbox(
+        id=new_str("MBX1"), role=new_str("inbox"), parent_id=None
+    )
+    interner.intern_model(thread)
+    interner.intern_model(mailbox)
+    assert thread.id is sys.intern("T1")
+    assert thread.email_ids[0] is sys.intern("f1")
+    assert mailbox.id is sys.intern("MBX1")
+    assert mailbox.role is sys.intern("inbox")
+
+
+def test_interner_lazy_response() -> None:
+    interner = Interner()
+    raw = [{"id": f"f{i}", "from": [{"name": "Ness"}]} for i in range(3)]
+    data: LazyList[Email] = LazyList(raw, Email.from_dict)
+    first = data[0]
+    interner.intern_response(
+        EmailGetResponse(
+            account_id="u1138",
+            state="2187",
+            not_found=[],
+            data=cast(List[Email], data),
+        )
+    )
+    # Models are interned as they are decoded
+    assert data.decoded_count == 1
+    assert data[0] is first
+    assert len(interner) == 1
+    assert first.mail_from and data[2].mail_from
+    assert first.mail_from[0] is data[2].mail_from[0]
+    assert data.decoded_count == 2
@@ -0,0 +1,226 @@
+import asyncio
+import json
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+import pytest
+import responses
+
+from jmapc import Client
+from jmapc.json import (
+    JSONBackend,
+    aiter_array_items,
+    iter_array_items,
+    orjson_backend,
+    split_method_responses,
+    stdlib_json_backend,
+)
+from jmapc.methods import CoreEcho, CoreEchoResponse
+
+from .utils import expect_jmap_call
+
+
+def test_default_json_backend() -> None:
+    client = Client(host="jmap-example.localhost")
+    assert client._json is stdlib_json_backend
+
+
+def test_orjson_backend() -> None:
+    pytest.importorskip("orjson")
+    backend = orjson_backend()
+    data = {"methodResponses": [["Core/echo", {"who": "Poo"}, "0"]]}
+    assert backend.loads(backend.dumps(data)) == data
+    # orjson rejects some data that the json module accepts
+    for value in ({1: "Onett"}, {"size": 2**64}):
+        stdlib_json_backend.dumps(value)
+        with pytest.raises(TypeError):
+            backend.dumps(value)
+
+
+@pytest.mark.parametrize("json_backend", [stdlib_json_backend, None])
+def test_client_json_backend(
+    http_responses: responses.RequestsMock, json_backend: JSONBackend
+) -> None:
+    calls: List[str] = []
+
+    def _dumps(data: Any) -> bytes:
+        calls.append("dumps")
+        return stdlib_json_backend.dumps(data)
+
+    def _loads(data: Any) -> Any:
+        assert isinstance(data, bytes)
+        calls.append("loads")
+        return stdlib_json_backend.loads(data)
+
+    client = Client(
+        host="jmap-example.localhost",
+        auth=("ness", "pk_fire"),
+        json_backend=json_backend or JSONBackend(dumps=_dumps, loads=_loads),
+    )
+    test_data = dict(who="Paula")
+    expect_jmap_call(
+        http_responses,
+        {
+            "methodCalls": [["Core/echo", test_data, "single.Core/echo"]],
+            "using": ["urn:ietf:params:jmap:core"],
+        },
+        {"methodResponses": [["Core/echo", test_data, "single.Core/echo"]]},
+    )
+    assert client.request(CoreEcho(data=test_data)) == CoreEchoResponse(
+        data=test_data
+    )
+    if not json_backend:
+        assert calls == ["loads", "dumps", "loads"]
+
+
+def test_stdlib_json_backend() -> None:
+    data = {"methodResponses": [["Core/echo", {"who": "Poo"}, "0"]]}
+    encoded = stdlib_json_backend.dumps(data)
+    assert encoded == json.dumps(data).encode()
+    assert stdlib_json_backend.loads(encoded) == data
+
+
+def _chunks(data: bytes, size: int) -> List[bytes]:
+    return [data[i:][:size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 4096])
+@pytest.mark.parametrize(
+    "data",
+    [
+        {
+            "methodResponses": [
+                ["Core/echo", {"who": "Pokey 🐝", "level": 12345}, "0"],
+                ["error", {"type": "serverFail"}, "1"],
+            ],
+            "sessionState": "2187",
+        },
+        {
+            "sessionState": "2187",
+            "other": [1, {"methodResponses": "]"}],
+            "methodResponses": [],
+        },
+        {"methodResponses": [1, 2.5e10, -3, "s", None, True, [], {}]},
+        {"sessionState": "2187"},
+        {},
+    ],
+)
+@pytest.mark.parametrize("indent", [None, 2])
+def test_iter_array_items(
+    data: Dict[str, Any], chunk_size: int, indent: Optional[int]
+) -> None:
+    encoded = json.dumps(data, indent=indent, ensure_ascii=False).encode()
+    items = iter_array_items(_chunks(encoded, chunk_size), "methodResponses")
+    assert list(items) == data.get("methodResponses", [])
+
+
+def test_aiter_array_items() -> None:
+    data = {"methodResponses": [[i, "☃"] for i in range(100)]}
+    chunks = _chunks(json.dumps(data, ensure_ascii=False).encode(), 3)
+
+    async def _receive() -> AsyncIterator[bytes]:
+        for chunk in chunks:
+            yield chunk
+
+    async def _test() -> List[Any]:
+        return [
+            item
+            async for item in aiter_array_items(_receive(), "methodResponses")
+        ]
+
+    assert asyncio.run(_test()) == data["methodResponses"]
+
+
+def test_iter_array_items_incremental() -> None:
+    data = {"methodResponses": [[i] for i in range(100)]}
+    chunks = _chunks(json.dumps(data).encode(), 4)
+    received: List[bytes] = []
+
+    def _receive() -> Iterator[bytes]:
+        for chunk in chunks:
+            received.append(chunk)
+            yield chunk
+
+    items = iter_array_items(_receive(), "methodResponses")
+    assert next(items) == [0]
+    assert len(received) < len(chunks) / 5
+    assert list(items) == data["methodResponses"][1:]
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b"",
+        b"[1]",
+        b'{"methodResponses": [1, 2',
+        b'{"methodResponses": [1 2]}',
+        b'{"methodResponses": [12',
+        b'{"methodResponses": [tru',
+        b'{"methodResponses": {}}',
+        b'{"methodResponses" 1}',
+        b'{"methodResponses": [1], "sessionState"',
+    ],
+)
+@pytest.mark.parametrize("chunk_size", [1, 4096])
+def test_iter_array_items_invalid(data: bytes, chunk_size: int) -> None:
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_array_items(_chunks(data, chunk_size), "methodResponses"))
+
+
+@pytest.mark.parametrize("parts", [1, 2, 3, 5])
+@pytest.mark.parametrize("indent", [None, 2])
+def test_split_method_responses(parts: int, indent: Optional[int]) -> None:
+    data = {
+        "sessionState": "2187",
+        "methodResponses": [
+            [
+                "Email/get",
+                {
+                    "list": [{"id": "M1", "subject": "Pokey 🐝 [,]"}, {}, 3],
+                    "notFound": ["M2"],
+                },
+                "0",
+            ],
+            ["Email/get", {"list": None, "notFound": []}, "1"],
+            ["Email/get", {"list": [], "notFound": []}, "2"],
+            ["Core/echo", {"list": ["Buzz Buzz"]}, "3"],
+        ],
+    }
+    body = json.dumps(data, indent=indent, ensure_ascii=False).encode()
+    method_responses, splits = split_method_responses(
+        body, lambda name: ["list"] if name == "Email/get" else [], parts
+    )
+    assert method_responses == [
+        ["Email/get", {"list": [], "notFound": ["M2"]}, "0"],
+        ["Email/get", {"list": None, "notFound": []}, "1"],
+        ["Email/get", {"list": [], "notFound": []}, "2"],
+        ["Core/echo", {"list": ["Buzz Buzz"]}, "3"],
+    ]
+    assert [(index, key) for index, key, _ in splits] == [
+        (0, "list"),
+        (2, "list"),
+    ]
+    shares = [json.loads(b"[" + body[a:b] + b"]") for a, b in splits[0][2]]
+    assert len(shares) == min(parts, 3)
+    assert [item for share in shares for item in share] == [
+        {"id": "M1", "subject": "Pokey 🐝 [,]"},
+        {},
+        3,
+    ]
+    assert splits[1][2] == []
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b"",
+        b"[1]",
+        b'{"methodResponses": [["Email/get", {"list": [1, 2',
+        b'{"methodResponses": [["Email/get", {"list": [1 2]}, "0"]]}',
+        b'{"methodResponses": [["Email/get", {1: 2}, "0"]]}',
+        b'{"methodResponses": [["Email/get", {}]]}',
+        b'{"methodResponses": []} []',
+    ],
+)
+def test_split_method_responses_invalid(data: bytes) -> None:
+    with pytest.raises(json.JSONDecodeError):
+        split_method_responses(data, lambda name: ["list"], 2)
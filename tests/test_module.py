@@ -1,3 +1,9 @@
+import subprocess
+import sys
+
+import pytest
+
+
 def test_import() -> None:
     import jmapc
 
@@ -5,3 +11,26 @@ def test_import() -> None:
     assert jmapc.methods
     assert jmapc.models
     assert jmapc.errors
+
+
+def test_import_lazy() -> None:
+    # Run in a new interpreter as other tests have already imported jmapc
+    code = (
+        "import sys, jmapc; "
+        "assert 'jmapc.client' not in sys.modules; "
+        "assert 'requests' not in sys.modules; "
+        "from jmapc import Email; "
+        "assert 'jmapc.client' not in sys.modules; "
+        "assert jmapc.Client is sys.modules['jmapc.client'].Client"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_import_missing() -> None:
+    import jmapc
+
+    assert set(jmapc.__all__) <= set(dir(jmapc))
+    with pytest.raises(AttributeError):
+        jmapc.NotAName
+    with pytest.raises(ImportError):
+        from jmapc import NotAName  # noqa: F401
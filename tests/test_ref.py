@@ -2,6 +2,7 @@ import pytest
 
 from jmapc import Ref, ResultReference
 from jmapc.methods import Invocation, MailboxGet, MailboxQuery
+from jmapc.serializer import MethodCallsSlice
 
 
 def test_ref_with_no_method_calls() -> None:
@@ -50,3 +51,29 @@ def test_method_with_result_reference() -> None:
     assert method.to_dict() == {
         "#ids": {"name": "Mailbox/query", "path": "/ids", "resultOf": "0"}
     }
+
+
+def test_method_calls_slice() -> None:
+    method_calls = [
+        Invocation(id="0.example", method=MailboxQuery()),
+        Invocation(id="1.example", method=MailboxGet(ids=Ref("/ids"))),
+        Invocation(id="0.example", method=MailboxGet(ids=[])),
+    ]
+    method_calls_slice = MethodCallsSlice(method_calls, 2)
+    assert len(method_calls_slice) == 2
+    assert list(method_calls_slice) == method_calls[:2]
+    assert method_calls_slice[-1] == method_calls[1]
+    assert method_calls_slice[:1] == method_calls[:1]
+    assert method_calls_slice.index_of_id("0.example") == 0
+    with pytest.raises(IndexError):
+        method_calls_slice[2]
+    with pytest.raises(IndexError):
+        MethodCallsSlice(method_calls, 1).index_of_id("1.example")
+    method = MailboxGet(ids=Ref("/ids", method="1.example"))
+    assert method.to_dict(method_calls_slice=method_calls_slice) == {
+        "#ids": {
+            "name": "Mailbox/get",
+            "path": "/ids",
+            "resultOf": "1.example",
+        }
+    }
@@ -1,13 +1,57 @@
+import dataclasses
+import json
+import logging
+import pickle
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, cast
 
+import dataclasses_json
+import dataclasses_json.core
 import pytest
 from dataclasses_json import config
 
-from jmapc import EmailHeader, ResultReference
+import jmapc.methods
+import jmapc.models
+import jmapc.serializer
+from jmapc import (
+    Comparator,
+    Email,
+    EmailAddress,
+    EmailBodyPart,
+    EmailHeader,
+    EmailQueryFilterCondition,
+    EmailQueryFilterOperator,
+    Mailbox,
+    Operator,
+    Ref,
+    ResultReference,
+    Thread,
+)
+from jmapc.errors import Error, ServerFail
+from jmapc.methods import (
+    EmailGet,
+    EmailGetResponse,
+    EmailQuery,
+    EmailSet,
+    Invocation,
+    Response,
+)
 from jmapc.models import ListOrRef
-from jmapc.serializer import Model, datetime_decode, datetime_encode
+from jmapc.models.email_submission import Address
+from jmapc.serializer import (
+    FrozenDict,
+    LazyList,
+    Model,
+    ModelToDictPostprocessor,
+    class_decoder,
+    datetime_decode,
+    datetime_encode,
+    frozen_model,
+    projected_class_decoder,
+    slotted,
+)
 
 
 def test_camel_case() -> None:
@@ -83,6 +127,17 @@ def test_serialize_add_account_id() -> None:
     )
     to_dict = d.to_dict(account_id="u1138")
     assert to_dict == dict(accountId="u1138", data="is beautiful")
+    assert not hasattr(d, "account_id")
+
+
+def test_serialize_account_id_does_not_mutate() -> None:
+    method = EmailGet(ids=["f1"])
+    assert method.to_dict(account_id="u1138") == {
+        "accountId": "u1138",
+        "ids": ["f1"],
+    }
+    assert method.account_id is None
+    assert method.to_dict() == {"ids": ["f1"]}
 
 
 @pytest.mark.parametrize(
@@ -110,3 +165,530 @@ def test_serialize_datetime(
     assert to_dict == expected_dict
     from_dict = TestModel.from_dict(to_dict)
     assert from_dict == d
+
+
+def test_compiled_decoder_matches_reflective_decoder() -> None:
+    body_part = {
+        "partId": "1",
+        "blobId": "B1",
+        "size": 1138,
+        "headers": [{"name": "Content-Type", "value": "text/plain"}],
+        "type": "text/plain",
+        "charset": "utf-8",
+        "subParts": [{"partId": "2", "type": "text/html"}],
+        "unknownKey": "ignored",
+    }
+    data = {
+        "id": "M1001",
+        "threadId": "T1",
+        "mailboxIds": {"MBX1": True},
+        "keywords": {"$seen": True},
+        "size": "1138",
+        "receivedAt": "1994-08-24T12:01:02Z",
+        "sentAt": "1994-08-24T12:01:02-05:00",
+        "from": [{"name": "Paula", "email": "paula@twoson.example.net"}],
+        "subject": "I am ready",
+        "bodyStructure": body_part,
+        "bodyValues": {"1": {"value": "PK Fire", "isTruncated": False}},
+        "textBody": [body_part],
+        "unknownKey": "ignored",
+    }
+    expected = dataclasses_json.core._decode_dataclass(Email, data, False)
+    assert Email.from_dict(data) == expected
+    assert Email.from_dict(data).size == 1138
+    assert class_decoder(Email) is class_decoder(Email)
+
+
+def test_compiled_decoder_errors() -> None:
+    @dataclass
+    class TestModel(Model):
+        name: str
+        value: Optional[str] = None
+
+    with pytest.raises(KeyError):
+        TestModel.from_dict(dict(value="fourside"))
+    with pytest.warns(RuntimeWarning):
+        assert TestModel.from_dict(dict(name=None)).name is None
+    with pytest.warns(RuntimeWarning):
+        from_dict = TestModel.from_dict(
+            dict(value="onett"), infer_missing=True
+        )
+    assert from_dict.name is None
+    assert from_dict.value == "onett"
+
+
+def test_compiled_decoder_unsupported_class(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    @dataclass
+    class TestModel(Model):
+        name: "Unresolvable"  # type: ignore[name-defined] # noqa: F821
+
+    caplog.set_level(logging.DEBUG, logger="jmapc")
+    with pytest.raises(NameError):
+        TestModel.from_dict(dict(name="pokey"))
+    assert [r.getMessage() for r in caplog.records] == [
+        "Using reflective decoder for "
+        "test_compiled_decoder_unsupported_class.<locals>.TestModel: "
+        "name 'Unresolvable' is not defined"
+    ]
+
+
+def test_compiled_decoder_compile_error(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    @dataclass
+    class TestModel(Model):
+        name: str
+
+    def _compile(*args: Any) -> Any:
+        raise ValueError("Compile error")
+
+    monkeypatch.setattr(jmapc.serializer, "_compile_class_decoder", _compile)
+    with pytest.raises(ValueError, match="Compile error"):
+        TestModel.from_dict(dict(name="pokey"))
+
+
+def test_fused_encoder_matches_postprocessed_dict() -> None:
+    headers = [
+        EmailHeader(name="X-Onett", value="1"),
+        EmailHeader(name="X-Twoson", value="2"),
+    ]
+    body_part = EmailBodyPart(part_id="1", headers=headers, type="text/plain")
+    method = EmailSet(
+        if_in_state=ResultReference(
+            name="Email/get", path="/state", result_of="0.Email/get"
+        ),
+        create={
+            "draft": Email(
+                headers=headers,
+                mail_from=[EmailAddress(email="ness@onett.example.net")],
+                received_at=datetime(1994, 8, 24, 12, 1, 2),
+                body_structure=body_part,
+                text_body=[body_part],
+            )
+        },
+        update={"M1001": {"mailboxIds": Ref("/ids"), "keywords/$seen": True}},
+        destroy=Ref("/ids"),
+    )
+    method_calls_slice = [
+        Invocation(id="0.Email/get", method=EmailGet(ids=["M1001"]))
+    ]
+    for encode_json in (False, True):
+        expected = ModelToDictPostprocessor(method_calls_slice).postprocess(
+            dataclasses_json.core._asdict(method, encode_json=encode_json)
+        )
+        to_dict = method.to_dict(
+            encode_json=encode_json, method_calls_slice=method_calls_slice
+        )
+        assert json.dumps(to_dict, default=str) == json.dumps(
+            expected, default=str
+        )
+    assert list(to_dict.keys()) == [
+        "create",
+        "update",
+        "#ifInState",
+        "#destroy",
+    ]
+    draft = json.loads(json.dumps(to_dict))["create"]["draft"]
+    assert list(draft.keys()) == [
+        "receivedAt",
+        "from",
+        "bodyStructure",
+        "textBody",
+        "header:X-Onett",
+        "header:X-Twoson",
+    ]
+
+
+def test_compiled_encoder_compile_error(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    @dataclass
+    class TestModel(Model):
+        name: str
+
+    def _compile(*args: Any) -> Any:
+        raise ValueError("Compile error")
+
+    monkeypatch.setattr(jmapc.serializer, "_compile_class_encoder", _compile)
+    with pytest.raises(ValueError, match="Compile error"):
+        TestModel(name="pokey").to_dict()
+
+
+@pytest.mark.parametrize(
+    ["value", "expected"],
+    [
+        (
+            "1994-08-24T12:01:02Z",
+            datetime(1994, 8, 24, 12, 1, 2, tzinfo=timezone.utc),
+        ),
+        (
+            "1994-08-24T12:01:02.1234567Z",
+            datetime(1994, 8, 24, 12, 1, 2, 123456, tzinfo=timezone.utc),
+        ),
+        (
+            "1994-08-24T12:01:02-05:00",
+            datetime(
+                1994, 8, 24, 12, 1, 2, tzinfo=timezone(timedelta(hours=-5))
+            ),
+        ),
+        (
+            "1994-08-24T12:01:02+00:00",
+            datetime(1994, 8, 24, 12, 1, 2, tzinfo=timezone.utc),
+        ),
+        ("1994-08-24T12:01:02", datetime(1994, 8, 24, 12, 1, 2)),
+        ("1994-08-24", datetime(1994, 8, 24)),
+        (
+            "1994-08-24 12:01:02z",
+            datetime(1994, 8, 24, 12, 1, 2, tzinfo=timezone.utc),
+        ),
+    ],
+)
+def test_datetime_decode(value: str, expected: datetime) -> None:
+    dt = datetime_decode(value)
+    assert dt == expected
+    assert dt and dt.utcoffset() == expected.utcoffset()
+    assert datetime_decode(value) is dt
+
+
+@pytest.mark.parametrize(
+    "value", ["1994-02-30T12:01:02Z", "1994-08-24T12:01:02+24:00"]
+)
+def test_datetime_decode_invalid(value: str) -> None:
+    with pytest.raises(ValueError):
+        datetime_decode(value)
+
+
+@pytest.mark.parametrize(
+    ["dt", "expected"],
+    [
+        (datetime(1994, 8, 24, 12, 1, 2), "1994-08-24T12:01:02Z"),
+        (
+            datetime(1994, 8, 24, 12, 1, 2, 5, tzinfo=timezone.utc),
+            "1994-08-24T12:01:02.000005Z",
+        ),
+        (
+            datetime(
+                1994, 8, 24, 12, 1, 2, tzinfo=timezone(timedelta(hours=-5))
+            ),
+            "1994-08-24T12:01:02Z",
+        ),
+    ],
+)
+def test_datetime_encode(dt: datetime, expected: str) -> None:
+    assert datetime_encode(dt) == expected
+
+
+def test_slotted_model() -> None:
+    @slotted
+    @dataclass
+    class TestModel(Model):
+        name: str
+        value: Optional[str] = None
+        items: List[str] = field(default_factory=list)
+
+        @classmethod
+        def from_dict(cls, *args: Any, **kwargs: Any) -> "TestModel":
+            return super().from_dict(*args, **kwargs)
+
+    assert TestModel.__slots__ == ("name", "value", "items")
+    d = TestModel(name="threed")
+    assert d == TestModel(name="threed", value=None, items=[])
+    assert d.to_dict() == dict(name="threed", items=[])
+    assert TestModel.from_dict(dict(name="threed", items=[])) == d
+    assert dataclasses.is_dataclass(d)
+    # No base class gives instances a __dict__
+    assert not hasattr(d, "__dict__")
+    with pytest.raises(AttributeError):
+        d.other = "Onett"  # type: ignore
+    assert isinstance(d, dataclasses_json.DataClassJsonMixin)
+    assert TestModel.from_json(d.to_json()) == d
+
+
+@pytest.mark.parametrize(
+    "model",
+    [
+        Email(id="M1001", mail_from=[EmailAddress(email="ness@onett")]),
+        Mailbox(id="MBX1", name="Inbox"),
+        Thread(id="T1", email_ids=["M1001"]),
+    ],
+)
+def test_slotted_model_pickle(model: Model) -> None:
+    assert "__slots__" in type(model).__dict__
+    assert pickle.loads(pickle.dumps(model)) == model
+
+
+def test_slotted_models_have_no_dict() -> None:
+    slotted_classes = [
+        cls
+        for module in (jmapc.methods, jmapc.models)
+        for cls in vars(module).values()
+        if isinstance(cls, type) and "__slots__" in vars(cls)
+    ]
+    assert Address in slotted_classes
+    for cls in slotted_classes:
+        # Instances only have a __dict__ if a class in the MRO has no slots
+        assert all("__slots__" in vars(base) for base in cls.__mro__[:-1])
+    address = Address(email="ness@onett.example.net")
+    assert not hasattr(address, "__dict__")
+    assert isinstance(address, dataclasses_json.DataClassJsonMixin)
+    assert Address.from_dict(address.to_dict()) == address
+
+
+def test_lazy_list() -> None:
+    decoded: List[str] = []
+
+    def _decode(value: Dict[str, str]) -> Mailbox:
+        decoded.append(value["id"])
+        return Mailbox.from_dict(value)
+
+    raw = [dict(id=f"MBX{i}", name=f"Mailbox {i}") for i in range(5)]
+    mailboxes = LazyList[Mailbox](raw, _decode)
+    assert len(mailboxes) == 5
+    assert mailboxes.decoded_count == 0
+    assert mailboxes[1] == Mailbox(id="MBX1", name="Mailbox 1")
+    assert mailboxes[1] is mailboxes[1]
+    assert [m.id for m in mailboxes[-2:]] == ["MBX3", "MBX4"]
+    assert decoded == ["MBX1", "MBX3", "MBX4"]
+    assert mailboxes.decoded_count == 3
+    assert next(iter(mailboxes)).id == "MBX0"
+    assert decoded == ["MBX1", "MBX3", "MBX4", "MBX0"]
+    with pytest.raises(IndexError):
+        mailboxes[5]
+    assert mailboxes == [Mailbox.from_dict(r) for r in raw]
+    assert decoded == ["MBX1", "MBX3", "MBX4", "MBX0", "MBX2"]
+    assert mailboxes.decoded_count == 5
+    assert mailboxes == LazyList(raw, Mailbox.from_dict)
+    assert mailboxes != "MBX0"
+    mailboxes.append(Mailbox(id="MBX5"))
+    del mailboxes[0]
+    mailboxes[0] = Mailbox(id="MBX6")
+    assert [m.id for m in mailboxes] == [
+        "MBX6",
+        "MBX2",
+        "MBX3",
+        "MBX4",
+        "MBX5",
+    ]
+    assert repr(LazyList([], Mailbox.from_dict)) == "LazyList([])"
+    assert pickle.loads(pickle.dumps(mailboxes)) == list(mailboxes)
+
+
+def test_lazy_list_threads() -> None:
+    raw = [dict(id=f"MBX{i}", name=f"Mailbox {i}") for i in range(2000)]
+    mailboxes = LazyList[Mailbox](raw, Mailbox.from_dict)
+    with ThreadPoolExecutor(8) as executor:
+        results = list(
+            executor.map(lambda _: [m.id for m in mailboxes], range(8))
+        )
+    assert results == [[r["id"] for r in raw]] * 8
+    assert mailboxes.decoded_count == len(raw)
+
+
+def test_lazy_list_concat() -> None:
+    raw = [dict(id=f"MBX{i}", name=f"Mailbox {i}") for i in range(6)]
+    lists = [
+        LazyList[Mailbox](raw[i:][:2], Mailbox.from_dict)
+        for i in range(0, 6, 2)
+    ]
+    assert lists[0][1].id == "MBX1"
+    assert lists[2] == [Mailbox.from_dict(r) for r in raw[4:]]
+    mailboxes = LazyList.concat(lists)
+    assert len(mailboxes) == 6
+    assert mailboxes.decoded_count == 3
+    assert mailboxes[1] is lists[0][1]
+    assert [m.id for m in mailboxes] == [r["id"] for r in raw]
+    assert mailboxes.decoded_count == 6
+
+
+def test_lazy_decode() -> None:
+    data = {
+        "accountId": "u1138",
+        "list": [
+            {"id": "M1001", "from": [{"email": "ness@onett.example.net"}]},
+            {"id": "M1002", "receivedAt": "not a date"},
+        ],
+        "notFound": [],
+        "state": "2187",
+    }
+    response = EmailGetResponse.from_dict(data, lazy=True)
+    assert isinstance(response.data, LazyList)
+    assert len(response.data) == 2
+    assert response.data[0] == Email(
+        id="M1001",
+        mail_from=[EmailAddress(email="ness@onett.example.net")],
+    )
+    # Items that fail to decode only raise when they are accessed
+    with pytest.raises(ValueError):
+        response.data[1]
+    # JSON null items raise as they do when decoded eagerly
+    null_item = EmailGetResponse.from_dict(
+        dict(data, list=[None, data["list"][0]]), lazy=True
+    )
+    with pytest.raises(AttributeError):
+        EmailGetResponse.from_dict(dict(data, list=[None]))
+    with pytest.raises(AttributeError):
+        null_item.data[0]
+    assert null_item.data[1] == response.data[0]
+    eager = EmailGetResponse.from_dict(dict(data, list=data["list"][:1]))
+    lazy = EmailGetResponse.from_dict(
+        dict(data, list=data["list"][:1]), lazy=True
+    )
+    assert type(eager.data) is list
+    assert lazy == eager
+    assert lazy.to_dict() == eager.to_dict()
+
+
+def test_projected_decoder() -> None:
+    @dataclass
+    class TestModel(Model):
+        id: str
+        camel_case_key: Optional[str] = None
+        other: Optional[str] = None
+        items: List[str] = field(default_factory=list)
+        code: str = "onett"
+
+    decode = projected_class_decoder(TestModel, ["camelCaseKey", "unknown"])
+    assert decode is projected_class_decoder(
+        TestModel, ("unknown", "camelCaseKey")
+    )
+    full = class_decoder(TestModel)
+    for kvs in (
+        dict(id="1", camelCaseKey="twoson"),
+        dict(id="1"),
+        dict(id="1", camelCaseKey="twoson", other="threed"),
+        dict(id="1", camel_case_key="twoson"),
+        dict(id="1", camelCaseKey=None, unknown="fourside"),
+        dict(camelCaseKey="twoson"),
+        TestModel(id="1"),
+    ):
+        try:
+            expected = full(kvs)
+        except KeyError:
+            with pytest.raises(KeyError):
+                decode(kvs)
+            continue
+        assert decode(kvs) == expected
+    assert decode(dict(id="1")).items is not decode(dict(id="1")).items
+
+
+def test_projected_decoder_none_warning() -> None:
+    @dataclass
+    class TestModel(Model):
+        id: str
+        name: str = "ness"
+        nickname: str = cast(str, None)
+
+    decode = projected_class_decoder(TestModel, ["name"])
+    with pytest.warns(RuntimeWarning) as record:
+        assert decode(dict(id="1", name=None)) == TestModel(
+            id="1", name=cast(str, None)
+        )
+    assert [str(w.message) for w in record] == [
+        f"'NoneType' object value of non-optional type {name} detected "
+        "when decoding TestModel."
+        for name in ("name", "nickname")
+    ]
+
+
+def test_get_response_properties() -> None:
+    data = {
+        "accountId": "u1138",
+        "list": [
+            {"id": "M1001", "threadId": "T1", "keywords": {"$seen": True}},
+            {"id": "M1002", "threadId": "T2", "subject": "Pokey"},
+        ],
+        "notFound": [],
+        "state": "2187",
+    }
+    expected = EmailGetResponse.from_dict(data)
+    for lazy in (True, False):
+        response = EmailGetResponse.from_dict(
+            data, lazy=lazy, properties=["threadId", "keywords"]
+        )
+        assert response == expected
+        assert response.data[1].subject == "Pokey"
+
+
+def test_frozen_model() -> None:
+    frozen_comparator = frozen_model(Comparator)
+    assert frozen_model(Comparator) is frozen_comparator
+    assert frozen_model(frozen_comparator) is frozen_comparator
+    comparator = frozen_comparator(property="receivedAt", limit=10)
+    assert isinstance(comparator, Comparator)
+    assert comparator == frozen_comparator(property="receivedAt", limit=10)
+    assert comparator != Comparator(property="receivedAt", limit=10)
+    assert len({comparator, frozen_comparator("receivedAt", limit=10)}) == 1
+    assert hash(comparator) == hash(comparator)
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        comparator.limit = 20
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        del comparator.limit
+    assert comparator.to_dict() == (
+        Comparator(property="receivedAt", limit=10).to_dict()
+    )
+    assert dataclasses.replace(comparator, limit=20).limit == 20
+
+
+def test_frozen_model_freeze() -> None:
+    method = EmailQuery(
+        filter=EmailQueryFilterOperator(
+            operator=Operator.OR,
+            conditions=[
+                EmailQueryFilterCondition(in_mailbox="MBX1"),
+                EmailQueryFilterCondition(in_mailbox=Ref("/ids/0")),
+            ],
+        ),
+        sort=[Comparator(property="receivedAt")],
+    )
+    frozen = method.freeze()
+    assert isinstance(frozen, EmailQuery)
+    assert frozen.sort == (frozen_model(Comparator)(property="receivedAt"),)
+    assert hash(frozen) == hash(method.freeze())
+    assert {frozen: 1}[method.freeze()] == 1
+    assert frozen.freeze() is frozen
+    assert frozen.jmap_method_name == "Email/query"
+    assert frozen.to_dict(account_id="u1138") == method.to_dict(
+        account_id="u1138"
+    )
+    assert method.account_id is None and frozen.account_id is None
+    thawed = frozen.thaw()
+    assert type(thawed) is EmailQuery
+    assert thawed == method
+
+
+def test_frozen_model_response() -> None:
+    data = {
+        "accountId": "u1138",
+        "list": [
+            {
+                "id": "M1001",
+                "mailboxIds": {"MBX1": True},
+                "to": [{"name": "Ness", "email": "ness@onett.example.net"}],
+            },
+        ],
+        "notFound": [],
+        "state": "2187",
+    }
+    response = frozen_model(EmailGetResponse).from_dict(data)
+    email = response.data[0]
+    assert isinstance(email, Email)
+    assert isinstance(email.mailbox_ids, FrozenDict)
+    assert email.to == (
+        frozen_model(EmailAddress)(
+            name="Ness", email="ness@onett.example.net"
+        ),
+    )
+    with pytest.raises(TypeError):
+        email.mailbox_ids["MBX2"] = True
+    assert hash(response) == hash(
+        frozen_model(EmailGetResponse).from_dict(data)
+    )
+    assert response.to_dict() == EmailGetResponse.from_dict(data).to_dict()
+    assert response.thaw() == EmailGetResponse.from_dict(data)
+    assert pickle.loads(pickle.dumps(response)) == response
+    # Frozen variants are not registered as response or error types
+    assert frozen_model(ServerFail)() == frozen_model(ServerFail)()
+    assert Response.response_types["Email/get"] is EmailGetResponse
+    assert Error.error_class("serverFail") is ServerFail
@@ -0,0 +1,99 @@
+import io
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, List, Optional
+
+import pytest
+
+from jmapc import (
+    Email,
+    EmailAddress,
+    EmailBodyPart,
+    EmailHeader,
+    Mailbox,
+    Ref,
+    Thread,
+    snapshot,
+)
+from jmapc.methods import EmailGet, MailboxGetResponse
+from jmapc.serializer import Model, frozen_model
+
+
+@dataclass
+class PartialModel(Model):
+    name: str
+    account_id: Optional[str] = field(init=False)
+
+
+def objects() -> List[Any]:
+    return [
+        Email(
+            id="M1001",
+            thread_id="T1",
+            mailbox_ids={"MBX1": True},
+            received_at=datetime(1994, 8, 24, 12, 1, 2, tzinfo=timezone.utc),
+            headers=[EmailHeader(name="Subject", value="Onett")],
+            mail_from=[EmailAddress(name="Paula", email="paula@twoson")],
+            body_structure=EmailBodyPart(
+                type="multipart/mixed",
+                sub_parts=[EmailBodyPart(type="text/plain", size=1024)],
+            ),
+        ),
+        Mailbox(id="MBX1", name="Inbox", role="inbox"),
+        Thread(id="T1", email_ids=["M1001"]),
+        MailboxGetResponse(
+            account_id="u1138",
+            state="2187",
+            not_found=[],
+            data=[Mailbox(id="MBX2")],
+        ),
+        EmailGet(ids=Ref("/ids")),
+        Mailbox(id="MBX3").freeze(),
+        {"MBX1": [Mailbox(id="MBX1")]},
+        "Onett",
+    ]
+
+
+def test_snapshot() -> None:
+    data = snapshot.dumps(objects())
+    assert data.startswith(snapshot.SNAPSHOT_MAGIC)
+    restored = snapshot.loads(data)
+    assert restored == objects()
+    assert type(restored[5]) is frozen_model(Mailbox)
+    assert hash(restored[5]) == hash(Mailbox(id="MBX3").freeze())
+    partial = PartialModel(name="Ness")
+    assert not hasattr(snapshot.loads(snapshot.dumps([partial]))[0], "id")
+
+
+def test_snapshot_stream(tmp_path: Path) -> None:
+    path = tmp_path / "snapshot"
+    with path.open("wb") as f, snapshot.SnapshotWriter(f, 3) as writer:
+        for i in range(10):
+            writer.write(Mailbox(id=f"MBX{i}"))
+    with path.open("rb") as g:
+        reader = snapshot.SnapshotReader(g)
+        assert [m.id for m in reader] == [f"MBX{i}" for i in range(10)]
+
+
+def test_snapshot_schema_changes() -> None:
+    # Fields added since the snapshot are set to their defaults, and
+    # removed fields are ignored
+    assert snapshot._restore(
+        Mailbox, ("id", "removed"), ("MBX1", "Onett")
+    ) == Mailbox(id="MBX1")
+    with pytest.raises(ValueError, match="has no value for email_ids"):
+        snapshot._restore(Thread, ("id",), ("T1",))
+
+
+@pytest.mark.parametrize(
+    ["data", "error"],
+    [
+        (b"", "Not a jmapc snapshot"),
+        (b'{"id": "M1001"}', "Not a jmapc snapshot"),
+        (snapshot.SNAPSHOT_MAGIC + b"\x02", "Unsupported snapshot version 2"),
+    ],
+)
+def test_snapshot_invalid(data: bytes, error: str) -> None:
+    with pytest.raises(ValueError, match=error):
+        snapshot.SnapshotReader(io.BytesIO(data))
@@ -0,0 +1,121 @@
+import gc
+import json
+import os
+import pickle
+from pathlib import Path
+
+from jmapc import Email, EmailBodyValue
+from jmapc.spool import (
+    BodySpool,
+    BodyValueSpooler,
+    SpooledText,
+    spooling_loads,
+)
+
+
+def test_spooled_text(tmp_path: Path) -> None:
+    spool = BodySpool(str(tmp_path))
+    value = "Onett ☃ Twoson " * 4
+    text = spool.write(value)
+    empty = spool.write("")
+    other = spool.write("Threed")
+    assert len(spool) == len(value.encode()) + len("Threed")
+    assert not isinstance(text, str)
+    assert not hasattr(text, "__dict__")
+    assert len(text) == len(value)
+    assert text == value
+    assert value == text
+    assert text == spool.write(value)
+    assert text != other
+    assert text != 1
+    assert text.read() == value
+    assert str(text) == value
+    assert str(empty) == ""
+    assert str(other) == "Threed"
+    assert hash(text) == hash(value)
+    assert repr(text) == f"SpooledText({len(value)} characters)"
+    assert text.encode() == value.encode()
+    assert text.encode("utf-16") == value.encode("utf-16")
+    unpickled = pickle.loads(pickle.dumps(text))
+    assert isinstance(unpickled, SpooledText)
+    assert unpickled == value
+
+
+def test_body_spool_file(tmp_path: Path) -> None:
+    spool = BodySpool(str(tmp_path))
+    text = spool.write("Ness")
+    (path,) = tmp_path.iterdir()
+    # The file is not held open between writes and reads
+    assert not [
+        fd
+        for fd in os.listdir("/proc/self/fd")
+        if os.path.realpath(f"/proc/self/fd/{fd}") == str(path)
+    ]
+    del spool
+    gc.collect()
+    assert text == "Ness"
+    del text
+    gc.collect()
+    assert not list(tmp_path.iterdir())
+
+
+def _body_value(value: str) -> dict:
+    return {"value": value, "isEncodingProblem": False, "isTruncated": False}
+
+
+def test_spooling_loads(tmp_path: Path) -> None:
+    body = json.dumps(
+        {
+            "id": "f1",
+            "bodyValues": {
+                "small": _body_value("Pokey"),
+                "large": _body_value("Ness " * 100),
+                "unicode": _body_value("☃" * 40),
+            },
+            "headers": [{"name": "Subject", "value": "Ness " * 100}],
+        }
+    ).encode()
+    data = spooling_loads(body, 100, str(tmp_path))
+    assert data["bodyValues"]["small"] == _body_value("Pokey")
+    large = data["bodyValues"]["large"]
+    assert set(large) == {"isEncodingProblem", "isTruncated", "spooledValue"}
+    assert isinstance(large["spooledValue"], SpooledText)
+    assert data["bodyValues"]["unicode"]["spooledValue"] == "☃" * 40
+    assert data["headers"][0]["value"] == "Ness " * 100
+    assert len(list(tmp_path.iterdir())) == 1
+
+    email = Email.from_dict(data)
+    assert email.body_values
+    assert email.body_values["small"].value == "Pokey"
+    assert email.body_values["small"].spooled_value is None
+    assert email.body_values["small"].read() == "Pokey"
+    body_value = email.body_values["large"]
+    assert body_value.value is None
+    assert isinstance(body_value.spooled_value, SpooledText)
+    assert body_value.read() == "Ness " * 100
+    assert body_value.to_dict() == {
+        "isEncodingProblem": False,
+        "isTruncated": False,
+    }
+    assert pickle.loads(pickle.dumps(email)) == email
+    frozen = email.freeze()
+    assert frozen.body_values
+    assert frozen.body_values["large"].read() == "Ness " * 100
+    assert Email.from_dict(data, lazy=True) == email
+
+
+def test_spooling_loads_small_values(tmp_path: Path) -> None:
+    data = spooling_loads(
+        json.dumps({"1": _body_value("Pokey")}), 100, str(tmp_path)
+    )
+    assert EmailBodyValue.from_dict(data["1"]).value == "Pokey"
+    assert not list(tmp_path.iterdir())
+
+
+def test_body_value_spooler_parsed(tmp_path: Path) -> None:
+    spooler = BodyValueSpooler(4, str(tmp_path))
+    data = [{"bodyValues": {"1": _body_value("Ness")}}, "Paula"]
+    assert spooler.spool_parsed(data) is data
+    assert isinstance(data[0]["bodyValues"]["1"]["spooledValue"], SpooledText)
+    assert spooler.spool
+    assert len(spooler.spool) == 4
@@ -0,0 +1,80 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterable, Set, Tuple
+from unittest import mock
+
+import pytest
+
+from jmapc import Client
+from jmapc.transport import HTTPTransport
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "Server"
+
+    def do_GET(self) -> None:  # noqa: N802
+        self.server.connections.add(self.client_address)
+        self.send_response(200)
+        self.send_header("Content-Length", "4")
+        self.end_headers()
+        self.wfile.write(b"Ness")
+
+    def log_message(self, *args: object) -> None:
+        pass
+
+
+class Server(ThreadingHTTPServer):
+    connections: Set[Tuple[str, int]]
+
+
+@pytest.fixture
+def server() -> Iterable[Server]:
+    server = Server(("127.0.0.1", 0), Handler)
+    server.connections = set()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize("keep_alive", [True, False])
+def test_transport_shared_by_clients(server: Server, keep_alive: bool) -> None:
+    url = f"http://127.0.0.1:{server.server_address[1]}/"
+    with HTTPTransport(keep_alive=keep_alive) as transport:
+        clients = [
+            Client("jmap-example.localhost", auth=auth, transport=transport)
+            for auth in (("ness", "pk_fire"), ("paula", "pk_freeze"))
+        ]
+        for client in clients * 2:
+            r = client.requests_session.get(url)
+            assert r.content == b"Ness"
+            assert client.requests_session.get_adapter(url) is (
+                transport.adapter
+            )
+            client.close()
+        assert clients[0].requests_session.auth == ("ness", "pk_fire")
+        assert clients[1].requests_session.auth == ("paula", "pk_freeze")
+    assert len(server.connections) == (1 if keep_alive else 4)
+
+
+@pytest.mark.parametrize("block", [True, False])
+def test_transport_options(block: bool) -> None:
+    transport = HTTPTransport(max_connections=8, block=block, max_hosts=2)
+    pool_kw = transport.adapter.poolmanager.connection_pool_kw
+    assert pool_kw["maxsize"] == 8
+    assert pool_kw["block"] == block
+    assert transport.adapter.poolmanager.pools._maxsize == 2
+
+
+def test_client_transport_close() -> None:
+    transport = HTTPTransport()
+    with mock.patch.object(transport.adapter, "close") as close:
+        with Client("jmap-example.localhost", transport=transport):
+            pass
+        close.assert_not_called()
+    client = Client("jmap-example.localhost")
+    with mock.patch.object(client.transport.adapter, "close") as close:
+        client.close()
+    close.assert_called_once_with()
@@ -1,6 +1,19 @@
+import asyncio
 import functools
 import json
-from typing import Any, Callable, Dict, Tuple
+import os
+import ssl
+from dataclasses import dataclass
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Tuple,
+    Union,
+)
 
 import requests
 import responses
@@ -32,3 +45,120 @@ def expect_jmap_call(
         url="https://jmap-api.localhost/api",
         callback=assert_request_return_response(expected_request, response),
     )
+
+
+CERTIFICATE = os.path.join(os.path.dirname(__file__), "data", "localhost.pem")
+ServerResponse = Tuple[int, Dict[str, str], Union[bytes, AsyncIterator[bytes]]]
+Handler = Callable[["ServerRequest"], Awaitable[ServerResponse]]
+
+
+@dataclass
+class ServerRequest:
+    method: str
+    path: str
+    headers: Dict[str, str]
+    body: bytes
+
+
+class AsyncTestServer:
+    """Local HTTPS server with a handler per method and path
+
+    Response bodies given as async iterators are sent with chunked transfer
+    encoding.
+    """
+
+    def __init__(self) -> None:
+        self.handlers: Dict[Tuple[str, str], Handler] = {}
+        self.requests: List[ServerRequest] = []
+        self.connections = 0
+        self.port = 0
+
+    async def __aenter__(self) -> "AsyncTestServer":
+        ssl_context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        ssl_context.load_cert_chain(CERTIFICATE)
+        self._server = await asyncio.start_server(
+            self._handle, "127.0.0.1", 0, ssl=ssl_context
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+    @property
+    def host(self) -> str:
+        return f"127.0.0.1:{self.port}"
+
+    @staticmethod
+    def client_ssl_context() -> ssl.SSLContext:
+        return ssl.create_default_context(cafile=CERTIFICATE)
+
+    def add(self, method: str, path: str, handler: Handler) -> None:
+        self.handlers[(method, path)] = handler
+
+    def add_json(
+        self, method: str, path: str, data: Any, status: int = 200
+    ) -> None:
+        async def _handler(request: ServerRequest) -> ServerResponse:
+            return (
+                status,
+                {"Content-Type": "application/json"},
+                json.dumps(data).encode(),
+            )
+
+        self.add(method, path, _handler)
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self.connections += 1
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                method, path, _ = line.decode().split(" ", 2)
+                headers: Dict[str, str] = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b""):
+                        break
+                    name, _, value = line.decode().partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(
+                    int(headers.get("content-length", 0))
+                )
+                request = ServerRequest(method, path, headers, body)
+                self.requests.append(request)
+                handler = self.handlers.get((method, path))
+                if handler:
+                    status, response_headers, content = await handler(request)
+                else:
+                    status, response_headers, content = 404, {}, b""
+                head = [f"HTTP/1.1 {status} Status"] + [
+                    f"{name}: {value}"
+                    for name, value in response_headers.items()
+                ]
+                if isinstance(content, bytes):
+                    head.append(f"Content-Length: {len(content)}")
+                    writer.write(
+                        ("\r\n".join(head) + "\r\n\r\n").encode() + content
+                    )
+                else:
+                    head.append("Transfer-Encoding: chunked")
+                    writer.write(("\r\n".join(head) + "\r\n\r\n").encode())
+                    async for chunk in content:
+                        writer.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+                        await writer.drain()
+                    writer.write(b"0\r\n\r\n")
+                await writer.drain()
+        except (
+            ConnectionError,
+            asyncio.CancelledError,
+            asyncio.IncompleteReadError,
+        ):
+            # Connections left open by clients are cancelled on shutdown
+            pass
+        finally:
+            writer.close()